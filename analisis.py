@@ -0,0 +1,584 @@
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ---------------------------
+# TABEL FREKUENSI DARI KODE INTEGER
+# Kolom kategorik diubah sekali menjadi kode 0..k-1, lalu tabel silang berapapun
+# dimensinya dihitung dengan satu np.bincount atas kode gabungan.
+# ---------------------------
+def kode_kategori(values):
+    # NaN mendapat kode -1 dan tidak ikut dihitung
+    kode, kategori = pd.factorize(values, sort=True)
+    return kode, np.asarray(kategori, dtype=object)
+
+
+def hitung_kombinasi(kode_list, ukuran_list, bobot=None):
+    valid = np.all([k >= 0 for k in kode_list], axis=0)
+    gabungan = np.ravel_multi_index([k[valid] for k in kode_list], ukuran_list)
+    bobot = None if bobot is None else np.asarray(bobot, dtype=float)[valid]
+    return np.bincount(gabungan, weights=bobot, minlength=int(np.prod(ukuran_list))).reshape(ukuran_list)
+
+
+def tabel_panjang(tabel, kategori_list, nama_kolom, nama_nilai="Jumlah"):
+    # tabel frekuensi n-dimensi -> DataFrame panjang, hanya sel yang tidak nol
+    idx = np.nonzero(tabel)
+    hasil = {nama: kategori[i] for nama, kategori, i in zip(nama_kolom, kategori_list, idx)}
+    hasil[nama_nilai] = tabel[idx]
+    return pd.DataFrame(hasil)
+
+
+def _jumlah_link_maks(tabel):
+    # jumlah link (sel tidak nol) terbanyak di antara pasangan sumbu yang bersebelahan
+    sumbu = range(tabel.ndim)
+    return max(
+        np.count_nonzero(tabel.sum(axis=tuple(a for a in sumbu if a not in (i, i + 1))))
+        for i in range(tabel.ndim - 1)
+    )
+
+
+def gabung_kategori_kecil(tabel, kategori_list, maks_link, label_lain="Lainnya"):
+    """Gabungkan kategori terkecil ke 'Lainnya' sampai setiap tahap alur punya paling banyak maks_link link."""
+    tabel = np.asarray(tabel).copy()
+    kategori_list = [list(k) for k in kategori_list]
+
+    while _jumlah_link_maks(tabel) > maks_link:
+        # sumbu dengan kategori biasa terbanyak yang masih bisa digabung (seri: tahap paling awal)
+        kandidat = [(sum(k != label_lain for k in kat), -ax) for ax, kat in enumerate(kategori_list)]
+        n_biasa, ax = max(kandidat)
+        ax = -ax
+        if n_biasa <= 1:
+            break
+
+        kat = kategori_list[ax]
+        if label_lain not in kat:
+            tabel = np.concatenate([tabel, np.zeros_like(tabel.take([0], axis=ax))], axis=ax)
+            kat.append(label_lain)
+        marginal = tabel.sum(axis=tuple(a for a in range(tabel.ndim) if a != ax))
+        biasa = [i for i, k in enumerate(kat) if k != label_lain]
+        terkecil = min(biasa, key=lambda i: marginal[i])
+
+        idx_lain = [slice(None)] * tabel.ndim
+        idx_lain[ax] = kat.index(label_lain)
+        idx_kecil = [slice(None)] * tabel.ndim
+        idx_kecil[ax] = terkecil
+        tabel[tuple(idx_lain)] += tabel[tuple(idx_kecil)]
+        tabel = np.delete(tabel, terkecil, axis=ax)
+        del kat[terkecil]
+
+    return tabel, kategori_list
+
+
+def link_sankey(tabel, kategori_list):
+    """Node dan link Sankey dari tabel frekuensi n-arah (satu tahap per sumbu)."""
+    offset = np.cumsum([0] + [len(k) for k in kategori_list])
+    label = [k for kat in kategori_list for k in kat]
+    source, target, value = [], [], []
+    for i in range(tabel.ndim - 1):
+        pasangan = tabel.sum(axis=tuple(a for a in range(tabel.ndim) if a not in (i, i + 1)))
+        s, t = np.nonzero(pasangan)
+        source += (s + offset[i]).tolist()
+        target += (t + offset[i + 1]).tolist()
+        value += pasangan[s, t].tolist()
+    return label, source, target, value
+
+
+def uji_chi_square(tabel):
+    """Statistik chi-square, derajat bebas, p-value dan Cramér's V untuk satu tabel kontingensi."""
+    tabel = np.asarray(tabel, dtype=float)
+    tabel = tabel[tabel.sum(axis=1) > 0][:, tabel.sum(axis=0) > 0]
+    n = tabel.sum()
+    r, c = tabel.shape
+    if n == 0 or min(r, c) < 2:
+        return np.nan, 0, np.nan, np.nan
+
+    harapan = np.outer(tabel.sum(axis=1), tabel.sum(axis=0)) / n
+    chi2 = ((tabel - harapan) ** 2 / harapan).sum()
+    dof = (r - 1) * (c - 1)
+    return chi2, dof, stats.chi2.sf(chi2, dof), np.sqrt(chi2 / n / (min(r, c) - 1))
+
+
+def matriks_cramers_v(kode_list, ukuran_list):
+    # tabel kontingensi setiap pasangan dibangun dari kode yang sama, tanpa pd.crosstab
+    m = len(kode_list)
+    V = np.eye(m)
+    P = np.zeros((m, m))
+    for i, j in itertools.combinations(range(m), 2):
+        tabel = hitung_kombinasi([kode_list[i], kode_list[j]], [ukuran_list[i], ukuran_list[j]])
+        _, _, p, v = uji_chi_square(tabel)
+        V[i, j] = V[j, i] = v
+        P[i, j] = P[j, i] = p
+    return V, P
+
+
+# ---------------------------
+# PENCARIAN MODEL REGRESI (all-subsets / stepwise)
+# Semua kandidat diselesaikan dari satu matriks cross-product terpusat atas [X, y],
+# jadi data mentah cukup dibaca sekali berapapun jumlah kandidatnya.
+# ---------------------------
+KRITERIA_MODEL = {
+    "adj_r2": "Adjusted R²",
+    "aic": "AIC",
+    "bic": "BIC",
+}
+
+
+def matriks_crossproduct(X, y, bobot=None):
+    # (jumlah bobot, rata-rata, cross-product terpusat) seluruh data = regresi per grup dengan satu grup
+    jumlah_bobot, rata, C = crossproduct_per_grup(X, y, np.zeros(len(y), dtype=np.int64), 1, bobot)[1:]
+    return jumlah_bobot[0], rata[0], C[0]
+
+
+def fit_dari_crossproduct(G, n, subset):
+    # G = hasil matriks_crossproduct; indeks 0..p-1 = prediktor, -1 = variabel dependen.
+    # Bentuk terpusat (bukan Z'Z mentah) supaya kolom berskala besar seperti NPM atau
+    # Angkatan tidak kehilangan presisi saat rata-ratanya dikurangkan.
+    _, rata, C = G
+    idx = list(subset)
+    mean_x = rata[idx]
+    mean_y = rata[-1]
+    Cxx = C[np.ix_(idx, idx)]
+    Cxy = C[idx, -1]
+    tss = C[-1, -1]
+    # diselesaikan dalam bentuk korelasi supaya batas rank lstsq tidak ditentukan oleh kolom berskala terbesar
+    sd = np.sqrt(np.clip(np.diag(Cxx), 0, None))
+    skala = np.where(sd > 0, sd, 1)
+    slope = np.linalg.lstsq(Cxx / np.outer(skala, skala), Cxy / skala, rcond=None)[0] / skala if idx else np.empty(0)
+    beta = np.concatenate([[mean_y - mean_x @ slope], slope])
+    k = len(idx) + 1
+
+    rss = max(tss - slope @ Cxy, 1e-12)
+    r2 = 1 - rss / tss if tss > 0 else np.nan
+    adj_r2 = 1 - (1 - r2) * (n - 1) / (n - k) if n > k else np.nan
+
+    # log-likelihood OLS (sama dengan statsmodels), dipakai untuk AIC/BIC; dengan bobot, konstanta Σlog(w)/2
+    # dari WLS tidak ikut, tapi sama untuk semua kandidat sehingga peringkat tidak berubah
+    llf = -n / 2 * (np.log(2 * np.pi) + np.log(rss / n) + 1)
+    return {
+        "subset": tuple(subset),
+        "k": k - 1,
+        "r2": r2,
+        "adj_r2": adj_r2,
+        "aic": -2 * llf + 2 * k,
+        "bic": -2 * llf + np.log(n) * k,
+        "beta": beta,
+    }
+
+
+def _evaluasi_chunk(G, n, subsets):
+    return [fit_dari_crossproduct(G, n, s) for s in subsets]
+
+
+def skor_lebih_baik(a, b, kriteria):
+    # adj R² makin besar makin baik, AIC/BIC makin kecil makin baik
+    if kriteria == "adj_r2":
+        return a > b
+    return a < b
+
+
+def cari_semua_subset(G, n, p, max_prediktor=None, ukuran_chunk=256):
+    """Evaluasi semua subset prediktor; hasil di-yield per chunk supaya tabel bisa diperbarui selama berjalan.
+
+    Dijalankan di proses ini: setiap kandidat hanya menyelesaikan sistem ≤ p × p dari G, jadi
+    biaya memulai proses lain (dan fork server Streamlit beserta thread-nya) lebih mahal.
+    """
+    max_prediktor = p if max_prediktor is None else min(max_prediktor, p)
+    subsets = itertools.chain.from_iterable(
+        itertools.combinations(range(p), k) for k in range(1, max_prediktor + 1)
+    )
+    for chunk in iter(lambda: list(itertools.islice(subsets, ukuran_chunk)), []):
+        yield _evaluasi_chunk(G, n, chunk)
+
+
+class PeringkatTeratas:
+    """N model terbaik per kriteria (heap berukuran tetap), jadi memori tidak ikut jumlah kandidat."""
+
+    def __init__(self, n=20, kriteria=tuple(KRITERIA_MODEL)):
+        self.n = n
+        self.heap = {k: [] for k in kriteria}
+        self.jumlah = 0
+        self._urutan = itertools.count()  # pemecah seri supaya dict hasil tidak pernah dibandingkan
+
+    def tambah(self, hasil):
+        for h in hasil:
+            self.jumlah += 1
+            for kriteria, heap in self.heap.items():
+                # heap min atas "kebaikan": akarnya model terburuk di antara N teratas
+                skor = h[kriteria] if kriteria == "adj_r2" else -h[kriteria]
+                if np.isnan(skor):
+                    continue
+                item = (skor, next(self._urutan), h)
+                if len(heap) < self.n:
+                    heapq.heappush(heap, item)
+                elif skor > heap[0][0]:
+                    heapq.heapreplace(heap, item)
+
+    def teratas(self, kriteria):
+        return [h for _, _, h in sorted(self.heap[kriteria], key=lambda item: item[:2], reverse=True)]
+
+
+def cari_stepwise(G, n, p, arah="forward", kriteria="aic"):
+    """Stepwise forward/backward; setiap langkah yang memperbaiki kriteria di-yield."""
+    terpilih = [] if arah == "forward" else list(range(p))
+    # forward dimulai dari model konstanta saja, jadi prediktor pertama juga harus memperbaiki kriteria
+    terbaik = fit_dari_crossproduct(G, n, terpilih)
+    if terpilih:
+        yield [terbaik]
+
+    while True:
+        if arah == "forward":
+            kandidat = [terpilih + [j] for j in range(p) if j not in terpilih]
+        else:
+            kandidat = [[j for j in terpilih if j != i] for i in terpilih] if len(terpilih) > 1 else []
+        if not kandidat:
+            return
+
+        hasil = [fit_dari_crossproduct(G, n, sorted(s)) for s in kandidat]
+        langkah = hasil[0]
+        for h in hasil[1:]:
+            if skor_lebih_baik(h[kriteria], langkah[kriteria], kriteria):
+                langkah = h
+
+        if not skor_lebih_baik(langkah[kriteria], terbaik[kriteria], kriteria):
+            return
+        terbaik = langkah
+        terpilih = list(langkah["subset"])
+        yield [langkah]
+
+
+# ---------------------------
+# REGRESI PER GRUP
+# Statistik cukup per grup (n, rata-rata, cross-product terpusat; ditumpuk menjadi array
+# g × m × m), lalu semua sistem normal diselesaikan sekaligus dengan operasi numpy ber-batch.
+# ---------------------------
+BATAS_KONDISI = 1e10  # bilangan kondisi matriks korelasi prediktor; di atas ini presisi float64 < 6 digit
+
+
+def crossproduct_per_grup(X, y, kode, n_grup, bobot=None):
+    """(n, jumlah bobot, rata-rata, cross-product terpusat) per grup untuk kolom [X..., y].
+
+    Data dipusatkan pada rata-rata grupnya sebelum dikalikan (dua lintasan), bukan Σzz' - n·z̄z̄'
+    dari momen mentah: untuk kolom bernilai besar dengan variasi kecil di dalam grup (NPM, ID)
+    pengurangan itu menghapus hampir semua digit signifikan. Dengan bobot, rata-rata dan
+    cross-product ikut berbobot (WLS); tanpa bobot, jumlah bobot = n.
+    """
+    Z = np.column_stack([np.asarray(X, dtype=float), np.asarray(y, dtype=float)])
+    w = np.ones(len(Z)) if bobot is None else np.asarray(bobot, dtype=float)
+    # dipusatkan dulu pada rata-rata global supaya jumlah per grup tidak dihitung dari nilai ~1e10
+    pusat = Z.mean(axis=0) if len(Z) else np.zeros(Z.shape[1])
+    Z = Z - pusat
+    n = np.bincount(kode, minlength=n_grup).astype(float)
+    jumlah_bobot = np.bincount(kode, weights=w, minlength=n_grup)
+    jumlah = np.stack([np.bincount(kode, weights=w * Z[:, j], minlength=n_grup) for j in range(Z.shape[1])], axis=1)
+    rata = jumlah / np.where(jumlah_bobot > 0, jumlah_bobot, 1)[:, None]
+    D = Z - rata[kode]
+    C = np.zeros((n_grup, Z.shape[1], Z.shape[1]))
+    np.add.at(C, kode, w[:, None, None] * D[:, :, None] * D[:, None, :])
+    return n, jumlah_bobot, rata + pusat, C
+
+
+def fit_per_grup(n, jumlah_bobot, rata, C, alpha=0.05):
+    """OLS (WLS jika statistiknya berbobot) untuk setiap grup; grup dengan data kurang/kolinear bernilai NaN."""
+    p = C.shape[1] - 1
+    Cxx, Cxy, tss = C[:, :p, :p], C[:, :p, p], C[:, p, p]
+    mean_x, mean_y = rata[:, :p], rata[:, p]
+
+    df_resid = n - p - 1
+    # sistem diselesaikan dalam bentuk korelasi (tiap kolom distandarkan di dalam grupnya) lalu
+    # dikembalikan ke skala asli, supaya kolom berskala besar (NPM) tidak merusak rank check dan invers
+    sd = np.sqrt(np.clip(np.diagonal(Cxx, axis1=1, axis2=2), 0, None))
+    skala = np.where(sd > 0, sd, 1)
+    korelasi = Cxx / (skala[:, :, None] * skala[:, None, :])
+    # korelasi nyaris ±1 (mis. NPM vs Angkatan di satu prodi) = kolinear secara numerik: koefisiennya
+    # hanya sisa pembulatan, jadi grup itu diperlakukan sama seperti grup yang rank-nya kurang
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kondisi = np.linalg.cond(korelasi)
+    valid = (df_resid > 0) & (sd > 0).all(axis=1) & (kondisi < BATAS_KONDISI)
+    korelasi = np.where(valid[:, None, None], korelasi, np.eye(p))
+    inv = np.linalg.inv(korelasi) / (skala[:, :, None] * skala[:, None, :])
+    slope = np.einsum("gij,gj->gi", inv, Cxy)
+    intercept = mean_y - np.einsum("gi,gi->g", mean_x, slope)
+
+    rss = np.maximum(tss - np.einsum("gi,gi->g", slope, Cxy), 0)
+    sigma2 = rss / np.where(valid, df_resid, 1)
+    with np.errstate(invalid="ignore"):
+        se_slope = np.sqrt(sigma2[:, None] * np.diagonal(inv, axis1=1, axis2=2))
+        se_intercept = np.sqrt(sigma2 * (1 / np.where(jumlah_bobot > 0, jumlah_bobot, 1) + np.einsum("gi,gij,gj->g", mean_x, inv, mean_x)))
+
+    beta = np.column_stack([intercept, slope])
+    se = np.column_stack([se_intercept, se_slope])
+    # sisa pembulatan pada grup yang nyaris kolinear bisa membuat SE tidak terhingga/NaN: diperlakukan sama
+    valid &= np.isfinite(se).all(axis=1) & np.isfinite(beta).all(axis=1)
+    beta[~valid] = np.nan
+    se[~valid] = np.nan
+    df_aman = np.where(valid, df_resid, 1)
+    t_kritis = stats.t.ppf(1 - alpha / 2, df_aman)[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r2 = np.where(valid & (tss > 0), 1 - rss / tss, np.nan)
+        p_value = 2 * stats.t.sf(np.abs(beta / se), df_aman[:, None])
+    return {
+        "n": n.astype(int),
+        "beta": beta,
+        "se": se,
+        "bawah": beta - t_kritis * se,
+        "atas": beta + t_kritis * se,
+        "p_value": p_value,
+        "r2": r2,
+    }
+
+
+# ---------------------------
+# BOBOT POST-STRATIFIKASI (raking / iterative proportional fitting)
+# Setiap margin berupa kode integer per responden; satu iterasi = satu bincount
+# berbobot + satu perkalian faktor per margin.
+# ---------------------------
+def bobot_raking(kode_list, target_list, batas=None, maks_iter=200, toleransi=1e-6):
+    """Bobot yang membuat distribusi berbobot tiap margin sama dengan proporsi populasi.
+
+    Kode -1 (kategori tidak ada di konfigurasi / kosong) tidak ikut disesuaikan pada margin itu.
+    batas=(bawah, atas) memotong bobot relatif terhadap rata-rata setiap iterasi, supaya sel
+    yang hampir kosong tidak membuat bobot meledak atau mendekati nol; dengan batas, margin
+    bisa tidak tercapai persis, jadi selisih terbesarnya ikut dikembalikan.
+    Mengembalikan (bobot dengan rata-rata 1, jumlah iterasi, konvergen, selisih margin maks).
+    """
+    n = len(kode_list[0])
+    w = np.ones(n)
+    margin = []
+    for kode, target in zip(kode_list, target_list):
+        target = np.asarray(target, dtype=float)
+        ada = kode >= 0
+        # kategori populasi tanpa responden tidak bisa diwakili, jadi dikeluarkan dari target
+        terisi = np.bincount(kode[ada], minlength=len(target)) > 0
+        margin.append((kode[ada], ada, np.where(terisi, target, 0) / target[terisi].sum()))
+
+    konvergen = False
+    for iterasi in range(1, maks_iter + 1):
+        w_lama = w.copy()
+        for kode, ada, proporsi in margin:
+            total = np.bincount(kode, weights=w[ada], minlength=len(proporsi))
+            faktor = np.divide(proporsi * total.sum(), total, out=np.ones_like(total), where=total > 0)
+            w[ada] *= faktor[kode]
+        w *= n / w.sum()
+        if batas is not None:
+            w = np.clip(w, *batas)
+        if np.abs(w - w_lama).max() < toleransi:
+            konvergen = True
+            break
+
+    selisih = max(
+        np.abs(np.bincount(kode, weights=w[ada], minlength=len(proporsi)) / w[ada].sum() - proporsi).max()
+        for kode, ada, proporsi in margin
+    )
+    return w * n / w.sum(), iterasi, konvergen, selisih
+
+
+# ---------------------------
+# PERBANDINGAN DUA KELOMPOK
+# Setiap kolom diringkas sekali menjadi tabel frekuensi (nilai unik × kelompok A/B);
+# semua uji untuk semua kolom lalu dihitung sekaligus dari array p × k tersebut.
+# ---------------------------
+def frekuensi_dua_kelompok(X, kode_grup):
+    """Tabel frekuensi nilai unik setiap kolom X untuk kelompok 0 (A) dan 1 (B).
+
+    X: array n × p (NaN = kosong), kode_grup: 0/1 per baris, -1 tidak ikut dihitung.
+    Mengembalikan nilai (p × k, NaN untuk padding) dan hitung (2 × p × k).
+    """
+    X = np.asarray(X, dtype=float)
+    ikut = kode_grup >= 0
+    X, grup = X[ikut], np.asarray(kode_grup)[ikut]
+    n, p = X.shape
+
+    ada = ~np.isnan(X)
+    x = X[ada]
+    j = np.broadcast_to(np.arange(p), (n, p))[ada]
+    g = np.broadcast_to(grup[:, None], (n, p))[ada]
+    urut = np.lexsort((x, j))
+    x, j, g = x[urut], j[urut], g[urut]
+
+    # satu id per pasangan (kolom, nilai unik), berurutan menurut nilai di dalam kolom
+    baru = np.ones(len(x), dtype=bool)
+    baru[1:] = (j[1:] != j[:-1]) | (x[1:] != x[:-1])
+    id_pasangan = np.cumsum(baru) - 1
+    n_pasangan = int(baru.sum())
+    hitung_pasangan = np.bincount(id_pasangan * 2 + g, minlength=2 * n_pasangan).reshape(n_pasangan, 2)
+
+    j_pasangan = j[baru]
+    posisi = np.arange(n_pasangan) - np.searchsorted(j_pasangan, np.arange(p))[j_pasangan]
+    k = int(posisi.max()) + 1 if n_pasangan else 1
+    nilai = np.full((p, k), np.nan)
+    nilai[j_pasangan, posisi] = x[baru]
+    hitung = np.zeros((2, p, k))
+    hitung[:, j_pasangan, posisi] = hitung_pasangan.T
+    return nilai, hitung
+
+
+def uji_numerik_dua_kelompok(nilai, hitung):
+    """Welch t-test, Mann–Whitney U (asimtotik, koreksi ties & kontinuitas), Hedges' g dan
+    korelasi rank-biserial untuk semua kolom sekaligus. Efek positif = kelompok A lebih tinggi."""
+    v = np.nan_to_num(nilai)
+    n = hitung.sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rata = (hitung * v).sum(axis=2) / n
+        var = (hitung * (v - rata[..., None]) ** 2).sum(axis=2) / (n - 1)
+        (na, nb), (ma, mb), (va, vb) = n, rata, var
+
+        se2a, se2b = va / na, vb / nb
+        # kolom tanpa variasi di kedua kelompok tidak bisa diuji (t dan g tak hingga)
+        se2a, se2b = np.where(se2a + se2b > 0, se2a, np.nan), np.where(se2a + se2b > 0, se2b, np.nan)
+        t = (ma - mb) / np.sqrt(se2a + se2b)
+        df = (se2a + se2b) ** 2 / (se2a ** 2 / (na - 1) + se2b ** 2 / (nb - 1))
+        p_welch = 2 * stats.t.sf(np.abs(t), df)
+
+        sd_gabungan = np.sqrt(((na - 1) * va + (nb - 1) * vb) / (na + nb - 2))
+        sd_gabungan = np.where(sd_gabungan > 0, sd_gabungan, np.nan)
+        hedges_g = (ma - mb) / sd_gabungan * (1 - 3 / (4 * (na + nb) - 9))
+
+        # ranking tengah dari frekuensi kumulatif: nilai yang sama mendapat rata-rata peringkatnya
+        total = hitung.sum(axis=0)
+        peringkat = np.cumsum(total, axis=1) - (total - 1) / 2
+        u_a = (hitung[0] * peringkat).sum(axis=1) - na * (na + 1) / 2
+        N = na + nb
+        ties = (total ** 3 - total).sum(axis=1)
+        sigma = np.sqrt(na * nb / 12 * ((N + 1) - ties / (N * (N - 1))))
+        z = (np.abs(u_a - na * nb / 2) - 0.5) / sigma
+        p_mwu = np.minimum(2 * stats.norm.sf(z), 1.0)
+        rank_biserial = 2 * u_a / (na * nb) - 1
+
+    return {
+        "n_a": na, "n_b": nb, "rata_a": ma, "rata_b": mb,
+        "t": t, "df": df, "p_welch": p_welch, "hedges_g": hedges_g,
+        "u": u_a, "p_mwu": p_mwu, "rank_biserial": rank_biserial,
+    }
+
+
+def uji_kategorik_dua_kelompok(hitung):
+    """Chi-square 2 × k (tanpa koreksi Yates) dan Cramér's V untuk semua kolom sekaligus."""
+    total_kolom = hitung.sum(axis=0)
+    total_baris = hitung.sum(axis=2)
+    N = total_baris.sum(axis=0)
+    dof = (total_kolom > 0).sum(axis=1) - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harapan = total_baris[:, :, None] * total_kolom[None] / N[None, :, None]
+        chi2 = np.where(harapan > 0, (hitung - harapan) ** 2 / harapan, 0).sum(axis=(0, 2))
+        valid = (total_baris > 0).all(axis=0) & (dof >= 1)
+        chi2 = np.where(valid, chi2, np.nan)
+        cramers_v = np.sqrt(chi2 / N)
+    return {"chi2": chi2, "dof": dof, "p_value": stats.chi2.sf(chi2, np.maximum(dof, 1)), "cramers_v": cramers_v}
+
+
+def koreksi_bh(p):
+    # q-value Benjamini–Hochberg; NaN dibiarkan dan tidak ikut dihitung sebagai uji
+    p = np.asarray(p, dtype=float)
+    q = np.full_like(p, np.nan)
+    ada = ~np.isnan(p)
+    m = ada.sum()
+    if m == 0:
+        return q
+    urut = np.argsort(p[ada])
+    q_urut = p[ada][urut] * m / np.arange(1, m + 1)
+    q_urut = np.minimum.accumulate(q_urut[::-1])[::-1]
+    q[np.flatnonzero(ada)[urut]] = np.minimum(q_urut, 1.0)
+    return q
+
+
+# ---------------------------
+# KUALITAS RESPONS
+# Blok item (baris × item, semua diskalakan ke 0..1) dinilai sekaligus: varians dalam baris
+# dan deretan jawaban identik terpanjang, tanpa loop per responden.
+# ---------------------------
+def metrik_kualitas(blok):
+    """Varians dalam baris dan panjang deretan jawaban identik berurutan terpanjang per responden."""
+    blok = np.asarray(blok, dtype=float)
+    n, p = blok.shape
+    ada = ~np.isnan(blok)
+    jumlah = ada.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rata = np.where(ada, blok, 0).sum(axis=1) / jumlah
+        varians = np.where(ada, (blok - rata[:, None]) ** 2, 0).sum(axis=1) / jumlah
+
+    # panjang deret yang berakhir di kolom j = j - (kolom terakhir tempat deret putus) + 1
+    sama = blok[:, 1:] == blok[:, :-1]  # NaN tidak pernah dianggap sama
+    kolom = np.arange(1, p)
+    putus = np.maximum.accumulate(np.where(sama, 0, kolom), axis=1)
+    deret = np.where(sama, kolom - putus + 1, 1)
+    terpanjang = deret.max(axis=1) if p > 1 else np.ones(n, dtype=int)
+    return varians, terpanjang
+
+
+# ---------------------------
+# SHRINKAGE EMPIRICAL BAYES (normal bertingkat: responden ⊂ grup ⊂ induk, mis. prodi ⊂ fakultas)
+# Komponen varians diestimasi method-of-moments (ANOVA tersarang tak seimbang) dari statistik
+# cukup per grup (n, jumlah, jumlah kuadrat), jadi biayanya tidak bergantung pada jumlah baris.
+# ---------------------------
+def statistik_cukup(kode, nilai, n_grup):
+    # satu lintasan data: n, Σy dan Σy² per grup; nilai kosong dan kode -1 tidak dihitung
+    nilai = np.asarray(nilai, dtype=float)
+    ada = (kode >= 0) & ~np.isnan(nilai)
+    k, y = kode[ada], nilai[ada]
+    return (
+        np.bincount(k, minlength=n_grup).astype(float),
+        np.bincount(k, weights=y, minlength=n_grup),
+        np.bincount(k, weights=y ** 2, minlength=n_grup),
+    )
+
+
+def shrinkage_bertingkat(n, jumlah, jumlah_kuadrat, induk, n_induk):
+    """Rata-rata grup yang ditarik ke rata-rata induknya, dan rata-rata induk ke rata-rata umum.
+
+    Model: y ~ N(θ_grup, σ²), θ_grup ~ N(μ_induk, τ²_grup), μ_induk ~ N(μ, τ²_induk).
+    Bobot data grup = τ²_grup / (τ²_grup + σ²/n), jadi grup kecil lebih banyak ditarik.
+    Grup tanpa data mendapat rata-rata induk yang sudah tersusut.
+    """
+    n, jumlah, jumlah_kuadrat = (np.asarray(a, dtype=float) for a in (n, jumlah, jumlah_kuadrat))
+    ada = n > 0
+    N = n.sum()
+    P = ada.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rata = jumlah / n
+        n_f = np.bincount(induk, weights=n, minlength=n_induk)
+        rata_f = np.bincount(induk, weights=jumlah, minlength=n_induk) / n_f
+        ada_f = n_f > 0
+        F = ada_f.sum()
+        rata_umum = jumlah.sum() / N
+
+        # varians dalam grup (gabungan); tanpa derajat bebas dipakai varians total
+        ssw = (jumlah_kuadrat - jumlah ** 2 / n)[ada].sum()
+        sigma2 = ssw / (N - P) if N > P else (jumlah_kuadrat.sum() / N - rata_umum ** 2)
+
+        n2_f = np.bincount(induk, weights=n ** 2, minlength=n_induk)
+        c_grup = N - (n2_f / n_f)[ada_f].sum()
+        ss_grup = (n * (rata - rata_f[induk]) ** 2)[ada].sum()
+        tau2_grup = max(0.0, (ss_grup - (P - F) * sigma2) / c_grup) if c_grup > 0 else 0.0
+
+        c1 = (n2_f / n_f)[ada_f].sum() - (n ** 2).sum() / N
+        c2 = N - (n_f ** 2).sum() / N
+        ss_induk = (n_f * (rata_f - rata_umum) ** 2)[ada_f].sum()
+        tau2_induk = max(0.0, (ss_induk - (F - 1) * sigma2 - c1 * tau2_grup) / c2) if c2 > 0 else 0.0
+
+        # tingkat induk: varians sampling rata-rata induk memuat variasi grup di dalamnya
+        v_f = tau2_grup * n2_f / n_f ** 2 + sigma2 / n_f
+        presisi_f = np.where(ada_f, 1 / (tau2_induk + v_f), 0)
+        mu = (presisi_f * np.nan_to_num(rata_f)).sum() / presisi_f.sum() if presisi_f.sum() > 0 else rata_umum
+        b_f = np.where(ada_f, tau2_induk / (tau2_induk + v_f), 0)
+        induk_tersusut = mu + b_f * (np.nan_to_num(rata_f) - mu)
+
+        b = np.where(ada, tau2_grup / (tau2_grup + sigma2 / n), 0)
+        tersusut = induk_tersusut[induk] + b * (np.nan_to_num(rata) - induk_tersusut[induk])
+        # sd posterior kira-kira: ketidakpastian grup + bagian induk yang diwarisi
+        var_posterior = np.where(ada, b * sigma2 / n, 0) + (1 - b) ** 2 * (b_f * v_f)[induk]
+
+    return {
+        "rata_mentah": rata,
+        "rata_tersusut": tersusut,
+        "sd_posterior": np.sqrt(var_posterior),
+        "bobot_data": b,
+        "rata_induk": rata_f,
+        "rata_induk_tersusut": induk_tersusut,
+        "rata_umum": mu,
+        "sigma2": sigma2,
+        "tau2_grup": tau2_grup,
+        "tau2_induk": tau2_induk,
+    }
@@ -0,0 +1,101 @@
+import argparse
+import functools
+import hashlib
+import logging
+import os
+import urllib.request
+
+from matplotlib import font_manager
+from PIL import Image
+
+DIR_STATIC = "static"
+DIR_FONT = os.path.join(DIR_STATIC, "fonts")
+
+# sumber -> (nama file di static/, lebar tampilan dalam px)
+LOGO = {
+    "LogoUPN.png": ("logo_upn.webp", 150),
+    "LogoSada.png": ("logo_sada.webp", 150),
+}
+SKALA_HIDPI = 2  # disimpan 2x lebar tampilan supaya tetap tajam di layar retina
+
+BOBOT_POPPINS = [300, 400, 600, 700, 800]
+URL_POPPINS = "https://cdn.jsdelivr.net/fontsource/fonts/poppins@latest/latin-{bobot}-normal.woff2"
+# hanya dipakai untuk bobot yang file-nya belum ada di static/fonts (jalankan `python aset.py`)
+IMPORT_POPPINS_REMOTE = "@import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700;800&display=swap');"
+
+
+def nama_font(bobot):
+    return f"poppins-latin-{bobot}-normal.woff2"
+
+
+def siapkan_logo(sumber, tujuan, lebar):
+    """Perkecil logo ke ukuran tampil lalu simpan sebagai WebP (alpha tetap dipertahankan)."""
+    with Image.open(sumber) as im:
+        im = im.convert("RGBA")
+        lebar_px = min(lebar * SKALA_HIDPI, im.width)
+        tinggi_px = round(im.height * lebar_px / im.width)
+        im = im.resize((lebar_px, tinggi_px), Image.LANCZOS)
+        im.save(tujuan, "WEBP", quality=85, method=6)
+    return os.path.getsize(sumber), os.path.getsize(tujuan)
+
+
+def unduh_font(direktori=DIR_FONT, ganti=False):
+    # dijalankan sekali saat build; dashboard hanya membaca file lokal sehingga tetap jalan offline
+    os.makedirs(direktori, exist_ok=True)
+    hasil = []
+    for bobot in BOBOT_POPPINS:
+        path = os.path.join(direktori, nama_font(bobot))
+        if ganti or not os.path.exists(path):
+            urllib.request.urlretrieve(URL_POPPINS.format(bobot=bobot), path)
+        hasil.append(path)
+    return hasil
+
+
+@functools.lru_cache(maxsize=None)
+def css_font(url_dasar="app/static/fonts"):
+    """@font-face untuk file Poppins di static/fonts; @import Google Fonts hanya jika ada file yang hilang."""
+    aturan, hilang = [], []
+    for bobot in BOBOT_POPPINS:
+        if os.path.exists(os.path.join(DIR_FONT, nama_font(bobot))):
+            aturan.append(
+                f"@font-face {{ font-family: 'Poppins'; font-style: normal; font-weight: {bobot}; font-display: swap; "
+                f"src: local('Poppins'), url('{url_dasar}/{nama_font(bobot)}') format('woff2'); }}"
+            )
+        else:
+            hilang.append(nama_font(bobot))
+    if hilang:
+        # di-cache per proses, jadi peringatan ini hanya muncul sekali dan bukan di setiap rerun
+        logging.getLogger(__name__).warning(
+            "Font %s tidak ada di %s; memakai Google Fonts. Jalankan `python aset.py` untuk menyimpannya lokal.",
+            ", ".join(hilang), DIR_FONT,
+        )
+        # @import wajib di awal stylesheet, sebelum @font-face
+        aturan.insert(0, IMPORT_POPPINS_REMOTE)
+    return "\n".join(aturan)
+
+
+def font_matplotlib(nama="Poppins"):
+    # matplotlib tidak bisa memakai woff2 atau CSS, jadi Poppins hanya dipakai jika terpasang di sistem
+    return nama if any(f.name == nama for f in font_manager.fontManager.ttflist) else "sans-serif"
+
+
+@functools.lru_cache(maxsize=None)
+def url_static(nama):
+    # ?v=<hash isi> membuat Tornado mengirim Cache-Control jangka panjang; hash berganti jika file diganti
+    with open(os.path.join(DIR_STATIC, nama), "rb") as f:
+        return f"app/static/{nama}?v={hashlib.sha1(f.read()).hexdigest()[:10]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Siapkan aset statis dashboard (logo & font)")
+    parser.add_argument("--tanpa-font", action="store_true", help="lewati unduhan font (mis. saat offline)")
+    args = parser.parse_args()
+
+    os.makedirs(DIR_STATIC, exist_ok=True)
+    for sumber, (nama, lebar) in LOGO.items():
+        sebelum, sesudah = siapkan_logo(sumber, os.path.join(DIR_STATIC, nama), lebar)
+        print(f"✅ {sumber} ({sebelum / 1024:.0f} KB) -> {DIR_STATIC}/{nama} ({sesudah / 1024:.0f} KB)")
+
+    if not args.tanpa_font:
+        for path in unduh_font():
+            print(f"✅ {path} ({os.path.getsize(path) / 1024:.0f} KB)")
@@ -0,0 +1,183 @@
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa file lock, hanya kehilangan perlindungan thundering-herd
+    fcntl = None
+
+JUMLAH_KUNCI = 64  # file lock dipakai bergiliran oleh semua kunci (hash % N), jadi jumlahnya tetap
+
+
+@functools.lru_cache(maxsize=None)
+def hash_modul(direktori):
+    """Hash isi semua file .py di satu folder proyek, dihitung sekali per proses."""
+    h = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(direktori, "*.py"))):
+        h.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+class CacheDisk:
+    """Cache hasil (pickle) di folder yang dipakai bersama oleh semua proses dashboard di satu mesin."""
+
+    def __init__(self, direktori, maks_bytes=512 * 1024 * 1024, interval_lru=60, tunggu_maks=30):
+        self.direktori = direktori
+        self.maks_bytes = maks_bytes
+        self.interval_lru = interval_lru
+        self.tunggu_maks = tunggu_maks
+        self.statistik = {"hit": 0, "miss": 0, "evict": 0}
+        self._lock = threading.Lock()
+        self._dipegang = threading.local()  # lock yang sedang dipegang thread ini (panggilan bertingkat)
+        # folder di-scan paling sering tiap interval_lru detik, atau lebih awal jika proses ini
+        # sudah menulis >10% batas sejak scan terakhir
+        self._ditulis = 0
+        self._scan_terakhir = float("-inf")
+        os.makedirs(os.path.join(direktori, "_kunci"), exist_ok=True)
+
+    def _path(self, kunci):
+        return os.path.join(self.direktori, kunci[:2], kunci + ".pkl")
+
+    def kunci(self, nama_fungsi, args, kwargs):
+        # argumen pertama fungsi dashboard selalu versi data, jadi kunci ikut berganti saat data berubah
+        isi = pickle.dumps((nama_fungsi, args, sorted(kwargs.items())), protocol=4)
+        return hashlib.sha256(isi).hexdigest()
+
+    @contextmanager
+    def _kunci_file(self, kunci, path):
+        # satu proses menghitung, proses lain menunggu lalu membaca hasilnya. Lock dibagi antar kunci, jadi
+        # fungsi ber-cache yang memanggil fungsi ber-cache lain bisa saling menunggu lock yang sama: lock yang
+        # sudah dipegang thread ini dilewati, dan penungguan dibatasi tunggu_maks (lalu dihitung sendiri)
+        if fcntl is None:
+            yield
+            return
+        path_lock = os.path.join(self.direktori, "_kunci", f"{int(kunci[:8], 16) % JUMLAH_KUNCI:02d}.lock")
+        dipegang = self._dipegang.__dict__.setdefault("path", set())
+        if path_lock in dipegang:
+            yield
+            return
+        with open(path_lock, "a+b") as f:
+            terkunci = False
+            batas = time.monotonic() + self.tunggu_maks
+            while not os.path.exists(path) and time.monotonic() < batas:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    terkunci = True
+                    break
+                except BlockingIOError:
+                    time.sleep(0.05)
+            if terkunci:
+                dipegang.add(path_lock)
+            try:
+                yield
+            finally:
+                if terkunci:
+                    dipegang.discard(path_lock)
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _baca(self, path):
+        try:
+            with open(path, "rb") as f:
+                hasil = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(path)  # mtime = waktu terakhir dipakai, untuk LRU
+        return True, hasil
+
+    def _hitung(self, nama, hasil):
+        with self._lock:
+            self.statistik[nama] += 1
+        return hasil
+
+    def ambil_atau_hitung(self, kunci, fungsi):
+        path = self._path(kunci)
+        ada, hasil = self._baca(path)
+        if ada:
+            return self._hitung("hit", hasil)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._kunci_file(kunci, path):
+            ada, hasil = self._baca(path)
+            if ada:
+                return self._hitung("hit", hasil)
+
+            hasil = fungsi()
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(hasil, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+
+        self._mungkin_bersihkan(os.path.getsize(path))
+        return self._hitung("miss", hasil)
+
+    def _mungkin_bersihkan(self, ukuran):
+        with self._lock:
+            self._ditulis += ukuran
+            sekarang = time.monotonic()
+            perlu = self._ditulis > self.maks_bytes * 0.1 or sekarang - self._scan_terakhir >= self.interval_lru
+            if perlu:
+                self._ditulis = 0
+                self._scan_terakhir = sekarang
+        if perlu:
+            self.bersihkan_lru()
+
+    def bersihkan_lru(self):
+        # hapus entri yang paling lama tidak dipakai sampai total ukuran di bawah batas
+        entri = []
+        for root, _, files in os.walk(self.direktori):
+            for nama in files:
+                if nama.endswith(".pkl.lock"):
+                    # sisa lock per kunci dari versi lama; lock sekarang ada di folder _kunci
+                    try:
+                        os.remove(os.path.join(root, nama))
+                    except FileNotFoundError:
+                        pass
+                elif nama.endswith(".pkl"):
+                    path = os.path.join(root, nama)
+                    try:
+                        info = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entri.append((info.st_mtime, info.st_size, path))
+
+        total = sum(e[1] for e in entri)
+        if total <= self.maks_bytes:
+            return
+        for _, ukuran, path in sorted(entri):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= ukuran
+            with self._lock:
+                self.statistik["evict"] += 1
+            if total <= self.maks_bytes * 0.9:
+                break
+
+    def __call__(self, fungsi):
+        # hash source fungsi dan semua modul proyek ikut masuk ke nama, jadi hasil lama tidak dipakai lagi
+        # setelah fungsinya atau helper yang dipanggilnya (analisis.py, scoring.py, ...) diubah
+        try:
+            kode = inspect.getsource(fungsi).encode("utf-8")
+            direktori = os.path.dirname(os.path.abspath(inspect.getsourcefile(fungsi)))
+        except (OSError, TypeError):
+            kode = fungsi.__code__.co_code
+            direktori = None
+        versi_kode = hash_modul(direktori) if direktori else "-"
+        nama = f"{fungsi.__module__}.{fungsi.__qualname__}:{hashlib.sha1(kode).hexdigest()[:12]}:{versi_kode}"
+
+        @functools.wraps(fungsi)
+        def wrapper(*args, **kwargs):
+            return self.ambil_atau_hitung(self.kunci(nama, args, kwargs), lambda: fungsi(*args, **kwargs))
+
+        return wrapper
+
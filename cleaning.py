@@ -1,50 +1,19 @@
-import pandas as pd
-
-df = pd.read_csv('AnalisisKepuasanJurusan.csv')
-df.info()
-
-#HAPUS KOLOM YANG TIDAK DIBUTUHKAN
-df = df.drop(columns = [
-    'Timestamp',
-    'Apakah Anda bersedia untuk mengisi pertanyaan-pertanyaan berikut ini?', 
-    'No. WhatsApp\nContoh : 087778669888', 
-    'Column 19']
-)
-
-#BERSIHKAN NAMA KOLOM
-df.columns = df.columns.str.replace(r"\n.*", "", regex=True)  # hapus teks setelah newline (\n)
-df.columns = df.columns.str.replace(r"Contoh.*", "", regex=True)  # hapus kata 'Contoh'
-df.columns = df.columns.str.strip()  # hapus spasi di awal/akhir
-
-kolom_kategori = [
-    'Fakultas',
-    'Program Studi',
-    'Dari mana Anda pertama kali mengetahui informasi tentang jurusan ini?',
-    'Apa alasan utama Anda memilih jurusan ini?',
-    'Apakah Anda pernah ingin pindah jurusan?',
-    'Seberapa relevan kurikulum jurusan Anda dengan kebutuhan dunia kerja?',
-    'Bagaimana tingkat kesesuaian jurusan yang Anda pilih dengan minat Anda?',
-    'Bagaimana penilaian Anda terhadap prospek kerja lulusan dari jurusan ini?'
-]
+import argparse
+import os
+import time
 
-for col in kolom_kategori:
-    df[col] = df[col].astype(str).str.strip().str.title()
-
-#UBAH KOLOM NUMERIK MENJADI TIPE NUMERIK
-kolom_numerik = [
-    'Secara keseluruhan, bagaimana tingkat kepuasan Anda terhadap jurusan yang Anda pilih?',
-    'Seberapa sulit mata kuliah yang ada di jurusan Anda?',
-    'Seberapa tinggi motivasi Anda mengikuti perkuliahan di jurusan ini?',
-    'Berapa banyak mata kuliah di jurusan ini yang menurut Anda benar-benar sesuai dengan minat Anda?',
-    'Berapa kali dalam satu minggu Anda merasa stress dan pusing karena tekanan tugas dari jurusan yang Anda pilih?',
-    'Dari total mata kuliah yang Anda tempuh, berapa banyak yang menurut Anda bermanfaat secara langsung untuk persiapan karier Anda?'
-]
+import pandas as pd
 
-for col in kolom_numerik:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+FILE_INPUT = 'AnalisisKepuasanJurusan.csv'
+FILE_OUTPUT = 'AnalisisKepuasan_terakhir.csv'  # langsung dibaca dashboard.py
+FILE_KARANTINA = 'AnalisisKepuasan_karantina.csv'
+FILE_RINGKASAN_VALIDASI = 'AnalisisKepuasan_validasi.csv'
+FILE_INDEKS_DEDUP = 'AnalisisKepuasan_dedup_index.pkl'
+FILE_LAPORAN_DUPLIKAT = 'AnalisisKepuasan_duplikat.csv'
+CHUNK_SIZE = 50_000
+FORMAT_TIMESTAMP = '%m/%d/%Y %H:%M:%S'  # format Timestamp export Google Form
 
-#MAPPING
-df['Program Studi'] = df['Program Studi'].replace({
+mapping_prodi = {
     'sains data' : 'Sains Data',
     'AKUNTANSI' : 'Akuntansi',
     'Dkv' : 'Desain Komunikasi Visual',
@@ -53,8 +22,326 @@ df['Program Studi'] = df['Program Studi'].replace({
     'Arsitektur 93’' : 'Arsitektur',
     'fisika' : 'Fisika',
     'agroteknologi' : 'Agroteknologi'
-})
+}
+
+skor_relevansi = {
+    'Sangat Relevan': 5,
+    'Relevan': 4,
+    'Cukup': 3,
+    'Kurang Relevan': 2,
+    'Tidak Relevan': 1,
+}
+
+#SKEMA DATASET
+# satu baris per pertanyaan form, dalam urutan kolom dataset dashboard:
+# (header mentah setelah dibersihkan, nama kolom dashboard, tipe akhir, aturan pembersihan, skor ordinal)
+# aturan pembersihan: None (apa adanya), 'kategori' (strip + Title Case, boleh dengan peta nilai),
+# 'angka' (to_numeric), 'waktu' (format datetime)
+# skor ordinal: (nama kolom skor, peta kategori -> skor, tipe) atau None
+# tipe 'int64' otomatis menjadi float64 jika kolom masih berisi nilai kosong
+SKEMA = [
+    ('Timestamp', 'Timestamp', 'datetime64[s]', ('waktu', FORMAT_TIMESTAMP), None),
+    ('Nama Lengkap', 'Nama Lengkap', 'object', None, None),
+    ('NPM', 'NPM', 'int64', None, None),
+    ('Fakultas', 'Fakultas', 'object', ('kategori', None), None),
+    ('Program Studi', 'Program Studi', 'object', ('kategori', mapping_prodi), None),
+    ('Angkatan', 'Angkatan', 'int64', None, None),
+    ('Dari mana Anda pertama kali mengetahui informasi tentang jurusan ini?', 'Sumber Informasi Jurusan', 'object', ('kategori', None), None),
+    ('Apa alasan utama Anda memilih jurusan ini?', 'Alasan Memilih Jurusan', 'object', ('kategori', None), None),
+    ('Apakah Anda pernah ingin pindah jurusan?', 'Keinginan Pindah Jurusan', 'object', ('kategori', None), None),
+    ('Seberapa relevan kurikulum jurusan Anda dengan kebutuhan dunia kerja?', 'Relevansi Kurikulum Jurusan dengan Dunia Kerja', 'object', ('kategori', None),
+     ('Relevansi Kurikulum (Skor)', skor_relevansi, 'int64')),
+    ('Bagaimana tingkat kesesuaian jurusan yang Anda pilih dengan minat Anda?', 'Kesesuaian Jurusan dengan Minat', 'object', ('kategori', None), None),
+    ('Bagaimana penilaian Anda terhadap prospek kerja lulusan dari jurusan ini?', 'Penilaian Prospek Kerja Jurusan', 'object', ('kategori', None), None),
+    ('Secara keseluruhan, bagaimana tingkat kepuasan Anda terhadap jurusan yang Anda pilih?', 'Tingkat Kepuasan', 'int64', ('angka', None), None),
+    ('Seberapa sulit mata kuliah yang ada di jurusan Anda?', 'Tingkat Kesulitan Mata Kuliah', 'int64', ('angka', None), None),
+    ('Seberapa tinggi motivasi Anda mengikuti perkuliahan di jurusan ini?', 'Tinggi Motivasi', 'int64', ('angka', None), None),
+    ('Berapa banyak mata kuliah di jurusan ini yang menurut Anda benar-benar sesuai dengan minat Anda?', 'Jumlah Mata Kuliah Sesuai Minat', 'int64', ('angka', None), None),
+    ('Berapa kali dalam satu minggu Anda merasa stress dan pusing karena tekanan tugas dari jurusan yang Anda pilih?', 'Jumlah Stress dalam Seminggu', 'int64', ('angka', None), None),
+    ('Dari total mata kuliah yang Anda tempuh, berapa banyak yang menurut Anda bermanfaat secara langsung untuk persiapan karier Anda?', 'Jumlah Mata Kuliah untuk Karier', 'int64', ('angka', None), None),
+]
+VERSI_SKEMA = 4  # naikkan jika SKEMA atau isi indeks dedup berubah; indeks dedup versi lain diproses ulang
+
+#ATURAN VALIDASI
+# (kode alasan, kolom, jenis cek, parameter) - kolom memakai nama dashboard dari SKEMA
+# jenis cek: 'wajib' (tidak boleh kosong), 'rentang' (min, max), 'pola' (regex penuh), 'kategori' (himpunan nilai)
+aturan_validasi = [
+    ('NAMA_KOSONG', 'Nama Lengkap', 'wajib', None),
+    ('NPM_KOSONG', 'NPM', 'wajib', None),
+    ('NPM_FORMAT', 'NPM', 'pola', r'\d{11}'),
+    ('FAKULTAS_KOSONG', 'Fakultas', 'wajib', None),
+    ('FAKULTAS_TIDAK_DIKENAL', 'Fakultas', 'kategori', {
+        'Fakultas Ilmu Komputer', 'Fakultas Teknik Dan Sains', 'Fakultas Ekonomi Dan Binis',
+        'Fakultas Ilmu Sosial Dan Politik', 'Fakultas Pertanian', 'Fakultas Hukum',
+        'Fakultas Arsitektur Dan Design', 'Fakultas Kedokteran',
+    }),
+    ('PRODI_KOSONG', 'Program Studi', 'wajib', None),
+    ('ANGKATAN_RENTANG', 'Angkatan', 'rentang', (2015, 2030)),
+    ('SUMBER_INFO_TIDAK_DIKENAL', 'Sumber Informasi Jurusan', 'kategori', {
+        'Teman / Saudara', 'Tentor Bimbingan Belajar', 'Media Sosial', 'Website Resmi Kampus',
+        'Pameran Pendidikan / Expo Kampus', 'Guru Sekolah',
+    }),
+    ('PINDAH_TIDAK_DIKENAL', 'Keinginan Pindah Jurusan', 'kategori', {'Ya', 'Tidak'}),
+    ('RELEVANSI_TIDAK_DIKENAL', 'Relevansi Kurikulum Jurusan dengan Dunia Kerja', 'kategori', {
+        'Sangat Relevan', 'Relevan', 'Cukup', 'Kurang Relevan', 'Tidak Relevan',
+    }),
+    ('MINAT_TIDAK_DIKENAL', 'Kesesuaian Jurusan dengan Minat', 'kategori', {
+        'Sangat Sesuai', 'Sesuai', 'Cukup', 'Kurang Sesuai', 'Tidak Sesuai',
+    }),
+    ('PROSPEK_TIDAK_DIKENAL', 'Penilaian Prospek Kerja Jurusan', 'kategori', {
+        'Sangat Baik', 'Baik', 'Cukup Baik', 'Buruk', 'Sangat Buruk',
+    }),
+    ('KEPUASAN_KOSONG', 'Tingkat Kepuasan', 'wajib', None),
+    ('KEPUASAN_RENTANG', 'Tingkat Kepuasan', 'rentang', (1, 10)),
+    ('KESULITAN_KOSONG', 'Tingkat Kesulitan Mata Kuliah', 'wajib', None),
+    ('KESULITAN_RENTANG', 'Tingkat Kesulitan Mata Kuliah', 'rentang', (1, 10)),
+    ('MOTIVASI_KOSONG', 'Tinggi Motivasi', 'wajib', None),
+    ('MOTIVASI_RENTANG', 'Tinggi Motivasi', 'rentang', (1, 10)),
+    ('MK_MINAT_RENTANG', 'Jumlah Mata Kuliah Sesuai Minat', 'rentang', (0, 80)),
+    ('STRESS_RENTANG', 'Jumlah Stress dalam Seminggu', 'rentang', (0, 70)),
+    ('MK_KARIER_RENTANG', 'Jumlah Mata Kuliah untuk Karier', 'rentang', (0, 80)),
+]
+
+
+def bersihkan_header(kolom):
+    kolom = pd.Index(kolom).str.replace(r"\n.*", "", regex=True)  # hapus teks setelah newline (\n)
+    kolom = kolom.str.replace(r"Contoh.*", "", regex=True)  # hapus kata 'Contoh'
+    return kolom.str.strip()  # hapus spasi di awal/akhir
+
+
+def _blok(df, kolom, fungsi):
+    # satu operasi vektor untuk seluruh blok kolom: stack -> fungsi Series -> unstack
+    if not kolom:
+        return df
+    # index posisi: index chunk boleh berisi label ganda (mis. hasil concat), unstack butuh yang unik
+    panjang = df[kolom].reset_index(drop=True).stack(future_stack=True)
+    ada = panjang.notna()
+    hasil = panjang.astype(object)
+    hasil[ada] = fungsi(panjang[ada])
+    df[kolom] = hasil.unstack().reindex(index=range(len(df)), columns=kolom).to_numpy()
+    return df
+
+
+def kompilasi_skema(skema=SKEMA, aturan=aturan_validasi):
+    """Ubah SKEMA menjadi satu fungsi proses(raw, waktu=None) -> (data dashboard valid, karantina, gagal per aturan).
+
+    Semua keputusan per kolom (nama, aturan, skor, tipe) diambil sekali di sini; setiap chunk lalu
+    hanya menjalankan operasi blok. Durasi setiap tahap (detik) ditambahkan ke dict waktu jika diberikan.
+    """
+    ganti_nama = {mentah: nama for mentah, nama, _, _, _ in skema}
+    kolom_kategori = [nama for _, nama, _, aturan_k, _ in skema if aturan_k and aturan_k[0] == 'kategori']
+    kolom_angka = [nama for _, nama, _, aturan_k, _ in skema if aturan_k and aturan_k[0] == 'angka']
+    peta_nilai = {nama: aturan_k[1] for _, nama, _, aturan_k, _ in skema if aturan_k and aturan_k[0] == 'kategori' and aturan_k[1]}
+    format_waktu = {nama: aturan_k[1] for _, nama, _, aturan_k, _ in skema if aturan_k and aturan_k[0] == 'waktu'}
+    skor = [(nama, kolom_skor, peta) for _, nama, _, _, s in skema if s for kolom_skor, peta, _ in [s]]
+    tipe = {nama: t for _, nama, t, _, _ in skema}
+    tipe.update({s[0]: s[2] for _, _, _, _, s in skema if s})
+
+    def proses(raw, waktu=None):
+        waktu = {} if waktu is None else waktu
+        mulai = time.perf_counter()
+
+        def catat(tahap):
+            nonlocal mulai
+            sekarang = time.perf_counter()
+            waktu[tahap] = waktu.get(tahap, 0.0) + sekarang - mulai
+            mulai = sekarang
+
+        # header: teks contoh dibuang, kolom di luar skema (WhatsApp, persetujuan, dll.) tidak ikut
+        df = raw.set_axis(bersihkan_header(raw.columns), axis=1)
+        df = df.reindex(columns=list(ganti_nama)).rename(columns=ganti_nama)
+        catat('header')
+
+        # jawaban kosong tetap NaN (bukan teks 'Nan') supaya bisa ditangkap aturan 'wajib'
+        df = _blok(df, kolom_kategori, lambda s: s.astype(str).str.strip().str.title())
+        for kolom, peta in peta_nilai.items():
+            df[kolom] = df[kolom].replace(peta)
+        df[kolom_angka] = df[kolom_angka].apply(pd.to_numeric, errors='coerce')
+        for kolom, fmt in format_waktu.items():
+            df[kolom] = pd.to_datetime(df[kolom], format=fmt, errors='coerce')
+        catat('pembersihan')
+
+        valid, karantina, gagal = validasi(df, aturan)
+        catat('validasi')
+
+        valid = valid.copy()
+        for kolom, kolom_skor, peta in skor:
+            valid[kolom_skor] = valid[kolom].map(peta)
+        for kolom, t in tipe.items():
+            if t == 'int64':
+                angka = pd.to_numeric(valid[kolom], errors='coerce')
+                valid[kolom] = angka.astype('int64') if angka.notna().all() else angka.astype('float64')
+            else:
+                valid[kolom] = valid[kolom].astype(t)
+        catat('skor & tipe')
+        return valid, karantina, gagal
+
+    return proses
+
+
+def _mask_gagal(df, kolom, jenis, parameter):
+    # True = baris melanggar aturan; setiap cek berupa operasi vektor atas satu kolom
+    nilai = df[kolom]
+    if jenis == 'wajib':
+        return nilai.isna() | nilai.astype(str).str.strip().eq('')
+    if jenis == 'rentang':
+        angka = pd.to_numeric(nilai, errors='coerce')
+        return angka.notna() & ~angka.between(*parameter) | (nilai.notna() & angka.isna())
+    if jenis == 'pola':
+        teks = nilai.astype('string').str.strip().str.replace(r'\.0$', '', regex=True)
+        return nilai.notna() & ~teks.str.fullmatch(parameter).fillna(False).astype(bool)
+    if jenis == 'kategori':
+        return nilai.notna() & ~nilai.isin(parameter)
+    raise ValueError(f"Jenis aturan tidak dikenal: {jenis}")
+
+
+def validasi(df, aturan=aturan_validasi):
+    """Pisahkan baris valid dan baris karantina beserta kode alasannya."""
+    masks = pd.DataFrame(
+        {kode: _mask_gagal(df, kolom, jenis, parameter) for kode, kolom, jenis, parameter in aturan},
+        index=df.index,
+    )
+    gagal = masks.any(axis=1)
+
+    # gabungkan kode alasan per baris tanpa loop: bool (0/1) x 'KODE;' lalu dijumlahkan per baris
+    alasan = masks[gagal].dot(pd.Series([kode + ';' for kode in masks.columns], index=masks.columns))
+
+    karantina = df[gagal].copy()
+    karantina.insert(0, 'Alasan Karantina', alasan.str.rstrip(';'))
+    return df[~gagal], karantina, masks.sum()
+
+
+def ringkasan_validasi(total_baris, total_karantina, jumlah_per_aturan):
+    ringkasan = jumlah_per_aturan.rename('Jumlah Gagal').to_frame()
+    ringkasan['Persentase (%)'] = (ringkasan['Jumlah Gagal'] / max(total_baris, 1) * 100).round(2)
+    ringkasan.loc['TOTAL_BARIS'] = [total_baris, 100.0]
+    ringkasan.loc['TOTAL_KARANTINA'] = [total_karantina, round(total_karantina / max(total_baris, 1) * 100, 2)]
+    ringkasan['Jumlah Gagal'] = ringkasan['Jumlah Gagal'].astype(int)
+    ringkasan.index.name = 'Kode Aturan'
+    return ringkasan
+
+
+def kunci_responden(df):
+    """Hash kunci responden: NPM yang dinormalisasi, atau nama + program studi jika NPM tidak valid."""
+    npm = df['NPM'].astype('string').str.strip().str.replace(r'\.0$', '', regex=True).str.replace(r'\D', '', regex=True)
+    npm_valid = npm.str.fullmatch(r'\d{11}').fillna(False).astype(bool)
+
+    nama = df['Nama Lengkap'].astype('string').str.lower().str.split().str.join(' ')
+    prodi = df['Program Studi'].astype('string').str.lower().str.strip()
+    kunci = ('NPM:' + npm).where(npm_valid, 'NAMA:' + nama.fillna('') + '|' + prodi.fillna(''))
+    return pd.util.hash_pandas_object(kunci, index=False)
+
+
+def indeks_kosong():
+    # validasi = hitungan kumulatif semua baris yang pernah diproses, supaya ringkasan mencakup seluruh dataset
+    return {'baris_terproses': 0, 'data': None,
+            'validasi': {'total_baris': 0, 'total_karantina': 0, 'per_aturan': pd.Series(dtype='int64')}}
+
+
+def muat_indeks_dedup(path=FILE_INDEKS_DEDUP):
+    # indeks = satu baris terpilih per responden (bukan semua submisi) + jumlah baris mentah yang sudah diproses
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+    return indeks_kosong()
+
+
+def deduplikasi(baru, indeks_data, kebijakan='terbaru'):
+    """Gabungkan baris baru ke indeks; kebijakan 'terbaru' menyimpan submisi terakhir, 'pertama' yang paling awal."""
+    if kebijakan not in ('terbaru', 'pertama'):
+        raise ValueError(f"Kebijakan duplikat tidak dikenal: {kebijakan}")
+    keep = 'last' if kebijakan == 'terbaru' else 'first'
+
+    baru = baru.assign(_kunci=kunci_responden(baru).values)
+    gabungan = baru if indeks_data is None else pd.concat([indeks_data, baru], ignore_index=True)
+    if 'ID_Responden' not in gabungan.columns:
+        gabungan.insert(0, 'ID_Responden', float('nan'))
+
+    # ID_Responden dibagikan sekali, saat kunci pertama kali terlihat; submisi pengganti mewarisi ID itu,
+    # jadi ID tidak bergeser walaupun responden lain menggantikan submisinya
+    id_responden = gabungan.groupby('_kunci', sort=False)['ID_Responden'].transform('first')
+    belum = id_responden.isna()
+    id_berikut = int(id_responden.max()) + 1 if (~belum).any() else 1
+    id_responden[belum] = pd.factorize(gabungan.loc[belum, '_kunci'])[0] + id_berikut
+    gabungan['ID_Responden'] = id_responden.astype('int64')
+
+    # urutan gabungan = urutan submisi (indeks lama selalu lebih awal dari data baru)
+    duplikat = gabungan.duplicated('_kunci', keep=keep)
+    laporan = gabungan.loc[duplikat, ['ID_Responden', '_kunci', 'NPM', 'Nama Lengkap', 'Program Studi']].copy()
+    laporan = laporan.rename(columns={'_kunci': 'Kunci Hash'})
+    laporan.insert(0, 'Kebijakan', kebijakan)
+
+    return gabungan[~duplikat].sort_values('ID_Responden', kind='stable').reset_index(drop=True), laporan
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cleaning data survei kepuasan jurusan')
+    parser.add_argument('--kebijakan', choices=['terbaru', 'pertama'], default='terbaru',
+                        help='submisi mana yang disimpan jika satu mahasiswa mengisi lebih dari sekali')
+    parser.add_argument('--ulang', action='store_true', help='abaikan indeks lama dan proses ulang seluruh file')
+    args = parser.parse_args()
+
+    indeks = indeks_kosong() if args.ulang else muat_indeks_dedup()
+    if indeks.get('versi_skema') != VERSI_SKEMA:
+        # indeks dibuat dengan skema lain (kolom/tipe berbeda), jadi tidak bisa digabung dengan hasil baru
+        if indeks['baris_terproses']:
+            print(f"Indeks dedup memakai skema lama, seluruh '{FILE_INPUT}' diproses ulang.")
+        indeks = indeks_kosong()
+    indeks['versi_skema'] = VERSI_SKEMA
+    baru_mulai = indeks['baris_terproses'] == 0
+
+    proses = kompilasi_skema()
+    waktu = {}
+    total_baris = 0
+    total_karantina = 0
+    total_duplikat = 0
+    jumlah_per_aturan = pd.Series(0, index=[a[0] for a in aturan_validasi])
+
+    # hanya baris setelah offset terakhir yang dibaca; diproses per chunk agar memori tetap kecil
+    reader = pd.read_csv(FILE_INPUT, chunksize=CHUNK_SIZE, skiprows=range(1, indeks['baris_terproses'] + 1))
+    mulai = time.perf_counter()
+    for i, chunk in enumerate(reader):
+        waktu['baca'] = waktu.get('baca', 0.0) + time.perf_counter() - mulai
+        valid, karantina, gagal = proses(chunk, waktu)
+
+        mulai = time.perf_counter()
+        indeks['data'], laporan = deduplikasi(valid, indeks['data'], args.kebijakan)
+        waktu['deduplikasi'] = waktu.get('deduplikasi', 0.0) + time.perf_counter() - mulai
+
+        tulis_baru = baru_mulai and i == 0
+        karantina.to_csv(FILE_KARANTINA, index=False, mode='w' if tulis_baru else 'a', header=tulis_baru)
+        laporan.to_csv(FILE_LAPORAN_DUPLIKAT, index=False, mode='w' if tulis_baru else 'a', header=tulis_baru)
+
+        indeks['baris_terproses'] += len(chunk)
+        total_baris += len(chunk)
+        total_karantina += len(karantina)
+        total_duplikat += len(laporan)
+        jumlah_per_aturan = jumlah_per_aturan.add(gagal, fill_value=0).astype(int)
+        mulai = time.perf_counter()
+
+    #RINGKASAN VALIDASI (kumulatif: run ini + semua run sebelumnya sejak indeks dibuat)
+    kumulatif = indeks['validasi']
+    kumulatif['total_baris'] += total_baris
+    kumulatif['total_karantina'] += total_karantina
+    kumulatif['per_aturan'] = kumulatif['per_aturan'].add(jumlah_per_aturan, fill_value=0).astype(int)
+    ringkasan = ringkasan_validasi(kumulatif['total_baris'], kumulatif['total_karantina'], kumulatif['per_aturan'])
+    ringkasan.to_csv(FILE_RINGKASAN_VALIDASI)
+    print(f"Ringkasan validasi seluruh {kumulatif['total_baris']} baris (run ini: {total_baris} baris baru, {total_karantina} dikarantina)")
+    print(ringkasan[ringkasan['Jumlah Gagal'] > 0])
+
+    #SAVE FILE
+    if indeks['data'] is not None:
+        mulai = time.perf_counter()
+        pd.to_pickle(indeks, FILE_INDEKS_DEDUP)
+        # ID_Responden = urutan responden unik pertama kali terlihat (tetap antar run), kolom lain persis urutan SKEMA
+        keluaran = indeks['data'].drop(columns='_kunci')
+        keluaran.to_csv(FILE_OUTPUT, index=False)
+        waktu['tulis'] = time.perf_counter() - mulai
+        print(f"\n✅ Data dashboard berhasil disimpan sebagai '{FILE_OUTPUT}' "
+              f"({len(indeks['data'])} responden unik; {total_baris} baris baru, {total_karantina} dikarantina, "
+              f"{total_duplikat} duplikat digabung - lihat '{FILE_LAPORAN_DUPLIKAT}')")
+    else:
+        print("\nTidak ada baris baru untuk diproses.")
 
-#SAVE FILE
-df.to_csv('AnalaisisKepuasan_cleaned.csv', index=False)
-print("\n✅ Data cleaned berhasil disimpan sebagai 'data_cleaned.csv'")
\ No newline at end of file
+    #WAKTU PER TAHAP
+    waktu = pd.Series(waktu, name='Detik')
+    print(pd.DataFrame({'Detik': waktu.round(4), 'Persentase (%)': (waktu / max(waktu.sum(), 1e-12) * 100).round(1)}))
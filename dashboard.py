@@ -1,14 +1,35 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
 import statsmodels.api as sm
+import functools
+import glob
+import io
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from textwrap import dedent
+from analisis import KRITERIA_MODEL, PeringkatTeratas, matriks_crossproduct, cari_semua_subset, cari_stepwise
+from analisis import kode_kategori, hitung_kombinasi, tabel_panjang, matriks_cramers_v
+from analisis import gabung_kategori_kecil, link_sankey
+from analisis import crossproduct_per_grup, fit_per_grup, bobot_raking
+from analisis import frekuensi_dua_kelompok, uji_numerik_dua_kelompok, uji_kategorik_dua_kelompok, koreksi_bh
+from analisis import metrik_kualitas, statistik_cukup, shrinkage_bertingkat
+from cleaning import aturan_validasi
+from live import AgregatInkremental, AgregatWaktu, IngestLive
+from cache_bersama import CacheDisk
+from aset import css_font, font_matplotlib, url_static
+from ekspor import FORMAT, DIR_UNDUHAN, nama_file_ekspor, siapkan_ekspor
+from scoring import fit_klaster, fit_pca, fit_analisis_faktor, proyeksi, buat_artefak, simpan_artefak, DIR_ARTEFAK
+from store import PoolKoneksi, perbarui_store, versi_isi, rata_rata_per_grup, hitung_kategori, crosstab
 
 # ---------------------------
 # CONFIG
@@ -19,6 +40,22 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# PROFIL_RERUN=1: catat lama eksekusi skrip penuh dan setiap fragment, ditampilkan di sidebar
+PROFIL_RERUN = os.environ.get("PROFIL_RERUN") == "1"
+_awal_rerun = time.perf_counter()
+
+def terukur(fungsi):
+    # dipasang di bawah @st.fragment; satu entri per fragment berisi durasi run terakhirnya (ms)
+    @functools.wraps(fungsi)
+    def wrapper(*args, **kwargs):
+        mulai = time.perf_counter()
+        try:
+            return fungsi(*args, **kwargs)
+        finally:
+            if PROFIL_RERUN:
+                st.session_state.setdefault("latensi_rerun", {})[fungsi.__name__] = (time.perf_counter() - mulai) * 1000
+    return wrapper
+
 # ---------------------------
 # THEME COLORS & FONTS (consistent purple)
 # Dihapus warna statis teks/background yang menyebabkan masalah di Dark Mode
@@ -32,12 +69,10 @@ CARD_BG_DARK = "#1f1530" # Ini masih bisa dipakai untuk card mode gelap kustom
 # TEXT_DARK = "#260844"        # Dihapus - DIGANTI DENGAN var(--text-color)
 
 # ---------------------------
-# STYLES - import Poppins font & CSS
+# STYLES - font Poppins lokal (static/fonts; Google Fonts hanya untuk file yang belum diunduh) & CSS
 # ---------------------------
-st.markdown(
-    f"""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700;800&display=swap');
+CSS_DASHBOARD = f"""
+    {css_font()}
 
     html, body, [class*="css"]  {{
         font-family: 'Poppins', sans-serif;
@@ -131,10 +166,13 @@ st.markdown(
         color: var(--text-color); 
         padding-bottom: 4px;
     }}
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+"""
+
+def suntik_css(css):
+    # string CSS dibangun sekali saat modul dimuat; <style> dikirim ulang tiap rerun supaya tidak hilang dari halaman
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+suntik_css(CSS_DASHBOARD)
 
 # ---------------------------
 # HEADER
@@ -142,7 +180,7 @@ st.markdown(
 col1, col2, col3 = st.columns([1, 5, 2]) 
 
 with col1: 
-    st.image("LogoUPN.png", width=150) 
+    st.markdown(f"<img src='{url_static('logo_upn.webp')}' width='150' alt='Logo UPN'>", unsafe_allow_html=True)
 with col2: 
     # Pastikan teks di header tidak menggunakan style color statis yang crash dengan dark mode
     st.markdown( """ <div style='text-align: center;'> <h1>🎓 Dashboard Analisis Kepuasan Mahasiswa Gen Z terhadap Jurusan Pilihan 🎓</h1> 
@@ -150,7 +188,7 @@ with col2:
                  <p style='font-size: 22px; margin-top: 5px; color: var(--text-color);'>Violin Chantika Ardianisya 24083010043 | Salwa Zahra Rahmawati 24083010083 | Siva Ifin Azzahra 24083010121</p> </div> """, 
                 unsafe_allow_html=True ) 
 with col3: 
-    st.image("LogoSada.png", width=150)
+    st.markdown(f"<img src='{url_static('logo_sada.webp')}' width='150' alt='Logo Sada'>", unsafe_allow_html=True)
 
 st.markdown(
     """
@@ -164,34 +202,757 @@ st.write("")
 # ---------------------------
 # LOAD DATA
 # ---------------------------
+DATA_PATH = "AnalisisKepuasan_terakhir.csv"
+# file export Google Form (append-only) atau folder drop berisi file CSV baru
+LIVE_SOURCE = os.environ.get("LIVE_SOURCE", "AnalisisKepuasanJurusan.csv")
+LIVE_INTERVAL = 5  # detik
+# backend agregat: "pandas" (default) atau "sqlite" (query agregat dijalankan di database lokal)
+DATA_BACKEND = os.environ.get("DATA_BACKEND", "pandas")
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "AnalisisKepuasan.sqlite")
+# cache hasil di disk yang dipakai bersama semua proses dashboard di mesin yang sama
+CACHE_DIR = os.environ.get("CACHE_DIR", ".cache_hasil")
+CACHE_MAKS_MB = int(os.environ.get("CACHE_MAKS_MB", "512"))
+# jumlah populasi per Fakultas/Angkatan/(Program Studi) untuk bobot post-stratifikasi; lihat margin_populasi.contoh.json
+MARGIN_PATH = os.environ.get("MARGIN_PATH", "margin_populasi.json")
+BATAS_BOBOT = (0.2, 5.0)  # bobot dipotong relatif terhadap rata-rata agar satu responden tidak mendominasi
+
+@st.cache_resource(show_spinner=False)
+def cache_disk(direktori, maks_mb):
+    # satu instance per proses supaya hitungan hit/miss tidak hilang di setiap rerun
+    return CacheDisk(direktori, maks_bytes=maks_mb * 1024 * 1024)
+
+cache_bersama = cache_disk(CACHE_DIR, CACHE_MAKS_MB)
+
+# salinan isi file per versi: versi lama yang masih dilayani tetap dibaca dari isinya sendiri,
+# bukan dari file terbaru, walaupun cache load_data-nya sudah hilang
+DIR_SNAPSHOT = os.path.join(CACHE_DIR, "data")
+MAKS_SNAPSHOT = 3
+
+def path_snapshot(path, versi):
+    akar, ekstensi = os.path.splitext(os.path.basename(path))
+    return os.path.join(DIR_SNAPSHOT, f"{akar}_{versi}{ekstensi}")
+
 @st.cache_data(show_spinner=False)
-def load_data(path="AnalisisKepuasan_terakhir.csv"):
-    df = pd.read_csv(path)
+def versi_data(path, mtime):
+    # versi data = hash isi file; mtime hanya dipakai sebagai kunci cache agar file tidak di-hash ulang tiap rerun
+    with open(path, "rb") as f:
+        isi = f.read()
+    versi = versi_isi(isi)
+
+    # snapshot ditulis dari byte yang sama dengan yang di-hash, jadi versi dan isinya selalu cocok
+    tujuan = path_snapshot(path, versi)
+    if not os.path.exists(tujuan):
+        os.makedirs(DIR_SNAPSHOT, exist_ok=True)
+        tmp = f"{tujuan}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(isi)
+        os.replace(tmp, tujuan)
+    # hanya beberapa versi terbaru yang disimpan (versi aktif + versi yang sedang dipanaskan)
+    akar, ekstensi = os.path.splitext(os.path.basename(path))
+    lama = sorted(glob.glob(os.path.join(DIR_SNAPSHOT, f"{akar}_*{ekstensi}")), key=os.path.getmtime, reverse=True)
+    for p in lama[MAKS_SNAPSHOT:]:
+        if p != tujuan:
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+    return versi
+
+# versi data turunan tanpa respons berkualitas rendah, mis. "3f2a9c1b7d4e-berkualitas";
+# semua fungsi ber-cache sudah memakai versi sebagai kunci, jadi otomatis ikut terpisah
+AKHIRAN_BERKUALITAS = "-berkualitas"
+
+@st.cache_data(show_spinner=False)
+def load_data(path=DATA_PATH, versi=None):
+    versi_dasar = versi.removesuffix(AKHIRAN_BERKUALITAS) if versi else None
+    if versi_dasar and os.path.exists(path_snapshot(path, versi_dasar)):
+        df = pd.read_csv(path_snapshot(path, versi_dasar))
+    else:
+        with open(path, "rb") as f:
+            isi = f.read()
+        # tanpa snapshot, file terbaru hanya boleh dipakai jika isinya memang versi yang diminta
+        if versi_dasar and versi_isi(isi) != versi_dasar:
+            raise ValueError(f"Snapshot data versi {versi_dasar} tidak tersedia lagi")
+        df = pd.read_csv(io.BytesIO(isi))
+    if "Timestamp" in df.columns:
+        # output cleaning.py menyertakan waktu submisi; dibaca sebagai tanggal, bukan kategori
+        df["Timestamp"] = pd.to_datetime(df["Timestamp"], errors="coerce")
+    if versi and versi.endswith(AKHIRAN_BERKUALITAS):
+        df = df[~kualitas_respons(path, versi.removesuffix(AKHIRAN_BERKUALITAS))["Kualitas Rendah"]]
     return df
 
+def filter_prodi(df, prodi_terpilih):
+    if prodi_terpilih and "Program Studi" in df.columns:
+        return df[df["Program Studi"].isin(prodi_terpilih)]
+    return df
+
+# ---------------------------
+# KUALITAS RESPONS
+# ---------------------------
+# item penilaian dalam urutan kuesioner; skala ordinal dari rendah ke tinggi, Likert 1–10
+SKALA_ORDINAL = {
+    "Relevansi Kurikulum Jurusan dengan Dunia Kerja": ["Tidak Relevan", "Kurang Relevan", "Cukup", "Relevan", "Sangat Relevan"],
+    "Kesesuaian Jurusan dengan Minat": ["Tidak Sesuai", "Kurang Sesuai", "Cukup", "Sesuai", "Sangat Sesuai"],
+    "Penilaian Prospek Kerja Jurusan": ["Sangat Buruk", "Buruk", "Cukup Baik", "Baik", "Sangat Baik"],
+}
+SKALA_LIKERT = {"Tingkat Kepuasan": (1, 10), "Tingkat Kesulitan Mata Kuliah": (1, 10), "Tinggi Motivasi": (1, 10)}
+BATAS_VARIANS = 0.002  # varians dalam baris (skala 0..1) di bawah ini = jawaban nyaris seragam
+
+# (kode, mask) jawaban yang saling bertentangan
+ATURAN_INKONSISTENSI = [
+    ("PUAS_MAKS_INGIN_PINDAH", lambda d: (d["Tingkat Kepuasan"] == 10) & (d["Keinginan Pindah Jurusan"] == "Ya")),
+    ("PUAS_MAKS_TIDAK_SESUAI_MINAT", lambda d: (d["Tingkat Kepuasan"] == 10) & d["Kesesuaian Jurusan dengan Minat"].isin(["Tidak Sesuai", "Kurang Sesuai"])),
+    ("TIDAK_PUAS_SANGAT_SESUAI_MINAT", lambda d: (d["Tingkat Kepuasan"] <= 2) & (d["Kesesuaian Jurusan dengan Minat"] == "Sangat Sesuai")),
+]
+# batas wajar jumlah (mis. stress per minggu) diambil dari aturan validasi cleaning.py
+ATURAN_RENTANG = [
+    (kode, kolom, batas)
+    for kode, kolom, jenis, batas in aturan_validasi if jenis == "rentang"
+]
+
+@st.cache_data(show_spinner=False)
+def kualitas_respons(path, versi):
+    """Metrik kualitas per responden (index sama dengan data mentah) dan keputusan Kualitas Rendah."""
+    data = load_data(path, versi)
+    blok = [pd.Categorical(data[c], categories=k).codes / (len(k) - 1) for c, k in SKALA_ORDINAL.items() if c in data.columns]
+    blok += [(data[c] - lo) / (hi - lo) for c, (lo, hi) in SKALA_LIKERT.items() if c in data.columns]
+    blok = np.column_stack(blok).astype(float)
+    blok[blok < 0] = np.nan  # kode -1 = jawaban kosong / di luar skala
+    varians, deret = metrik_kualitas(blok)
+
+    hasil = pd.DataFrame({"Varians Dalam Baris": varians, "Deret Identik Terpanjang": deret}, index=data.index)
+    alasan = pd.DataFrame(index=data.index)
+    alasan["JAWABAN_SERAGAM"] = (hasil["Varians Dalam Baris"] < BATAS_VARIANS) | (hasil["Deret Identik Terpanjang"] >= blok.shape[1])
+    for kode, mask in ATURAN_INKONSISTENSI:
+        alasan[kode] = mask(data).to_numpy()
+    for kode, kolom, (lo, hi) in ATURAN_RENTANG:
+        if kolom in data.columns:
+            alasan[kode] = ~data[kolom].between(lo, hi) & data[kolom].notna()
+
+    hasil["Jumlah Inkonsistensi"] = alasan[[k for k, _ in ATURAN_INKONSISTENSI]].sum(axis=1)
+    hasil["Kualitas Rendah"] = alasan.any(axis=1)
+    hasil["Alasan"] = alasan.dot(alasan.columns + ", ").str.rstrip(", ")
+    return hasil
+
+@st.cache_data(show_spinner=False)
+def muat_margin(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        isi = json.load(f)
+    # dijadikan tuple supaya bisa langsung dipakai sebagai argumen fungsi ber-cache
+    return tuple(
+        (kolom, tuple((str(k), float(v)) for k, v in target.items()))
+        for kolom, target in isi.items() if not kolom.startswith("_")
+    )
+
+def margin_populasi():
+    if not os.path.exists(MARGIN_PATH):
+        return None
+    return muat_margin(MARGIN_PATH, os.path.getmtime(MARGIN_PATH))
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def bobot_responden(versi, margin):
+    # dihitung dari seluruh data, bukan data terfilter, supaya bobot mewakili populasi universitas
+    data = load_data(DATA_PATH, versi)
+    kode_list, target_list = [], []
+    for kolom, target in margin:
+        if kolom not in data.columns:
+            continue
+        nilai = data[kolom]
+        if pd.api.types.is_numeric_dtype(nilai):
+            nilai = nilai.astype("Int64")
+        kode = pd.Categorical(nilai.astype("string"), categories=[k for k, _ in target]).codes
+        kode_list.append(kode.astype(np.int64))
+        target_list.append([v for _, v in target])
+    w, iterasi, konvergen, selisih = bobot_raking(kode_list, target_list, batas=BATAS_BOBOT)
+    return pd.Series(w, index=data.index), iterasi, konvergen, selisih
+
+def bobot_terfilter(versi, margin, data):
+    # None = tanpa bobot
+    return None if margin is None else bobot_responden(versi, margin)[0].loc[data.index]
+
+def rata_berbobot(nilai, w=None):
+    if w is None:
+        return nilai.mean()
+    ada = nilai.notna()
+    return (nilai[ada] * w[ada]).sum() / w[ada].sum() if ada.any() else np.nan
+
+def frekuensi(nilai, w=None, normalize=False):
+    vc = nilai.value_counts() if w is None else w.groupby(nilai).sum()
+    # seri diurutkan per kategori dulu, jadi kategori terbanyak sama dengan mode() jika ada yang seri
+    vc = vc.sort_index().sort_values(ascending=False, kind="stable")
+    return vc / vc.sum() if normalize else vc
+
+def rata_grup(data, kolom_grup, kolom_nilai, w=None):
+    if w is None:
+        return data.groupby(kolom_grup)[kolom_nilai].mean()
+    ada = data[kolom_nilai].notna()
+    grup = data.loc[ada, kolom_grup]
+    return (data.loc[ada, kolom_nilai] * w[ada]).groupby(grup).sum() / w[ada].groupby(grup).sum()
+
+def korelasi(data, kolom, w=None):
+    if w is None:
+        return data[kolom].corr()
+    # korelasi Pearson berbobot dihitung pada baris yang lengkap untuk semua kolom
+    lengkap = data[kolom].notna().all(axis=1)
+    cov = np.cov(data.loc[lengkap, kolom].to_numpy(dtype=float), rowvar=False, aweights=w[lengkap])
+    sd = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame(cov / np.outer(sd, sd), index=kolom, columns=kolom)
+
+@st.cache_resource(show_spinner=False)
+def ingestor_live(sumber, versi):
+    # agregat awal dihitung sekali dari dataset; setelah itu hanya baris baru yang dilipat masuk
+    # submisi ulang lewat live digabung dengan kebijakan yang sama seperti cleaning.py (submisi terbaru dipakai)
+    return IngestLive(sumber, AgregatInkremental(), agregat_waktu=AgregatWaktu(), data_awal=load_data(DATA_PATH, versi))
+
+MAKS_POOL = 2  # versi aktif + versi yang sedang dipanaskan, sama seperti snapshot data
+
+@st.cache_resource(show_spinner=False)
+def daftar_pool():
+    # pool per (file store, versi) yang masih terbuka di proses ini, urut dari yang paling lama dipakai
+    return {"lock": threading.Lock(), "pool": {}}
+
+def pool_sqlite(path, versi):
+    # store di disk dipakai bersama semua proses dashboard; hanya dibangun ulang jika versinya tertinggal.
+    # versi turunan (tanpa respons berkualitas rendah) memakai file sendiri supaya tidak saling menimpa
+    if versi.endswith(AKHIRAN_BERKUALITAS):
+        akar, ekstensi = os.path.splitext(path)
+        path = f"{akar}{AKHIRAN_BERKUALITAS}{ekstensi}"
+    daftar = daftar_pool()
+    with daftar["lock"]:
+        pool = daftar["pool"].pop((path, versi), None)
+        if pool is None:
+            perbarui_store(path, versi, lambda: load_data(DATA_PATH, versi))
+            pool = PoolKoneksi(path, versi=versi)
+        daftar["pool"][(path, versi)] = pool
+        lama = list(daftar["pool"])[:-MAKS_POOL]
+        # koneksi versi yang sudah tidak dilayani ditutup, bukan dibiarkan terbuka sampai proses berhenti
+        for kunci in lama:
+            daftar["pool"].pop(kunci).tutup()
+    return pool
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def agregat_rata_grup(versi, prodi_terpilih, kolom_grup, kolom_nilai, margin=None):
+    # bobot tidak disimpan di SQLite, jadi mode berbobot selalu dihitung di pandas
+    if DATA_BACKEND == "sqlite" and margin is None:
+        return rata_rata_per_grup(pool_sqlite(SQLITE_PATH, versi), kolom_grup, kolom_nilai, prodi_terpilih)
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    avg = rata_grup(data, kolom_grup, kolom_nilai, bobot_terfilter(versi, margin, data))
+    return avg.rename(kolom_nilai).reset_index().sort_values(kolom_nilai, ascending=False)
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def agregat_hitung(versi, prodi_terpilih, kolom, margin=None):
+    if DATA_BACKEND == "sqlite" and margin is None:
+        return hitung_kategori(pool_sqlite(SQLITE_PATH, versi), kolom, prodi_terpilih)
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    vc = frekuensi(data[kolom], bobot_terfilter(versi, margin, data)).round(1).reset_index()
+    vc.columns = [kolom, "Jumlah"]
+    return vc
+
+KOLOM_PRIBADI = ["Nama Lengkap", "NPM"]
+
+@st.cache_data(show_spinner=False)
+def urutan_kolom(versi, prodi_terpilih, kolom, naik=True):
+    # urutan baris (posisi) untuk satu kolom, dihitung sekali lalu dipakai ulang oleh semua halaman preview
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih)).reset_index(drop=True)
+    return data[kolom].sort_values(ascending=naik, kind="stable", na_position="last").index.to_numpy()
+
+@st.cache_data(show_spinner=False)
+def mask_cari(versi, prodi_terpilih, cari):
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    teks = data.drop(columns=[c for c in KOLOM_PRIBADI if c in data.columns]).select_dtypes(include=["object"])
+    mask = np.zeros(len(data), dtype=bool)
+    for c in teks.columns:
+        mask |= teks[c].str.contains(cari, case=False, regex=False, na=False).to_numpy()
+    return mask
+
+@st.cache_data(show_spinner=False)
+def posisi_preview(versi, prodi_terpilih, sort_by, naik, cari):
+    # posisi baris (terurut & tersaring) dari data terfilter; tabel preview hanya mengambil satu potongan
+    n = len(filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih)))
+    posisi = urutan_kolom(versi, prodi_terpilih, sort_by, naik) if sort_by else np.arange(n)
+    if cari:
+        posisi = posisi[mask_cari(versi, prodi_terpilih, cari)[posisi]]
+    return posisi
+
+COLS_PERSEPSI = [
+    "Relevansi Kurikulum Jurusan dengan Dunia Kerja",
+    "Kesesuaian Jurusan dengan Minat",
+    "Penilaian Prospek Kerja Jurusan"
+]
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def crosstab_persepsi(versi, prodi_terpilih, margin=None):
+    # Fakultas × Program Studi × persepsi untuk ketiga kolom persepsi sekaligus,
+    # dari kode integer yang difaktorkan sekali (satu bincount per kolom persepsi)
+    cols = [c for c in COLS_PERSEPSI if c in load_data(DATA_PATH, versi).columns]
+    if DATA_BACKEND == "sqlite" and margin is None:
+        pool = pool_sqlite(SQLITE_PATH, versi)
+        return {c: crosstab(pool, ["Fakultas", "Program Studi", c], prodi_terpilih) for c in cols}
+
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    w = bobot_terfilter(versi, margin, data)
+    kode_f, kat_f = kode_kategori(data["Fakultas"])
+    kode_p, kat_p = kode_kategori(data["Program Studi"])
+    hasil = {}
+    for c in cols:
+        kode_c, kat_c = kode_kategori(data[c])
+        tabel = hitung_kombinasi([kode_f, kode_p, kode_c], [len(kat_f), len(kat_p), len(kat_c)], bobot=w)
+        hasil[c] = tabel_panjang(tabel, [kat_f, kat_p, kat_c], ["Fakultas", "Program Studi", c])
+    return hasil
+
+KOLOM_KATEGORI_ASOSIASI = [
+    "Fakultas",
+    "Sumber Informasi Jurusan",
+    "Alasan Memilih Jurusan",
+    "Keinginan Pindah Jurusan",
+] + COLS_PERSEPSI
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def asosiasi_kategorik(versi, prodi_terpilih):
+    # matriks Cramér's V + p-value chi-square untuk semua pasangan kolom kategorik
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    cols = [c for c in KOLOM_KATEGORI_ASOSIASI if c in data.columns]
+    kode = [kode_kategori(data[c]) for c in cols]
+    V, P = matriks_cramers_v([k for k, _ in kode], [len(kat) for _, kat in kode])
+    return pd.DataFrame(V, index=cols, columns=cols), pd.DataFrame(P, index=cols, columns=cols)
+
+KOLOM_ALUR = ["Sumber Informasi Jurusan", "Alasan Memilih Jurusan", "Keinginan Pindah Jurusan", "Tingkat Kepuasan"]
+MAKS_LINK_DEFAULT = 15
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def alur_keputusan(versi, prodi_terpilih, maks_link, margin=None):
+    # satu tabel frekuensi 4 arah dari kode gabungan; link Sankey diambil dari marginal tiap pasangan tahap
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    pita_kepuasan = pd.cut(data["Tingkat Kepuasan"], [0, 4, 7, 10], labels=["Kepuasan Rendah", "Kepuasan Sedang", "Kepuasan Tinggi"])
+    kode = [kode_kategori(data[c]) for c in KOLOM_ALUR[:-1]] + [kode_kategori(pita_kepuasan)]
+    tabel = hitung_kombinasi([k for k, _ in kode], [len(kat) for _, kat in kode], bobot_terfilter(versi, margin, data))
+
+    tabel, kategori = gabung_kategori_kecil(tabel, [kat for _, kat in kode], maks_link)
+    label, source, target, value = link_sankey(tabel, kategori)
+    terbesar = np.unravel_index(np.argmax(tabel), tabel.shape)
+    return {
+        "label": label,
+        "source": source,
+        "target": target,
+        "value": value,
+        "jalur_terbesar": [kategori[ax][i] for ax, i in enumerate(terbesar)],
+        "jumlah_jalur_terbesar": int(round(tabel[terbesar])),
+    }
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def ringkasan_insight(versi, prodi_terpilih, margin=None):
+    # Semua angka yang dipakai teks insight dihitung sekali per versi data + filter,
+    # sehingga kotak insight cukup mengisi template dari objek kecil ini.
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    w = bobot_terfilter(versi, margin, data)
+    r = {"total_responden": len(data)}
+
+    def mean_kolom(col, fungsi="mean"):
+        if col not in data.columns:
+            return np.nan
+        return round(rata_berbobot(data[col], w) if fungsi == "mean" else getattr(data[col], fungsi)(), 2)
+
+    r["total_prodi"] = data["Program Studi"].nunique() if "Program Studi" in data.columns else 0
+    r["daftar_fakultas"] = sorted(data["Fakultas"].dropna().unique()) if "Fakultas" in data.columns else []
+    r["rata_kepuasan"] = mean_kolom("Tingkat Kepuasan")
+    r["rata_kesulitan"] = mean_kolom("Tingkat Kesulitan Mata Kuliah")
+    r["max_motivasi"] = mean_kolom("Tinggi Motivasi", "max")
+    r["label_kepuasan"] = "puas" if r["rata_kepuasan"] >= 8 else "cukup puas" if r["rata_kepuasan"] >= 6 else "kurang puas"
+    r["label_kesulitan"] = "tinggi" if r["rata_kesulitan"] >= 7 else "sedang" if r["rata_kesulitan"] >= 4 else "rendah"
+
+    # kategori terbanyak + persentasenya untuk setiap kolom kategorik
+    r["modus"] = {}
+    for c in data.select_dtypes(include=["object", "category"]).columns:
+        vc = frekuensi(data[c], w, normalize=True)
+        r["modus"][c] = (vc.index[0], round(vc.max() * 100, 2)) if not vc.empty else ("-", 0.0)
+
+    if "Program Studi" in data.columns and "Tingkat Kepuasan" in data.columns and len(data):
+        avg = rata_grup(data, "Program Studi", "Tingkat Kepuasan", w).sort_values(ascending=False)
+        r["prodi_tertinggi"] = (avg.index[0], avg.iloc[0])
+        r["prodi_terendah"] = (avg.index[-1], avg.iloc[-1])
+
+    if "Keinginan Pindah Jurusan" in data.columns:
+        pct = frekuensi(data["Keinginan Pindah Jurusan"], w, normalize=True).mul(100).round(1)
+        r["persen_pindah_ya"] = pct.get("Ya", 0)
+
+    r["persepsi_dominan"] = {
+        c: frekuensi(data[c], w).idxmax() for c in COLS_PERSEPSI if c in data.columns and data[c].notna().any()
+    }
+    return r
+
+NUM_COLS_KORELASI = ["Tingkat Kepuasan", "Tingkat Kesulitan Mata Kuliah", "Tinggi Motivasi", "Jumlah Mata Kuliah Sesuai Minat", "Jumlah Stress dalam Seminggu"]
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def gambar_pairplot(versi, prodi_terpilih, num_cols):
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    sns.set(style="whitegrid", font=font_matplotlib())
+
+    # Pairplot 
+    pairplot_fig = sns.pairplot(
+        data[list(num_cols)].dropna(),
+        diag_kind="kde",
+        corner=True,
+        kind="reg",
+        plot_kws=dict( 
+            line_kws=dict(color="#4D29A0", lw=1.5),
+            scatter_kws=dict(s=40, alpha=0.7, color="#4D29A0")
+        ),
+        diag_kws=dict(color="#4D29A0", fill=True)
+    )
+
+    # Mengganti warna background statis dengan variabel CSS Streamlit
+    pairplot_fig.fig.patch.set_facecolor(st.get_option("theme.backgroundColor") or "#f3e8ff")
+    for ax in pairplot_fig.axes.flatten():
+        if ax is not None:
+            ax.set_facecolor(st.get_option("theme.secondaryBackgroundColor") or "#F3E5F5") 
+            # Menyesuaikan warna label sumbu agar terlihat di dark mode
+            ax.xaxis.label.set_color(st.get_option("theme.textColor") or "black") 
+            ax.yaxis.label.set_color(st.get_option("theme.textColor") or "black")
+            ax.tick_params(axis='x', colors=st.get_option("theme.textColor") or "black")
+            ax.tick_params(axis='y', colors=st.get_option("theme.textColor") or "black")
+
+    # Jarak 
+    pairplot_fig.fig.subplots_adjust(wspace=0.3, hspace=0.3)
+
+    buf = io.BytesIO()
+    pairplot_fig.savefig(buf, format="png", dpi=110, bbox_inches="tight", facecolor=pairplot_fig.fig.get_facecolor())
+    plt.close(pairplot_fig.fig)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def model_klaster(versi, prodi_terpilih, num_cols, n_clusters=3):
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    return fit_klaster(data[list(num_cols)].dropna(), n_clusters)
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def klaster_kmeans(versi, prodi_terpilih, num_cols, n_clusters=3):
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    X_plot = data[list(num_cols)].dropna().copy()
+    scaler, kmeans = model_klaster(versi, prodi_terpilih, num_cols, n_clusters)
+    X_plot["Cluster"] = kmeans.labels_.astype(str)
+    return X_plot
+
+# semua item numerik kuesioner untuk reduksi dimensi
+KOLOM_REDUKSI = NUM_COLS_KORELASI + ["Jumlah Mata Kuliah untuk Karier", "Relevansi Kurikulum (Skor)"]
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def model_reduksi(versi, prodi_terpilih, kolom, metode="PCA", n_faktor=2):
+    # hanya W dan b yang disimpan per versi data; respons baru diproyeksikan dengan proyeksi(model, X)
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    X = data[list(kolom)].dropna().to_numpy(dtype=float)
+    return fit_pca(X) if metode == "PCA" else fit_analisis_faktor(X, n_faktor)
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def skor_reduksi(versi, prodi_terpilih, kolom, metode="PCA", n_faktor=2, kolom_klaster=()):
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    X = data[list(kolom)].dropna()
+    model = model_reduksi(versi, prodi_terpilih, kolom, metode, n_faktor)
+    label = "PC" if metode == "PCA" else "Faktor "
+    skor = proyeksi(model, X.to_numpy())[:, :3]
+    skor = pd.DataFrame(skor, index=X.index, columns=[f"{label}{i + 1}" for i in range(skor.shape[1])])
+    if "Program Studi" in data.columns:
+        skor["Program Studi"] = data.loc[X.index, "Program Studi"]
+    if kolom_klaster:
+        # responden yang tidak ikut klaster (ada jawaban kosong di kolom klaster) diberi tanda "-"
+        skor["Cluster"] = klaster_kmeans(versi, prodi_terpilih, kolom_klaster)["Cluster"].reindex(X.index).fillna("-")
+    return skor
+
+TOP_N_MODEL = 20  # model terbaik per kriteria yang disimpan saat pencarian otomatis
+INTERVAL_TABEL_MODEL = 0.5  # detik antar pembaruan tabel pencarian model
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def fit_ols(versi, prodi_terpilih, dep_var, indep_vars, margin=None):
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    model_df = data[[dep_var] + list(indep_vars)].dropna()
+    X = sm.add_constant(model_df[list(indep_vars)])
+    w = bobot_terfilter(versi, margin, model_df)
+    model = sm.OLS(model_df[dep_var], X).fit() if w is None else sm.WLS(model_df[dep_var], X, weights=w).fit()
+    return model, model_df
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def regresi_per_prodi(versi, prodi_terpilih, dep_var, indep_vars, margin=None):
+    # model yang sama untuk setiap Program Studi, diselesaikan sekaligus dari Z'Z per prodi
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    model_df = data[["Program Studi", dep_var] + list(indep_vars)].dropna()
+    kode, prodi = kode_kategori(model_df["Program Studi"].to_numpy())
+    w = bobot_terfilter(versi, margin, model_df)
+    statistik = crossproduct_per_grup(
+        model_df[list(indep_vars)].to_numpy(), model_df[dep_var].to_numpy(), kode, len(prodi),
+        bobot=None if w is None else w.to_numpy(),
+    )
+    hasil = fit_per_grup(*statistik)
+
+    variabel = ["const"] + list(indep_vars)
+    return pd.DataFrame({
+        "Program Studi": np.repeat(prodi, len(variabel)),
+        "Variabel": np.tile(variabel, len(prodi)),
+        "Koefisien": hasil["beta"].ravel(),
+        "Batas Bawah": hasil["bawah"].ravel(),
+        "Batas Atas": hasil["atas"].ravel(),
+        "p-value": hasil["p_value"].ravel(),
+        "n": np.repeat(hasil["n"], len(variabel)),
+    })
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def kepuasan_tersusut(versi, prodi_terpilih, kolom_nilai="Tingkat Kepuasan"):
+    # rata-rata prodi ditarik ke rata-rata fakultasnya sesuai jumlah responden; satu lintasan data
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih)).dropna(subset=["Fakultas", "Program Studi"])
+    kode_p, prodi = kode_kategori(data["Program Studi"])
+    kode_f, fakultas = kode_kategori(data["Fakultas"])
+    induk = np.zeros(len(prodi), dtype=np.int64)
+    induk[kode_p] = kode_f  # prodi tersarang di satu fakultas
+
+    n, jumlah, jumlah_kuadrat = statistik_cukup(kode_p, data[kolom_nilai].to_numpy(dtype=float), len(prodi))
+    hasil = shrinkage_bertingkat(n, jumlah, jumlah_kuadrat, induk, len(fakultas))
+    tabel = pd.DataFrame({
+        "Program Studi": prodi,
+        "Fakultas": fakultas[induk],
+        "n": n.astype(int),
+        "Rata-rata Mentah": hasil["rata_mentah"],
+        kolom_nilai: hasil["rata_tersusut"],
+        "SD Posterior": hasil["sd_posterior"],
+        "Bobot Data": hasil["bobot_data"],
+        "Rata-rata Fakultas": hasil["rata_induk_tersusut"][induk],
+    }).sort_values(kolom_nilai, ascending=False)
+    parameter = {k: hasil[k] for k in ("rata_umum", "sigma2", "tau2_grup", "tau2_induk")}
+    return tabel.reset_index(drop=True), parameter
+
+KOLOM_BANDING = ["Fakultas", "Program Studi", "Angkatan", "Keinginan Pindah Jurusan", "Sumber Informasi Jurusan"]
+# identitas, kohort, dan waktu submisi bukan variabel yang dibandingkan
+KOLOM_BUKAN_VARIABEL = {"ID_Responden", "NPM", "Nama Lengkap", "Angkatan", "Timestamp"}
+# prodi bersarang di fakultas: menguji salah satunya saat mengelompokkan dengan yang lain hanya tautologi
+KOLOM_HIERARKI = {"Fakultas": {"Program Studi"}, "Program Studi": {"Fakultas"}}
+
+def besar_efek(nilai, batas):
+    # batas konvensional Cohen: (kecil, sedang, besar)
+    nilai = abs(nilai)
+    if np.isnan(nilai):
+        return "-"
+    return "besar" if nilai >= batas[2] else "sedang" if nilai >= batas[1] else "kecil" if nilai >= batas[0] else "sangat kecil"
+
+@st.cache_data(show_spinner=False)
+@cache_bersama
+def bandingkan_kelompok(versi, prodi_terpilih, kolom, nilai_a, nilai_b):
+    # semua kolom numerik dan kategorik diuji sekaligus dari tabel frekuensi kelompok A vs B
+    data = filter_prodi(load_data(DATA_PATH, versi), list(prodi_terpilih))
+    kode_grup = np.select([data[kolom].isin(nilai_a), data[kolom].isin(nilai_b)], [0, 1], -1)
+    lewati = {kolom} | KOLOM_BUKAN_VARIABEL | KOLOM_HIERARKI.get(kolom, set())
+    num_cols = [c for c in data.select_dtypes(include=["int64", "float64"]).columns if c not in lewati]
+    cat_cols = [c for c in data.select_dtypes(include=["object", "category"]).columns if c not in lewati]
+
+    tabel = []
+    if num_cols:
+        r = uji_numerik_dua_kelompok(*frekuensi_dua_kelompok(data[num_cols].to_numpy(dtype=float), kode_grup))
+        tabel.append(pd.DataFrame({
+            "Variabel": num_cols,
+            "Uji": "Welch t",
+            "Kelompok A": [f"rata-rata {x:.2f}" for x in r["rata_a"]],
+            "Kelompok B": [f"rata-rata {x:.2f}" for x in r["rata_b"]],
+            "Ukuran Efek": "Hedges' g",
+            "Efek": r["hedges_g"],
+            "Besar Efek": [besar_efek(g, (0.2, 0.5, 0.8)) for g in r["hedges_g"]],
+            "p-value": r["p_welch"],
+            "p Mann-Whitney": r["p_mwu"],
+            "Rank-biserial": r["rank_biserial"],
+        }))
+    if cat_cols:
+        kode = [kode_kategori(data[c]) for c in cat_cols]
+        X = np.column_stack([np.where(k >= 0, k, np.nan) for k, _ in kode])
+        nilai, hitung = frekuensi_dua_kelompok(X, kode_grup)
+        r = uji_kategorik_dua_kelompok(hitung)
+        # kategori dengan selisih proporsi terbesar mewakili arah perbedaannya
+        with np.errstate(divide="ignore", invalid="ignore"):
+            proporsi = hitung / hitung.sum(axis=2, keepdims=True)
+        terbesar = np.nan_to_num(np.abs(proporsi[0] - proporsi[1]), nan=-1).argmax(axis=1)
+        label = [kat[int(nilai[i, j])] if not np.isnan(nilai[i, j]) else "-" for i, ((_, kat), j) in enumerate(zip(kode, terbesar))]
+        tabel.append(pd.DataFrame({
+            "Variabel": cat_cols,
+            "Uji": "Chi-square",
+            "Kelompok A": [f"{lbl}: {proporsi[0, i, j] * 100:.1f}%" for i, (lbl, j) in enumerate(zip(label, terbesar))],
+            "Kelompok B": [f"{lbl}: {proporsi[1, i, j] * 100:.1f}%" for i, (lbl, j) in enumerate(zip(label, terbesar))],
+            "Ukuran Efek": "Cramér's V",
+            "Efek": r["cramers_v"],
+            "Besar Efek": [besar_efek(v, (0.1, 0.3, 0.5)) for v in r["cramers_v"]],
+            "p-value": r["p_value"],
+        }))
+
+    hasil = pd.concat(tabel, ignore_index=True) if tabel else pd.DataFrame(columns=["Variabel", "p-value", "Efek"])
+    hasil.insert(hasil.columns.get_loc("p-value") + 1, "q-value (BH)", koreksi_bh(hasil["p-value"].to_numpy()))
+    hasil["_urut"] = hasil["Efek"].abs()
+    hasil = hasil.sort_values(["q-value (BH)", "_urut"], ascending=[True, False], na_position="last").drop(columns="_urut")
+    return hasil.reset_index(drop=True), int((kode_grup == 0).sum()), int((kode_grup == 1).sum())
+
+@st.cache_resource(show_spinner=False)
+def status_versi():
+    # versi 'aktif' = versi yang dilayani ke pengguna; versi baru baru dipublikasikan setelah cache-nya hangat
+    # 'gagal' = versi yang pemanasannya error; tidak dicoba lagi sampai isi file (jadi versinya) berubah
+    return {"aktif": None, "pemanasan": None, "gagal": None, "error": None, "lock": threading.Lock()}
+
+def panaskan_cache(versi_baru, ctx=None):
+    # hitung tampilan default setiap halaman (filter = semua Program Studi, tanpa bobot) untuk versi data baru;
+    # argumen ditulis persis seperti pemanggilan di halaman karena kunci cache_bersama memakai args apa adanya
+    df_baru = load_data(DATA_PATH, versi_baru)
+    prodi_default = tuple(sorted(df_baru["Program Studi"].unique()))
+    num_cols = tuple(c for c in NUM_COLS_KORELASI if c in df_baru.columns)
+    num_cols_all = df_baru.select_dtypes(include=["int64", "float64"]).columns.tolist()
+
+    tugas = [(kualitas_respons, DATA_PATH, versi_baru), (ringkasan_insight, versi_baru, prodi_default, None)]
+    # Overview
+    tugas.append((posisi_preview, versi_baru, prodi_default, None, True, ""))
+    # Visualisasi & Hasil Analisis
+    tugas.append((agregat_rata_grup, versi_baru, prodi_default, "Program Studi", "Tingkat Kepuasan", None))
+    if "Fakultas" in df_baru.columns:
+        tugas.append((kepuasan_tersusut, versi_baru, prodi_default))
+    kolom_hitung = ["Keinginan Pindah Jurusan"] + COLS_PERSEPSI
+    tugas += [(agregat_hitung, versi_baru, prodi_default, c, None) for c in kolom_hitung if c in df_baru.columns]
+    tugas.append((crosstab_persepsi, versi_baru, prodi_default, None))
+    if all(c in df_baru.columns for c in KOLOM_ALUR):
+        tugas.append((alur_keputusan, versi_baru, prodi_default, MAKS_LINK_DEFAULT, None))
+    # Hubungan Antar Variabel
+    tugas.append((asosiasi_kategorik, versi_baru, prodi_default))
+    if len(num_cols) >= 2:
+        tugas.append((gambar_pairplot, versi_baru, prodi_default, num_cols))
+    if len(num_cols) >= 3:
+        tugas.append((klaster_kmeans, versi_baru, prodi_default, num_cols))
+    kolom_reduksi = tuple(c for c in KOLOM_REDUKSI if c in df_baru.columns)
+    if len(kolom_reduksi) >= 3 and len(df_baru[list(kolom_reduksi)].dropna()) > len(kolom_reduksi):
+        tugas.append((skor_reduksi, versi_baru, prodi_default, kolom_reduksi, "PCA", 2, num_cols if len(num_cols) >= 3 else ()))
+    # Regresi Berganda
+    if len(num_cols_all) >= 3:
+        tugas.append((fit_ols, versi_baru, prodi_default, num_cols_all[0], tuple(num_cols_all[1:3]), None))
+        tugas.append((regresi_per_prodi, versi_baru, prodi_default, num_cols_all[0], tuple(num_cols_all[1:3]), None))
+    # Perbandingan Kelompok
+    kolom_banding = [c for c in KOLOM_BANDING if c in df_baru.columns]
+    if kolom_banding:
+        opsi = sorted(df_baru[kolom_banding[0]].dropna().unique().tolist())
+        if len(opsi) >= 2:
+            tugas.append((bandingkan_kelompok, versi_baru, prodi_default, kolom_banding[0], tuple(opsi[:1]), tuple(opsi[1:2])))
+
+    # worker ikut membawa konteks sesi yang memicu pemanasan, supaya fungsi st.cache_* tidak memperingatkan
+    # "missing ScriptRunContext" di setiap panggilan
+    with ThreadPoolExecutor(max_workers=4, initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)) as pool:
+        for f in [pool.submit(*t) for t in tugas]:
+            f.result()
+
+def _jalankan_pemanasan(versi_baru, ctx):
+    status = status_versi()
+    try:
+        panaskan_cache(versi_baru, ctx)
+        with status["lock"]:
+            if status["pemanasan"] == versi_baru:
+                status["aktif"] = versi_baru
+                status["gagal"] = None
+                status["error"] = None
+    except Exception as e:
+        with status["lock"]:
+            status["gagal"] = versi_baru
+            status["error"] = str(e)
+    finally:
+        with status["lock"]:
+            if status["pemanasan"] == versi_baru:
+                status["pemanasan"] = None
+
+def _mulai_pemanasan(versi_file):
+    thread = threading.Thread(target=_jalankan_pemanasan, args=(versi_file, get_script_run_ctx()), daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+
+def versi_aktif(versi_file):
+    status = status_versi()
+    with status["lock"]:
+        if status["aktif"] is None:
+            # proses baru: belum ada versi lama yang bisa dilayani, tapi halaman lain tetap dipanaskan di background
+            status["aktif"] = versi_file
+            status["pemanasan"] = versi_file
+            _mulai_pemanasan(versi_file)
+        elif versi_file not in (status["aktif"], status["pemanasan"], status["gagal"]):
+            status["pemanasan"] = versi_file
+            _mulai_pemanasan(versi_file)
+        return status["aktif"]
+
 try:
-    df = load_data()
+    versi = versi_aktif(versi_data(DATA_PATH, os.path.getmtime(DATA_PATH)))
+    df = load_data(DATA_PATH, versi)
 except Exception as e:
     st.error("Error: Tidak dapat menemukan file 'AnalisisKepuasan_terakhir.csv' di folder. Pastikan file berada di direktori yang sama dengan script ini.")
     st.stop()
 
-data = df.copy()
-
 # ---------------------------
 # SIDEBAR 
 # ---------------------------
 st.sidebar.header("📚 Menu Utama")
+status_pemanasan = status_versi()
+if status_pemanasan["error"]:
+    pesan = f"⚠️ Gagal memanaskan cache untuk versi data {status_pemanasan['gagal']}: {status_pemanasan['error']}"
+    if status_pemanasan["gagal"] != versi:
+        pesan += f". Dashboard tetap menampilkan versi {versi} sampai file data berubah."
+    st.sidebar.warning(pesan)
 page = st.sidebar.radio(
     "Pilih Halaman",
-    ("📊 Overview Data", "📉 Statistika Deskriptif", "📈 Visualisasi & Hasil Analisis", "🔗 Hubungan Antar Variabel", "📈 Regresi Berganda", "🧩 Kesimpulan"),
+    ("📊 Overview Data", "📉 Statistika Deskriptif", "📈 Visualisasi & Hasil Analisis", "🔗 Hubungan Antar Variabel", "📈 Regresi Berganda", "⚖️ Perbandingan Kelompok", "🧩 Kesimpulan"),
+)
+
+# respons berkualitas rendah (jawaban seragam, saling bertentangan, di luar rentang) dibuang di semua halaman
+kualitas = kualitas_respons(DATA_PATH, versi)
+st.sidebar.markdown("---")
+hanya_berkualitas = st.sidebar.toggle(
+    "🧹 Buang Respons Berkualitas Rendah",
+    help="Jawaban nyaris seragam di semua item penilaian, jawaban yang saling bertentangan, atau jumlah di luar rentang wajar",
 )
+if hanya_berkualitas:
+    st.sidebar.caption(f"{int(kualitas['Kualitas Rendah'].sum())} dari {len(kualitas)} respons dibuang")
+    versi = versi + AKHIRAN_BERKUALITAS
+    df = load_data(DATA_PATH, versi)
+
+data = df.copy()
 
 # allow filtering by Program Studi (optional)
+selected = []
 if "Program Studi" in data.columns:
     st.sidebar.markdown("---")
     selected = st.sidebar.multiselect("Filter Program Studi (opsional)", options=sorted(data["Program Studi"].unique()), default=list(sorted(data["Program Studi"].unique())))
-    if selected:
-        data = data[data["Program Studi"].isin(selected)]
+    data = filter_prodi(data, selected)
+
+st.sidebar.markdown("---")
+mode_live = st.sidebar.toggle("📡 Mode Live", help=f"Pantau respons baru dari '{LIVE_SOURCE}' setiap {LIVE_INTERVAL} detik")
+
+# bobot post-stratifikasi: rata-rata, distribusi dan regresi disesuaikan ke komposisi populasi
+margin_tersedia = margin_populasi()
+berbobot = st.sidebar.toggle(
+    "⚖️ Bobot Post-Stratifikasi",
+    disabled=margin_tersedia is None,
+    help=f"Raking ke jumlah populasi di '{MARGIN_PATH}'" if margin_tersedia else f"Buat '{MARGIN_PATH}' (lihat margin_populasi.contoh.json) untuk mengaktifkan",
+)
+margin_aktif = margin_tersedia if berbobot else None
+if margin_aktif is not None:
+    w_semua, iterasi_raking, konvergen_raking, selisih_raking = bobot_responden(versi, margin_aktif)
+    w_aktif = w_semua.loc[data.index]
+    n_efektif = w_aktif.sum() ** 2 / (w_aktif ** 2).sum() if len(w_aktif) else 0
+    st.sidebar.caption(
+        f"n efektif ≈ {n_efektif:.0f} dari {len(w_aktif)} · bobot {w_aktif.min():.2f}–{w_aktif.max():.2f} · "
+        + (f"konvergen dalam {iterasi_raking} iterasi" if konvergen_raking else "⚠️ belum konvergen")
+        + f" · selisih margin maks {selisih_raking * 100:.1f} poin %"
+    )
+st.sidebar.caption(
+    f"🗄️ Cache bersama: {cache_bersama.statistik['hit']} hit · {cache_bersama.statistik['miss']} miss"
+    f" · {cache_bersama.statistik['evict']} dibuang"
+)
 
 PURPLE_SCALE = px.colors.sequential.PuRd # built-in, purples
 PRIMARY_HEX = PURPLE_MAIN
@@ -199,6 +960,23 @@ PRIMARY_HEX = PURPLE_MAIN
 # ---------------------------
 # Helper
 # ---------------------------
+def tombol_unduh(judul, nama_file, kunci, buat_df):
+    # file baru ditulis (per potongan) saat "Siapkan" diklik, sekali per versi data + kunci;
+    # browser lalu mengunduhnya dari static file handler yang membaca file dari disk secara bertahap
+    with st.popover(f"⬇️ Unduh {judul}"):
+        format_ = st.radio("Format", list(FORMAT), horizontal=True, key=f"format_unduh_{nama_file}")
+        path = os.path.join(DIR_UNDUHAN, nama_file_ekspor(versi, kunci, format_))
+        if not os.path.exists(path) and st.button("Siapkan file", key=f"siapkan_unduh_{nama_file}"):
+            with st.spinner("Menulis file..."):
+                status = status_versi()
+                path = siapkan_ekspor(versi, kunci, format_, buat_df, versi_dipakai=(status["aktif"], status["pemanasan"]))
+        if os.path.exists(path):
+            url = "app/" + path.replace(os.sep, "/")
+            st.markdown(f"<a href='{url}' download='{nama_file}{FORMAT[format_][0]}'>📥 {nama_file}{FORMAT[format_][0]}</a>", unsafe_allow_html=True)
+            st.caption(f"{os.path.getsize(path) / 1024:.1f} KB")
+        if "XLSX" not in FORMAT:
+            st.caption("Format XLSX membutuhkan paket openpyxl.")
+
 def animated_bar_reveal(df_bar, x_col, y_col, title, color_scale=None, interval=300):
     df_bar = df_bar.reset_index(drop=True)
     frames = []
@@ -248,6 +1026,8 @@ def animated_bar_reveal(df_bar, x_col, y_col, title, color_scale=None, interval=
     fig.update_layout(transition={"duration":350, "easing":"cubic-in-out"})
     return fig
 
+ins = ringkasan_insight(versi, tuple(selected), margin_aktif)
+
 # ---------------------------
 # Page: Overview Data
 # ---------------------------
@@ -257,7 +1037,7 @@ if page == "📊 Overview Data":
 
     with colA:
         # Menghapus 'color: #3a0069;' statis dan mengganti background/card color yang statis
-        st.markdown("""
+        st.markdown(f"""
         <div class="card metric" style="
             background-color: var(--secondary-background-color);
             padding: 10px 15px;
@@ -271,9 +1051,8 @@ if page == "📊 Overview Data":
             <h4>🧩 Deskripsi Awal</h4>
             <p>Survei ini mengumpulkan data mengenai <b>tingkat kepuasan mahasiswa Gen Z terhadap jurusan yang dipilih</b>, 
             serta faktor-faktor yang mempengaruhi persepsi mereka terhadap pengalaman akademik dan lingkungan kampus.</p>
-            <p>Berdasarkan hasil pengumpulan data, terdapat sebanyak <b>103 responden</b> yang berpartisipasi dalam survei ini. 
-            Responden tersebut berasal dari berbagai fakultas, antara lain Fakultas Ilmu Komputer, Fakultas Teknik dan Sains, Fakultas Ekonomi dan Bisnis, 
-                        Fakultas Hukum, Fakultas Ilmu Sosial dan Politik, Fakultas Pertanian, Fakultas Arsitektur dan Desain, Fakultas Kedokteran</p>
+            <p>Berdasarkan hasil pengumpulan data, terdapat sebanyak <b>{ins['total_responden']} responden</b> yang berpartisipasi dalam survei ini. 
+            Responden tersebut berasal dari berbagai fakultas, antara lain {', '.join(ins['daftar_fakultas'])}</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -300,19 +1079,66 @@ if page == "📊 Overview Data":
         </div>
         """, unsafe_allow_html=True)
 
+    rendah = kualitas[kualitas["Kualitas Rendah"]]
+    with st.expander(f"🧪 Kualitas Respons — {len(rendah)} dari {len(kualitas)} respons ditandai berkualitas rendah"):
+        kolom_id = [c for c in ("ID_Responden", "Program Studi") if c in df.columns]
+        st.dataframe(
+            load_data(DATA_PATH, versi.removesuffix(AKHIRAN_BERKUALITAS)).loc[rendah.index, kolom_id]
+                .join(rendah.drop(columns="Kualitas Rendah"))
+                .style.format({"Varians Dalam Baris": "{:.4f}"}),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(
+            "Varians dan deret identik dihitung dari item penilaian (relevansi, minat, prospek, kepuasan, kesulitan, motivasi) "
+            "yang diskalakan ke 0–1. Aktifkan '🧹 Buang Respons Berkualitas Rendah' di sidebar untuk mengeluarkannya dari semua analisis."
+        )
+
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # === Preview data ===
-    st.markdown("<h4 class='section-title'>🧾 Preview Data</h4>", unsafe_allow_html=True)
-    # Tambahkan style untuk menyesuaikan warna teks di st.dataframe (jika diperlukan)
-    st.dataframe(df)
+    # fragment: kontrol preview (kolom, cari, urut, halaman) tidak menjalankan ulang seluruh halaman
+    @st.fragment
+    @terukur
+    def panel_preview():
+        # === Preview data ===
+        st.markdown("<h4 class='section-title'>🧾 Preview Data</h4>", unsafe_allow_html=True)
+        # Hanya potongan halaman yang terlihat yang dikirim ke browser; data identitas tidak ditampilkan
+        kolom_preview = [c for c in data.columns if c not in KOLOM_PRIBADI]
+        colP1, colP2 = st.columns([3, 2])
+        with colP1:
+            kolom_tampil = st.multiselect("Kolom yang ditampilkan", kolom_preview, default=kolom_preview)
+        with colP2:
+            cari = st.text_input("Cari (teks)", placeholder="contoh: Sains Data")
+        colP3, colP4, colP5 = st.columns([3, 1, 1])
+        with colP3:
+            sort_by = st.selectbox("Urutkan berdasarkan", ["(urutan asli)"] + kolom_preview)
+        with colP4:
+            naik = st.radio("Arah", ["Naik", "Turun"], horizontal=True) == "Naik"
+        with colP5:
+            ukuran_halaman = st.selectbox("Baris per halaman", [10, 25, 50, 100], index=1)
+
+        posisi = posisi_preview(versi, tuple(selected), None if sort_by == "(urutan asli)" else sort_by, naik, cari.strip())
+        n_halaman = max(1, -(-len(posisi) // ukuran_halaman))
+        halaman = st.number_input(f"Halaman (1–{n_halaman})", min_value=1, max_value=n_halaman, value=1, step=1)
+
+        awal = (halaman - 1) * ukuran_halaman
+        potongan = posisi[awal:awal + ukuran_halaman]
+        st.dataframe(data.iloc[potongan][kolom_tampil or kolom_preview], use_container_width=True, hide_index=True)
+        st.caption(f"Menampilkan baris {min(awal + 1, len(posisi))}–{awal + len(potongan)} dari {len(posisi)} responden (sesuai filter)")
+        tombol_unduh(
+            "data terfilter", "data_terfilter", ("data", tuple(selected)),
+            lambda: data.drop(columns=[c for c in KOLOM_PRIBADI if c in data.columns]),
+        )
+
+    panel_preview()
+
     st.markdown("---")
 
     # === Key Metrics ===
-    total_responden = len(data)
-    total_prodi = data["Program Studi"].nunique() if "Program Studi" in data.columns else 0
-    rata_kepuasan = round(data["Tingkat Kepuasan"].mean(), 2) if "Tingkat Kepuasan" in data.columns else np.nan
-    rata_kesulitan = round(data["Tingkat Kesulitan Mata Kuliah"].mean(), 2) if "Tingkat Kesulitan Mata Kuliah" in data.columns else np.nan
+    total_responden = ins["total_responden"]
+    total_prodi = ins["total_prodi"]
+    rata_kepuasan = ins["rata_kepuasan"]
+    rata_kesulitan = ins["rata_kesulitan"]
 
     st.markdown("<h4 class='section-title'>📌 Ringkasan Umum</h4>", unsafe_allow_html=True)
 
@@ -323,7 +1149,7 @@ if page == "📊 Overview Data":
     col4.markdown(f"<div class='card metric'><h3>Rata-rata Kesulitan</h3><h2>{rata_kesulitan}</h2></div>", unsafe_allow_html=True)
 
     # Menghapus 'color: #3a0069;' statis dan mengganti background color statis
-    st.markdown("""
+    st.markdown(f"""
              <div class = 'insight' style='
                  background-color: var(--secondary-background-color);
                  border-left: 5px solid #6A0DAD;
@@ -335,10 +1161,36 @@ if page == "📊 Overview Data":
                  font-family: "Poppins", sans-serif;
                  font-size: 17px
              '>
-        💡 Terdapat <b>103 responden</b> yang berasal dari <b>19 program studi</b>. Nilai <b>rata-rata kepuasan sebesar 7.83</b> menunjukkan bahwa sebagian besar mahasiswa merasa <b>cukup puas</b> terhadap pengalaman akademiknya. Sementara itu, <b>rata-rata tingkat kesulitan sebesar 5.4</b> mengindikasikan bahwa mahasiswa menghadapi <b>tantangan pada tingkat sedang</b> dalam proses pembelajaran.</div>""",
+        💡 Terdapat <b>{total_responden} responden</b> yang berasal dari <b>{total_prodi} program studi</b>. Nilai <b>rata-rata kepuasan sebesar {rata_kepuasan}</b> menunjukkan bahwa sebagian besar mahasiswa merasa <b>{ins['label_kepuasan']}</b> terhadap pengalaman akademiknya. Sementara itu, <b>rata-rata tingkat kesulitan sebesar {rata_kesulitan}</b> mengindikasikan bahwa mahasiswa menghadapi <b>tantangan pada tingkat {ins['label_kesulitan']}</b> dalam proses pembelajaran.</div>""",
         unsafe_allow_html=True,
     )
 
+    # === Data Live ===
+    if mode_live:
+        @st.fragment(run_every=LIVE_INTERVAL)
+        @terukur
+        def panel_live():
+            live = ingestor_live(LIVE_SOURCE, versi)
+            live.poll()
+            agregat = live.agregat
+            rata = agregat.rata_rata()
+
+            st.markdown("<h4 class='section-title'>📡 Data Live</h4>", unsafe_allow_html=True)
+            st.caption(f"Seluruh responden (tanpa filter) · {live.total_baru} respons baru masuk, {live.total_karantina} dikarantina, {live.total_duplikat} submisi ulang digabung · diperbarui {pd.Timestamp.fromtimestamp(live.poll_terakhir):%H:%M:%S}")
+            colL1, colL2, colL3 = st.columns(3)
+            colL1.markdown(f"<div class='card metric'><h3>Jumlah Responden</h3><h2>{agregat.n}</h2></div>", unsafe_allow_html=True)
+            colL2.markdown(f"<div class='card metric'><h3>Rata-rata Kepuasan</h3><h2>{rata['Tingkat Kepuasan']:.2f}</h2></div>", unsafe_allow_html=True)
+            colL3.markdown(f"<div class='card metric'><h3>Rata-rata Kesulitan</h3><h2>{rata['Tingkat Kesulitan Mata Kuliah']:.2f}</h2></div>", unsafe_allow_html=True)
+
+            avg_live = agregat.rata_rata_grup("Tingkat Kepuasan").sort_values(ascending=False).reset_index()
+            avg_live.columns = ["Program Studi", "Tingkat Kepuasan"]
+            fig_live = px.bar(avg_live, x="Program Studi", y="Tingkat Kepuasan", color="Tingkat Kepuasan",
+                              color_continuous_scale=["#D1C4E9", "#512DA8"])
+            fig_live.update_layout(xaxis=dict(tickangle=-45), margin=dict(t=20, b=50), coloraxis_showscale=False)
+            st.plotly_chart(fig_live, use_container_width=True)
+
+        panel_live()
+
     st.markdown("---")
 # ---------------------------
 # Page: Statistika Deskriptif
@@ -355,7 +1207,13 @@ elif page == "📉 Statistika Deskriptif":
     if num_cols:
         st.markdown("<div class='chart-title'>Statistik Variabel Numerik</div>", unsafe_allow_html=True)
         desc = data_filtered[num_cols].describe().T
+        w_desk = bobot_terfilter(versi, margin_aktif, data_filtered)
+        if w_desk is not None:
+            # mean dan std versi berbobot; min, kuartil dan max tetap dari sampel
+            desc["mean"] = [rata_berbobot(data_filtered[c], w_desk) for c in num_cols]
+            desc["std"] = [np.sqrt(rata_berbobot((data_filtered[c] - desc.at[c, "mean"]) ** 2, w_desk)) for c in num_cols]
         desc["range"] = desc["max"] - desc["min"]
+        tombol_unduh("statistik numerik", "statistik_numerik", ("describe", tuple(selected), margin_aktif), lambda: desc.rename_axis("Variabel").reset_index())
         st.markdown(
                 desc.style
                     .format(precision=2)
@@ -375,9 +1233,9 @@ elif page == "📉 Statistika Deskriptif":
             )
         
         # === Insight otomatis untuk variabel numerik ===
-        mean_kepuasan = round(data_filtered["Tingkat Kepuasan"].mean(), 2) if "Tingkat Kepuasan" in data_filtered.columns else None
-        max_motivasi = round(data_filtered["Tinggi Motivasi"].max(), 2) if "Tinggi Motivasi" in data_filtered.columns else None
-        avg_kesulitan = round(data_filtered["Tingkat Kesulitan Mata Kuliah"].mean(), 2) if "Tingkat Kesulitan Mata Kuliah" in data_filtered.columns else None
+        mean_kepuasan = ins["rata_kepuasan"]
+        max_motivasi = ins["max_motivasi"]
+        avg_kesulitan = ins["rata_kesulitan"]
         
         # Menghapus 'color: #3a0069;' statis dan mengganti background color statis
         st.markdown(
@@ -396,8 +1254,8 @@ elif page == "📉 Statistika Deskriptif":
             '>
         <div >
         💡 <b>Statistika Deskriptif Numerik:</b><br>
-        • Rata-rata tingkat kepuasan mahasiswa adalah <b>{mean_kepuasan}</b>, menunjukkan bahwa mayoritas mahasiswa merasa cukup puas terhadap jurusannya.<br>
-        • Rata-rata tingkat kesulitan mata kuliah sebesar <b>{avg_kesulitan}</b> menandakan tingkat tantangan akademik yang sedang.<br>
+        • Rata-rata tingkat kepuasan mahasiswa adalah <b>{mean_kepuasan}</b>, menunjukkan bahwa secara umum mahasiswa merasa <b>{ins['label_kepuasan']}</b> terhadap jurusannya.<br>
+        • Rata-rata tingkat kesulitan mata kuliah sebesar <b>{avg_kesulitan}</b> menandakan tingkat tantangan akademik yang <b>{ins['label_kesulitan']}</b>.<br>
         • Nilai motivasi tertinggi mencapai <b>{max_motivasi}</b>, menandakan ada responden dengan semangat belajar tinggi.
         </div>
         """, unsafe_allow_html=True)
@@ -410,12 +1268,14 @@ elif page == "📉 Statistika Deskriptif":
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     if cat_cols:
         st.markdown("<div class='chart-title'>Ringkasan Variabel Kategorik</div>", unsafe_allow_html=True)
+        freq = {c: frekuensi(data_filtered[c], bobot_terfilter(versi, margin_aktif, data_filtered)) for c in cat_cols}
         cat_summary = pd.DataFrame({
             "Jumlah Kategori Unik": [data_filtered[c].nunique() for c in cat_cols],
-            "Kategori Terbanyak": [data_filtered[c].mode()[0] if not data_filtered[c].mode().empty else "-" for c in cat_cols],
-            "Frekuensi Tertinggi": [data_filtered[c].value_counts().max() for c in cat_cols],
-            "Persentase Tertinggi (%)": [round(data_filtered[c].value_counts(normalize=True).max()*100, 2) for c in cat_cols]
+            "Kategori Terbanyak": [freq[c].index[0] if not freq[c].empty else "-" for c in cat_cols],
+            "Frekuensi Tertinggi": [freq[c].max() for c in cat_cols],
+            "Persentase Tertinggi (%)": [round(freq[c].max() / freq[c].sum() * 100, 2) for c in cat_cols]
         }, index=cat_cols)
+        tombol_unduh("ringkasan kategorik", "ringkasan_kategorik", ("cat_summary", tuple(selected), margin_aktif), lambda: cat_summary.rename_axis("Variabel").reset_index())
         st.markdown(
             cat_summary.style
                 .format(precision=2)
@@ -435,6 +1295,7 @@ elif page == "📉 Statistika Deskriptif":
         )
 
         # === Insight otomatis kategorik ===
+        modus = ins["modus"]
         # Menghapus 'color: #3a0069;' statis dan mengganti background color statis
         st.markdown(
             f"""
@@ -452,10 +1313,10 @@ elif page == "📉 Statistika Deskriptif":
             '>
         <div>
         💡 <b>Statistika Deskriptif Kategorik:</b><br>
-        • Mayoritas responden berasal dari <b>{cat_summary.loc['Fakultas','Kategori Terbanyak']}</b> dengan persentase <b>{cat_summary.loc['Fakultas','Persentase Tertinggi (%)']}%</b>.<br>
-        • Program studi yang paling dominan adalah <b>{cat_summary.loc['Program Studi','Kategori Terbanyak']}</b>.<br>
-        • Sebagian besar mahasiswa memilih jurusan karena <b>{cat_summary.loc['Alasan Memilih Jurusan','Kategori Terbanyak']}</b>.<br>
-        • Ada sebagian kecil mahasiswa yang menyatakan <b>{cat_summary.loc['Keinginan Pindah Jurusan','Kategori Terbanyak']}</b>, menunjukkan adanya potensi ketidakpuasan kecil.
+        • Mayoritas responden berasal dari <b>{modus.get('Fakultas', ('-', 0))[0]}</b> dengan persentase <b>{modus.get('Fakultas', ('-', 0))[1]}%</b>.<br>
+        • Program studi yang paling dominan adalah <b>{modus.get('Program Studi', ('-', 0))[0]}</b>.<br>
+        • Sebagian besar mahasiswa memilih jurusan karena <b>{modus.get('Alasan Memilih Jurusan', ('-', 0))[0]}</b>.<br>
+        • Ada sebagian kecil mahasiswa yang menyatakan <b>{modus.get('Keinginan Pindah Jurusan', ('-', 0))[0]}</b>, menunjukkan adanya potensi ketidakpuasan kecil.
         </div>
         """, unsafe_allow_html=True)
     else:
@@ -468,18 +1329,26 @@ elif page == "📉 Statistika Deskriptif":
 elif page == "📈 Visualisasi & Hasil Analisis":
     st.subheader("📈 Visualisasi & Hasil Analisis")
     # A. Rata-rata Kepuasan per Program Studi (animated reveal)
-    if "Program Studi" in data.columns and "Tingkat Kepuasan" in data.columns:
+    # fragment: mengganti jenis peringkat hanya menjalankan ulang bagian ini
+    @st.fragment
+    @terukur
+    def panel_peringkat():
         if "Program Studi" in data.columns and "Tingkat Kepuasan" in data.columns:
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.markdown("<div class='chart-title'>Rata-Rata Kepuasan Berdasarkan Jurusan</div>", unsafe_allow_html=True)
 
-            # Hitung rata-rata kepuasan per program studi
-            avg = (
-                data.groupby("Program Studi")["Tingkat Kepuasan"]
-                .mean()
-                .reset_index()
-                .sort_values("Tingkat Kepuasan", ascending=False)
-            )
+            tersusut = "Fakultas" in data.columns and st.radio(
+                "Peringkat",
+                ["Rata-rata mentah", "Rata-rata tersusut (Empirical Bayes)"],
+                horizontal=True,
+                help="Rata-rata prodi dengan sedikit responden ditarik ke rata-rata fakultasnya, dan rata-rata fakultas ke rata-rata keseluruhan",
+            ) != "Rata-rata mentah"
+
+            if tersusut:
+                avg, param_eb = kepuasan_tersusut(versi, tuple(selected))
+            else:
+                # Hitung rata-rata kepuasan per program studi
+                avg = agregat_rata_grup(versi, tuple(selected), "Program Studi", "Tingkat Kepuasan", margin_aktif)
 
             # Barchart warna ungu elegan
             fig = px.bar(
@@ -489,16 +1358,28 @@ elif page == "📈 Visualisasi & Hasil Analisis":
                 text="Tingkat Kepuasan",
                 color="Tingkat Kepuasan",
                 color_continuous_scale=["#D1C4E9", "#512DA8"],
+                error_y="SD Posterior" if tersusut else None,
+                custom_data=["n", "Rata-rata Mentah"] if tersusut else None,
                 title=None
             )
 
             fig.update_traces(
                 texttemplate="%{text:.1f}",
                 textposition="outside",
-                hovertemplate="<b>%{x}</b><br>Tingkat Kepuasan: %{y:.2f}",
+                hovertemplate=(
+                    "<b>%{x}</b><br>Tingkat Kepuasan (tersusut): %{y:.2f}<br>Rata-rata mentah: %{customdata[1]:.2f}<br>n = %{customdata[0]}"
+                    if tersusut else "<b>%{x}</b><br>Tingkat Kepuasan: %{y:.2f}"
+                ),
                 marker_line_color="white",
                 marker_line_width=1.5,
             )
+            if tersusut:
+                # rata-rata mentah sebagai titik, supaya besar tarikan tiap prodi terlihat
+                fig.add_scatter(
+                    x=avg["Program Studi"], y=avg["Rata-rata Mentah"], mode="markers", name="Rata-rata mentah",
+                    marker=dict(symbol="diamond", size=9, color=PURPLE_ACCENT, line=dict(color="white", width=1)),
+                    hovertemplate="<b>%{x}</b><br>Rata-rata mentah: %{y:.2f}<extra></extra>",
+                )
 
             # Menyesuaikan warna chart layout
             fig.update_layout(
@@ -511,13 +1392,25 @@ elif page == "📈 Visualisasi & Hasil Analisis":
                 yaxis=dict(title="Tingkat Kepuasan", showgrid=True, gridcolor="rgba(106,13,173,0.3)"), 
                 margin=dict(t=50, b=50, l=60, r=40),
                 coloraxis_showscale=True,
+                showlegend=False,
             )
 
             st.plotly_chart(fig, use_container_width=True)
 
             # Insight otomatis — dalam kotak ungu lembut dengan ikon lampu 💡
-            top = avg.iloc[0]
-            bottom = avg.iloc[-1]
+            if tersusut:
+                top, bottom = avg.iloc[0], avg.iloc[-1]
+                (top_prodi, top_nilai), (bottom_prodi, bottom_nilai) = (top["Program Studi"], top["Tingkat Kepuasan"]), (bottom["Program Studi"], bottom["Tingkat Kepuasan"])
+                tarikan = (avg["Rata-rata Mentah"] - avg["Tingkat Kepuasan"]).abs()
+                terbesar = avg.loc[tarikan.idxmax()]
+                catatan = (
+                    f"Peringkat ini sudah disesuaikan dengan jumlah responden (n {top_prodi} = {top['n']}, n {bottom_prodi} = {bottom['n']}). "
+                    f"Tarikan terbesar dialami <b>{terbesar['Program Studi']}</b> (n = {terbesar['n']}): "
+                    f"{terbesar['Rata-rata Mentah']:.1f} → {terbesar['Tingkat Kepuasan']:.1f}.<br>"
+                )
+            else:
+                (top_prodi, top_nilai), (bottom_prodi, bottom_nilai) = ins["prodi_tertinggi"], ins["prodi_terendah"]
+                catatan = ""
 
             # Menghapus 'color: #4A148C;' statis dan mengganti background color statis
             st.markdown(
@@ -531,18 +1424,26 @@ elif page == "📈 Visualisasi & Hasil Analisis":
                 font-family:"Poppins" sans-serif; 
                 color:var(--text-color); 
                 font-size:17px;'>
-                    💡 <b>Program Studi {top['Program Studi']}</b> memiliki tingkat kepuasan tertinggi sebesar 
-                    <b>{top['Tingkat Kepuasan']:.1f}</b>.<br>
-                    Sementara itu, <b>{bottom['Program Studi']}</b> berada di posisi terendah dengan rata-rata kepuasan 
-                    <b>{bottom['Tingkat Kepuasan']:.1f}</b>.<br>
-                    Perbedaan ini bisa mencerminkan variasi dalam kualitas pembelajaran dan pengalaman mahasiswa di tiap program studi.
+                    💡 <b>Program Studi {top_prodi}</b> memiliki tingkat kepuasan tertinggi sebesar 
+                    <b>{top_nilai:.1f}</b>.<br>
+                    Sementara itu, <b>{bottom_prodi}</b> berada di posisi terendah dengan rata-rata kepuasan 
+                    <b>{bottom_nilai:.1f}</b>.<br>
+                    {catatan}Perbedaan ini bisa mencerminkan variasi dalam kualitas pembelajaran dan pengalaman mahasiswa di tiap program studi.
                 </div>
                 """,
                 unsafe_allow_html=True,
             )
+            if tersusut:
+                st.caption(
+                    f"Varians dalam prodi σ² = {param_eb['sigma2']:.2f} · antar prodi dalam fakultas τ² = {param_eb['tau2_grup']:.2f}"
+                    f" · antar fakultas τ² = {param_eb['tau2_induk']:.2f} · rata-rata umum {param_eb['rata_umum']:.2f}"
+                    + (" · shrinkage dihitung tanpa bobot post-stratifikasi" if margin_aktif is not None else "")
+                )
 
             st.markdown("</div>", unsafe_allow_html=True)
 
+    panel_peringkat()
+
 
     # B. Distribusi Keinginan Pindah Jurusan (pie)
     if "Keinginan Pindah Jurusan" in data.columns:
@@ -551,8 +1452,9 @@ elif page == "📈 Visualisasi & Hasil Analisis":
         purple_palette = ["#d8b4fe", "#6749c2", "#441d88", "#261344"]
 
         pie = px.pie(
-            data,
+            agregat_hitung(versi, tuple(selected), "Keinginan Pindah Jurusan", margin_aktif),
             names="Keinginan Pindah Jurusan",
+            values="Jumlah",
             title="",
             hole=0.35,
             color_discrete_sequence=purple_palette
@@ -587,8 +1489,7 @@ elif page == "📈 Visualisasi & Hasil Analisis":
         st.plotly_chart(pie, use_container_width=True)
 
         #Insight
-        pct = data["Keinginan Pindah Jurusan"].value_counts(normalize=True).mul(100).round(1)
-        ya = pct.get("Ya", 0)
+        ya = ins["persen_pindah_ya"]
         # Menghapus 'color: #4A148C;' statis dan mengganti background color statis
         st.markdown(
                  f"""
@@ -624,8 +1525,7 @@ elif page == "📈 Visualisasi & Hasil Analisis":
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.markdown(f"<div class='chart-title'>{col}</div>", unsafe_allow_html=True)
 
-            vc = data[col].value_counts().reset_index()
-            vc.columns = [col, "Jumlah"]
+            vc = agregat_hitung(versi, tuple(selected), col, margin_aktif)
             vc = vc.sort_values(by="Jumlah", ascending=False).reset_index(drop=True)
 
             color_scale = ["#A78FE0", "#876ACA", "#7F5DCF", "#6941C7", "#4D29A0"]
@@ -656,7 +1556,7 @@ elif page == "📈 Visualisasi & Hasil Analisis":
             st.plotly_chart(fig, use_container_width=True)
 
             # Insight 
-            top_val = vc.iloc[0][col]
+            top_val = ins["persepsi_dominan"][col]
             # Menghapus 'color: #3a0069;' statis dan mengganti background color statis
             st.markdown(f"""
             <div class = 'insight' 
@@ -679,111 +1579,306 @@ elif page == "📈 Visualisasi & Hasil Analisis":
 
             st.markdown("</div>", unsafe_allow_html=True)
 
-    # D. Hubungan antara Program Studi dan Persepsi terhadap Jurusan (Pie Chart Dua Variabel)
-    if "Program Studi" in data.columns:
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.markdown("<div class='chart-title'>Hubungan Program Studi dan Persepsi terhadap Jurusan</div>", unsafe_allow_html=True)
-
-        # Pilih variabel persepsi lewat dropdown agar interaktif
-        cols_persepsi = [
-            "Relevansi Kurikulum Jurusan dengan Dunia Kerja",
-            "Kesesuaian Jurusan dengan Minat",
-            "Penilaian Prospek Kerja Jurusan"
-        ]
-        persepsi_var = st.selectbox("Pilih variabel persepsi:", cols_persepsi)
-
-        # Pastikan kolom tersedia
-        if persepsi_var in data.columns:
-            import plotly.express as px
-            import pandas as pd
-
-            # Hitung jumlah kombinasi Program Studi × Persepsi
-            df_group = data.groupby(["Program Studi", persepsi_var]).size().reset_index(name="Jumlah")
-
-            # Warna tema ungu pastel elegan
-            purple_palette = ["#E0BBE4", "#957DAD", "#7B68EE", "#512DA8", "#311B92"]
-
-            # Sunburst (pie bertingkat dua)
-            fig = px.sunburst(
-                df_group,
-                path=[persepsi_var, "Program Studi"],
-                values="Jumlah",
-                color=persepsi_var,
-                color_discrete_sequence=purple_palette,
-                width=700,
-                height=700
+    # fragment: pilihan variabel persepsi & drilldown Fakultas hanya merender ulang bagian ini
+    @st.fragment
+    @terukur
+    def panel_persepsi():
+        # D. Hubungan antara Program Studi dan Persepsi terhadap Jurusan (Pie Chart Dua Variabel)
+        if "Program Studi" in data.columns:
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown("<div class='chart-title'>Hubungan Program Studi dan Persepsi terhadap Jurusan</div>", unsafe_allow_html=True)
+
+            # Pilih variabel persepsi lewat dropdown agar interaktif
+            cols_persepsi = [
+                "Relevansi Kurikulum Jurusan dengan Dunia Kerja",
+                "Kesesuaian Jurusan dengan Minat",
+                "Penilaian Prospek Kerja Jurusan"
+            ]
+            persepsi_var = st.selectbox("Pilih variabel persepsi:", cols_persepsi)
+
+            # Pastikan kolom tersedia
+            if persepsi_var in data.columns:
+                # Hitung jumlah kombinasi Program Studi × Persepsi
+                tabel_persepsi = crosstab_persepsi(versi, tuple(selected), margin_aktif)[persepsi_var]
+                df_group = tabel_persepsi.groupby(["Program Studi", persepsi_var], as_index=False)["Jumlah"].sum()
+
+                # Warna tema ungu pastel elegan
+                purple_palette = ["#E0BBE4", "#957DAD", "#7B68EE", "#512DA8", "#311B92"]
+
+                # Sunburst (pie bertingkat dua)
+                fig = px.sunburst(
+                    df_group,
+                    path=[persepsi_var, "Program Studi"],
+                    values="Jumlah",
+                    color=persepsi_var,
+                    color_discrete_sequence=purple_palette,
+                    width=700,
+                    height=700
+                )
+
+                # Layout menyesuaikan dengan tema dashboard
+                fig.update_layout(
+                    margin=dict(t=40, b=40, l=20, r=20),
+                    paper_bgcolor="var(--background-color)",
+                    plot_bgcolor="var(--secondary-background-color)",
+                    font=dict(family="Poppins", color="var(--text-color)", size=15),
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+                # Insight otomatis
+                dominan = ins["persepsi_dominan"][persepsi_var]
+                st.markdown(f"""
+                <div class='insight' 
+                    style='background-color: var(--secondary-background-color);
+                    border-left:6px solid #7B1FA2;
+                    padding:15px; 
+                    border-radius:12px; 
+                    margin-top:10px;
+                    font-family:"Poppins", sans-serif; 
+                    color:var(--text-color); 
+                    font-size:17px;'>
+                    💡 Mayoritas mahasiswa menilai <b>{persepsi_var}</b> sebagai <b>{dominan}</b>. 
+                    Hasil ini menggambarkan persepsi umum antar jurusan yang cenderung seragam atau dominan di kategori tersebut.
+                </div>
+                """, unsafe_allow_html=True)
+
+                # Drilldown Fakultas → Program Studi → Persepsi: level anak baru dibentuk setelah Fakultas dipilih,
+                # sehingga figur hanya memuat satu level daun pada satu waktu
+                st.markdown("<div class='chart-title'>Drilldown Fakultas → Program Studi → Persepsi</div>", unsafe_allow_html=True)
+                fakultas_pilih = st.pills(
+                    "Klik salah satu Fakultas untuk melihat Program Studi di dalamnya:",
+                    sorted(tabel_persepsi["Fakultas"].unique()),
+                )
+
+                if fakultas_pilih is None:
+                    level = tabel_persepsi.groupby(["Fakultas", persepsi_var], as_index=False)["Jumlah"].sum()
+                    path_level = ["Fakultas", persepsi_var]
+                else:
+                    level = tabel_persepsi[tabel_persepsi["Fakultas"] == fakultas_pilih]
+                    path_level = ["Program Studi", persepsi_var]
+
+                fig_drill = px.sunburst(
+                    level,
+                    path=path_level,
+                    values="Jumlah",
+                    color=path_level[0],
+                    color_discrete_sequence=purple_palette,
+                    height=600
+                )
+                fig_drill.update_layout(
+                    margin=dict(t=40, b=40, l=20, r=20),
+                    paper_bgcolor="var(--background-color)",
+                    font=dict(family="Poppins", color="var(--text-color)", size=15),
+                )
+                st.plotly_chart(fig_drill, use_container_width=True)
+
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    panel_persepsi()
+
+    # fragment: slider link hanya menghitung ulang Sankey
+    @st.fragment
+    @terukur
+    def panel_alur():
+        # E. Alur keputusan: Sumber Informasi → Alasan Memilih → Keinginan Pindah → Tingkat Kepuasan
+        if all(c in data.columns for c in KOLOM_ALUR):
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown("<div class='chart-title'>Alur Keputusan Mahasiswa</div>", unsafe_allow_html=True)
+            maks_link = st.slider("Maksimum link per tahap (alur kecil digabung ke 'Lainnya')", 6, 40, MAKS_LINK_DEFAULT)
+
+            alur = alur_keputusan(versi, tuple(selected), maks_link, margin_aktif)
+            fig_sankey = go.Figure(go.Sankey(
+                node=dict(label=alur["label"], pad=18, thickness=16, color="#7E57C2", line=dict(color="white", width=0.5)),
+                link=dict(source=alur["source"], target=alur["target"], value=alur["value"], color="rgba(155,89,182,0.30)"),
+            ))
+            fig_sankey.update_layout(
+                height=550,
+                margin=dict(t=30, b=30, l=20, r=20),
+                paper_bgcolor="var(--background-color)",
+                font=dict(family="Poppins", color="var(--text-color)", size=13),
             )
+            st.plotly_chart(fig_sankey, use_container_width=True)
 
-            # Layout menyesuaikan dengan tema dashboard
-            fig.update_layout(
-                margin=dict(t=40, b=40, l=20, r=20),
+            st.markdown(f"""
+                <div class='insight'
+                    style='background-color: var(--secondary-background-color);
+                    border-left:6px solid #7B1FA2;
+                    padding:15px;
+                    border-radius:12px;
+                    margin-top:10px;
+                    font-family:"Poppins", sans-serif;
+                    color:var(--text-color);
+                    font-size:17px;'>
+                    💡 Tahapan dibaca dari kiri ke kanan: sumber informasi, alasan memilih jurusan, keinginan pindah jurusan,
+                    lalu pita tingkat kepuasan (Rendah 1–4, Sedang 5–7, Tinggi 8–10). Jalur lengkap yang paling banyak dilalui adalah
+                    <b>{' → '.join(alur['jalur_terbesar'])}</b> ({alur['jumlah_jalur_terbesar']} mahasiswa).
+                </div>
+            """, unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    panel_alur()
+
+    # F. Tren respons & kepuasan per waktu (dari agregat harian/mingguan yang diperbarui per batch)
+    @st.fragment(run_every=LIVE_INTERVAL if mode_live else None)
+    @terukur
+    def panel_tren():
+        live = ingestor_live(LIVE_SOURCE, versi)
+        if mode_live:
+            live.poll()
+
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.markdown("<div class='chart-title'>Tren Respons & Kepuasan per Waktu</div>", unsafe_allow_html=True)
+        colT1, colT2, colT3 = st.columns(3)
+        with colT1:
+            periode = st.radio("Periode", ["harian", "mingguan"], horizontal=True, format_func=str.title)
+        with colT2:
+            ukuran = st.radio("Ukuran", ["Jumlah", "Rata-rata Tingkat Kepuasan"], horizontal=True)
+        with colT3:
+            jendela = st.slider("Rolling (periode)", 1, 14, 1 if periode == "mingguan" else 3)
+
+        tren = live.agregat_waktu.tren(periode, jendela)
+        if tren.empty:
+            st.info(f"Belum ada Timestamp yang bisa dibaca dari '{LIVE_SOURCE}'.")
+        else:
+            fakultas_tren = st.multiselect(
+                "Fakultas",
+                sorted(tren["Fakultas"].unique()),
+                default=["Semua"],
+            )
+            tren = tren[tren["Fakultas"].isin(fakultas_tren)]
+            fig_tren = px.line(
+                tren,
+                x="Periode",
+                y=ukuran,
+                color="Fakultas",
+                markers=True,
+                color_discrete_sequence=px.colors.sequential.Purp_r,
+            )
+            fig_tren.update_layout(
+                height=450,
+                margin=dict(t=30, b=40),
                 paper_bgcolor="var(--background-color)",
                 plot_bgcolor="var(--secondary-background-color)",
-                font=dict(family="Poppins", color="var(--text-color)", size=15),
+                font=dict(family="Poppins", color="var(--text-color)", size=14),
+                xaxis_title="",
             )
+            st.plotly_chart(fig_tren, use_container_width=True)
 
-            st.plotly_chart(fig, use_container_width=True)
-
-            # Insight otomatis
-            dominan = df_group.groupby(persepsi_var)["Jumlah"].sum().reset_index().sort_values("Jumlah", ascending=False).iloc[0]
+            semua = live.agregat_waktu.tren(periode)
+            semua = semua[(semua["Fakultas"] == "Semua") & (semua["Jumlah"] > 0)]
+            puncak = semua.loc[semua["Jumlah"].idxmax()]
             st.markdown(f"""
-            <div class='insight' 
-                style='background-color: var(--secondary-background-color);
-                border-left:6px solid #7B1FA2;
-                padding:15px; 
-                border-radius:12px; 
-                margin-top:10px;
-                font-family:"Poppins", sans-serif; 
-                color:var(--text-color); 
-                font-size:17px;'>
-                💡 Mayoritas mahasiswa menilai <b>{persepsi_var}</b> sebagai <b>{dominan[persepsi_var]}</b>. 
-                Hasil ini menggambarkan persepsi umum antar jurusan yang cenderung seragam atau dominan di kategori tersebut.
-            </div>
+                <div class='insight'
+                    style='background-color: var(--secondary-background-color);
+                    border-left:6px solid #7B1FA2;
+                    padding:15px;
+                    border-radius:12px;
+                    margin-top:10px;
+                    font-family:"Poppins", sans-serif;
+                    color:var(--text-color);
+                    font-size:17px;'>
+                    💡 Respons terbanyak masuk pada periode <b>{puncak['Periode']:%d %b %Y}</b> ({int(puncak['Jumlah'])} respons,
+                    rata-rata kepuasan <b>{puncak['Rata-rata Tingkat Kepuasan']:.2f}</b>). Grafik ini memakai seluruh respons
+                    di file export (tanpa filter Program Studi){'; garis diperhalus dengan jumlah bergulir ' + str(jendela) + ' periode' if jendela > 1 else ''}.
+                </div>
             """, unsafe_allow_html=True)
-
         st.markdown("</div>", unsafe_allow_html=True)
 
+    panel_tren()
+
 # ---------------------------
 # Page: Hubungan Antar Variabel (Korelasi heatmap)
 # ---------------------------
 elif page == "🔗 Hubungan Antar Variabel":
     st.subheader("🔗 Hubungan Antar Variabel")
-    num_cols = ["Tingkat Kepuasan", "Tingkat Kesulitan Mata Kuliah", "Tinggi Motivasi", "Jumlah Mata Kuliah Sesuai Minat", "Jumlah Stress dalam Seminggu"]
-    num_cols = [c for c in num_cols if c in data.columns]
+    num_cols = [c for c in NUM_COLS_KORELASI if c in data.columns]
     if not num_cols:
         st.info("Tidak ada cukup variabel numerik untuk analisis korelasi.")
     else:
         st.markdown("<div class='card'>", unsafe_allow_html=True)
         st.markdown("<div class='chart-title'>Hubungan Antar Variabel</div>", unsafe_allow_html=True)
-        corr = data[num_cols].corr()
-        fig, ax = plt.subplots(figsize=(5, 3))
-        # Mengganti warna background statis dengan variabel CSS Streamlit
-        fig.patch.set_facecolor(st.get_option("theme.backgroundColor") or "#f3e8ff") 
-        ax.set_facecolor(st.get_option("theme.secondaryBackgroundColor") or "#F3E5F5")  
-        sns.heatmap(
-            corr, 
-            annot=True, 
-            cmap="Purples", 
-            fmt=".2f", 
-            linewidths=0.6, 
-            vmin=-1, 
-            vmax=1, 
-            cbar_kws={"shrink": 0.3, "aspect": 5, "pad": 0.01},
-            annot_kws={"size": 5, "color": "black"} # Text anotasi di dalam heatmap
-        )
-
-        cbar = ax.collections[0].colorbar
-        cbar.ax.tick_params(labelsize=4)
-        # Menyesuaikan warna label di matplotlib
-        text_color = st.get_option("theme.textColor") or "black" 
-        ax.tick_params(axis='x', labelsize=6, rotation=45, colors=text_color)
-        ax.tick_params(axis='y', labelsize=6, colors=text_color)
-        cbar.ax.yaxis.set_tick_params(labelcolor=text_color)
 
-        plt.subplots_adjust(bottom=0.25, top=0.95, left=0.25, right=0.90)
+        colK1, colK2 = st.columns(2)
+        with colK1:
+            st.markdown("<div class='chart-title'>Korelasi Pearson (Numerik)</div>", unsafe_allow_html=True)
+            corr = korelasi(data, num_cols, bobot_terfilter(versi, margin_aktif, data))
+            fig, ax = plt.subplots(figsize=(5, 3))
+            # Mengganti warna background statis dengan variabel CSS Streamlit
+            fig.patch.set_facecolor(st.get_option("theme.backgroundColor") or "#f3e8ff") 
+            ax.set_facecolor(st.get_option("theme.secondaryBackgroundColor") or "#F3E5F5")  
+            sns.heatmap(
+                corr, 
+                annot=True, 
+                cmap="Purples", 
+                fmt=".2f", 
+                linewidths=0.6, 
+                vmin=-1, 
+                vmax=1, 
+                cbar_kws={"shrink": 0.3, "aspect": 5, "pad": 0.01},
+                annot_kws={"size": 5, "color": "black"} # Text anotasi di dalam heatmap
+            )
 
-        plt.tight_layout()
-        st.pyplot(fig, use_container_width=True)
+            cbar = ax.collections[0].colorbar
+            cbar.ax.tick_params(labelsize=4)
+            # Menyesuaikan warna label di matplotlib
+            text_color = st.get_option("theme.textColor") or "black" 
+            ax.tick_params(axis='x', labelsize=6, rotation=45, colors=text_color)
+            ax.tick_params(axis='y', labelsize=6, colors=text_color)
+            cbar.ax.yaxis.set_tick_params(labelcolor=text_color)
+
+            plt.subplots_adjust(bottom=0.25, top=0.95, left=0.25, right=0.90)
+
+            plt.tight_layout()
+            st.pyplot(fig, use_container_width=True)
+        with colK2:
+            st.markdown("<div class='chart-title'>Cramér's V (Kategorik)</div>", unsafe_allow_html=True)
+            cramer_v, cramer_p = asosiasi_kategorik(versi, tuple(selected))
+            fig_v, ax_v = plt.subplots(figsize=(5, 3))
+            fig_v.patch.set_facecolor(st.get_option("theme.backgroundColor") or "#f3e8ff")
+            ax_v.set_facecolor(st.get_option("theme.secondaryBackgroundColor") or "#F3E5F5")
+            sns.heatmap(
+                cramer_v,
+                annot=True,
+                cmap="Purples",
+                fmt=".2f",
+                linewidths=0.6,
+                vmin=0,
+                vmax=1,
+                cbar_kws={"shrink": 0.3, "aspect": 5, "pad": 0.01},
+                annot_kws={"size": 5, "color": "black"}
+            )
+            cbar_v = ax_v.collections[0].colorbar
+            cbar_v.ax.tick_params(labelsize=4)
+            ax_v.tick_params(axis='x', labelsize=6, rotation=45, colors=text_color)
+            ax_v.tick_params(axis='y', labelsize=6, colors=text_color)
+            cbar_v.ax.yaxis.set_tick_params(labelcolor=text_color)
+            plt.tight_layout()
+            st.pyplot(fig_v, use_container_width=True)
+            if margin_aktif is not None:
+                st.caption("Cramér's V dihitung tanpa bobot post-stratifikasi")
+
+        # pasangan kategorik dengan asosiasi terkuat (di luar diagonal)
+        pasangan = cramer_v.where(~np.eye(len(cramer_v), dtype=bool)).stack()
+        if not pasangan.empty:
+            (kat_a, kat_b), v_max = pasangan.idxmax(), pasangan.max()
+            p_max = cramer_p.loc[kat_a, kat_b]
+            st.markdown(f"""
+                <div class='insight'
+                    style='
+                    background-color: var(--secondary-background-color);
+                    border-left: 5px solid #6A0DAD;
+                    padding: 10px 15px;
+                    border-radius: 10px;
+                    margin-top: 10px;
+                    color: var(--text-color);
+                    font-family: "Poppins", sans-serif;
+                    font-size: 16px
+                '>
+                💡 Di antara variabel kategorik, asosiasi terkuat terdapat antara <b>{kat_a}</b> dan <b>{kat_b}</b>
+                (Cramér's V = <b>{v_max:.2f}</b>, p-value chi-square = {p_max:.4f}, {"signifikan" if p_max < 0.05 else "tidak signifikan"} pada α = 0.05).
+                </div>
+            """, unsafe_allow_html=True)
         # Menghapus 'color: #3a0069;' statis dan mengganti background color statis
         st.markdown("""
              <div class = 'insight' 
@@ -803,41 +1898,10 @@ elif page == "🔗 Hubungan Antar Variabel":
                 Sementara itu, <b>Jumlah Stress dalam Seminggu</b> memiliki <b>korelasi negatif</b> dengan sebagian besar variabel lainnya, menandakan bahwa <b>semakin tinggi tingkat stres, cenderung menurunkan motivasi dan kepuasan mahasiswa.</b></div>""", unsafe_allow_html=True)
 
         # D. Kombinasi: Pairplot (Seaborn) + Cluster 3D
-        num_cols = ["Tingkat Kepuasan", "Tingkat Kesulitan Mata Kuliah", "Tinggi Motivasi", "Jumlah Mata Kuliah Sesuai Minat", "Jumlah Stress dalam Seminggu"]
-        num_cols = [c for c in num_cols if c in data.columns]
+        num_cols = [c for c in NUM_COLS_KORELASI if c in data.columns]
         st.markdown("<div class='card'>", unsafe_allow_html=True)
         if len(num_cols) >= 2:
-            sns.set(style="whitegrid", font="Poppins")
-
-            # Pairplot 
-            pairplot_fig = sns.pairplot(
-                data[num_cols].dropna(),
-                diag_kind="kde",
-                corner=True,
-                kind="reg",
-                plot_kws=dict( 
-                    line_kws=dict(color="#4D29A0", lw=1.5),
-                    scatter_kws=dict(s=40, alpha=0.7, color="#4D29A0")
-                ),
-                diag_kws=dict(color="#4D29A0", fill=True)
-              )   
-
-            
-            # Mengganti warna background statis dengan variabel CSS Streamlit
-            pairplot_fig.fig.patch.set_facecolor(st.get_option("theme.backgroundColor") or "#f3e8ff")
-            for ax in pairplot_fig.axes.flatten():
-                if ax is not None:
-                    ax.set_facecolor(st.get_option("theme.secondaryBackgroundColor") or "#F3E5F5") 
-                    # Menyesuaikan warna label sumbu agar terlihat di dark mode
-                    ax.xaxis.label.set_color(st.get_option("theme.textColor") or "black") 
-                    ax.yaxis.label.set_color(st.get_option("theme.textColor") or "black")
-                    ax.tick_params(axis='x', colors=st.get_option("theme.textColor") or "black")
-                    ax.tick_params(axis='y', colors=st.get_option("theme.textColor") or "black")
-
-            # Jarak 
-            pairplot_fig.fig.subplots_adjust(wspace=0.3, hspace=0.3)
-
-            st.pyplot(pairplot_fig, use_container_width=True)
+            st.image(gambar_pairplot(versi, tuple(selected), tuple(num_cols)), use_container_width=True)
 
             # Insight 
             # Menghapus 'color: #3a0069;' statis dan mengganti background color statis
@@ -866,14 +1930,13 @@ elif page == "🔗 Hubungan Antar Variabel":
             # Dihapus: color:#5E35B1; (agar menyesuaikan mode gelap/terang)
             st.markdown("<div class='chart-title'>Cluster 3D Mahasiswa Berdasarkan Aspek Akademik</div>", unsafe_allow_html=True)
 
-            X = data[num_cols].dropna()
-            scaler = StandardScaler()
-            Xs = scaler.fit_transform(X)
-            kmeans = KMeans(n_clusters=3, random_state=42, n_init=10)
-            labels = kmeans.fit_predict(Xs)
-
-            X_plot = data[num_cols].dropna().copy()
-            X_plot["Cluster"] = labels.astype(str)
+            X_plot = klaster_kmeans(versi, tuple(selected), tuple(num_cols))
+            if margin_aktif is not None:
+                st.caption("Klaster k-means dihitung tanpa bobot post-stratifikasi")
+            tombol_unduh(
+                "label klaster", "label_klaster", ("klaster", tuple(selected), tuple(num_cols)),
+                lambda: data.loc[X_plot.index, ["ID_Responden"]].join(X_plot) if "ID_Responden" in data.columns else X_plot,
+            )
 
             fig_cluster = px.scatter_3d(
                 X_plot,
@@ -927,191 +1990,285 @@ elif page == "🔗 Hubungan Antar Variabel":
 
             st.markdown("</div>", unsafe_allow_html=True)
 
+        # E. Reduksi dimensi: semua item numerik diringkas menjadi beberapa komponen/faktor
+        @st.fragment
+        @terukur
+        def panel_reduksi():
+            kolom = tuple(c for c in KOLOM_REDUKSI if c in data.columns)
+            n_lengkap = len(data[list(kolom)].dropna())
+            if len(kolom) < 3 or n_lengkap <= len(kolom):
+                return
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown("<div class='chart-title'>Reduksi Dimensi Item Numerik (PCA / Analisis Faktor)</div>", unsafe_allow_html=True)
 
-# ---------------------------
-# Page: Korelasi & Regresi Berganda (diperluas)
-# ---------------------------
-elif page == "📈 Regresi Berganda":
-    st.subheader("📈 Korelasi & Regresi Linear (Lengkap)")
-
-    # Kolom numerik untuk memilih
-    num_cols_all = data.select_dtypes(include=["int64", "float64"]).columns.tolist()
-    if len(num_cols_all) < 2:
-        st.warning("Dibutuhkan minimal dua variabel numerik untuk analisis regresi.")
-    else:
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.markdown("<div class='chart-title'>Pengaturan Model Regresi Linear</div>", unsafe_allow_html=True)
+            col_m, col_d, col_w = st.columns(3)
+            metode = col_m.radio(
+                "Metode", ["PCA", "Analisis Faktor"], horizontal=True,
+                help="PCA merangkum varians total; analisis faktor (rotasi varimax) mencari faktor laten bersama antar item",
+            )
+            dimensi = 3 if col_d.radio("Proyeksi", ["2D", "3D"], horizontal=True) == "3D" else 2
+            pilihan_warna = ["Cluster", "Program Studi"] if len(num_cols) >= 3 else ["Program Studi"]
+            warna = col_w.radio("Warna", pilihan_warna, horizontal=True)
+
+            model = model_reduksi(versi, tuple(selected), kolom, metode, dimensi)
+            if margin_aktif is not None:
+                st.caption(f"{metode} dihitung tanpa bobot post-stratifikasi")
+            skor = skor_reduksi(versi, tuple(selected), kolom, metode, dimensi, tuple(num_cols) if len(num_cols) >= 3 else ())
+            sumbu = [c for c in skor.columns if c not in ("Program Studi", "Cluster")][:dimensi]
+            nama = [f"PC{i + 1}" if metode == "PCA" else f"Faktor {i + 1}" for i in range(len(model["rasio_varians"]))]
+
+            col_v, col_l = st.columns(2)
+            with col_v:
+                rasio = model["rasio_varians"] * 100
+                fig_var = go.Figure()
+                fig_var.add_bar(
+                    x=nama, y=rasio, name="Per komponen", marker_color=PURPLE_MAIN,
+                    text=[f"{r:.1f}%" for r in rasio], textposition="outside",
+                )
+                fig_var.add_scatter(
+                    x=nama, y=np.cumsum(rasio), name="Kumulatif", mode="lines+markers",
+                    line=dict(color=PURPLE_ACCENT, width=3),
+                )
+                fig_var.update_layout(
+                    title="Varians yang Dijelaskan",
+                    plot_bgcolor="var(--secondary-background-color)",
+                    paper_bgcolor="var(--background-color)",
+                    font=dict(family="Poppins", color="var(--text-color)", size=13),
+                    yaxis=dict(title="% varians", range=[0, 105], gridcolor="rgba(106,13,173,0.3)"),
+                    legend=dict(orientation="h", y=-0.2),
+                    margin=dict(t=50, b=40, l=50, r=20),
+                )
+                st.plotly_chart(fig_var, use_container_width=True)
+            with col_l:
+                muatan = pd.DataFrame(model["muatan"][:dimensi].T, index=list(kolom), columns=nama[:dimensi])
+                fig_muatan = px.imshow(
+                    muatan.round(2), text_auto=True, aspect="auto", zmin=-1, zmax=1,
+                    color_continuous_scale=["#BB8FCE", "#F3E5F5", "#4D29A0"], title="Muatan Item",
+                )
+                fig_muatan.update_layout(
+                    paper_bgcolor="var(--background-color)",
+                    font=dict(family="Poppins", color="var(--text-color)", size=12),
+                    margin=dict(t=50, b=40, l=20, r=20),
+                )
+                st.plotly_chart(fig_muatan, use_container_width=True)
+
+            warna_diskrit = ['#4D29A0', '#8E44AD', '#BB8FCE', '#D1C4E9'] if warna == "Cluster" else px.colors.qualitative.Prism
+            if dimensi == 3:
+                fig_proyeksi = px.scatter_3d(
+                    skor, x=sumbu[0], y=sumbu[1], z=sumbu[2], color=warna,
+                    color_discrete_sequence=warna_diskrit, height=650,
+                    hover_data=["Program Studi"] if warna == "Cluster" and "Program Studi" in skor.columns else None,
+                )
+                fig_proyeksi.update_traces(marker=dict(size=6, opacity=0.9))
+                fig_proyeksi.update_layout(scene=dict(bgcolor="#F3E5F5"))
+            else:
+                fig_proyeksi = px.scatter(
+                    skor, x=sumbu[0], y=sumbu[1], color=warna,
+                    color_discrete_sequence=warna_diskrit, height=550,
+                    hover_data=["Program Studi"] if warna == "Cluster" and "Program Studi" in skor.columns else None,
+                )
+                fig_proyeksi.update_traces(marker=dict(size=10, opacity=0.85, line=dict(color="white", width=1)))
+                fig_proyeksi.update_layout(plot_bgcolor="var(--secondary-background-color)")
+            fig_proyeksi.update_layout(
+                paper_bgcolor="#f5edff",
+                font=dict(family="Poppins", size=13),
+                legend=dict(title=warna, bordercolor="#4D29A0", borderwidth=1),
+                margin=dict(t=30, b=30, l=30, r=30),
+            )
+            st.plotly_chart(fig_proyeksi, use_container_width=True)
 
-        st.markdown("""
-            <div style="
-                font-size: 16px; 
-                font-weight: 400; 
-                font-family: 'Poppins', sans-serif; 
-                margin-bottom: -15px;
-            ">
-                Pilih variabel dependen (Y):
+            # item dengan muatan absolut terbesar pada dua sumbu pertama, untuk membaca arti sumbu
+            dominan = [muatan[c].abs().idxmax() for c in muatan.columns[:2]]
+            terangkum = model["rasio_varians"][:dimensi].sum() * 100
+            st.markdown(f"""
+            <div class = 'insight'
+                style='
+                background-color: var(--secondary-background-color);
+                border-left: 5px solid #4D29A0;
+                padding: 10px 15px;
+                border-radius: 10px;
+                margin-top: 10px;
+                margin-bottom: 30px;
+                font-family: "Poppins", sans-serif;
+                font-size: 16px;
+            '>
+            💡 {dimensi} {"komponen" if metode == "PCA" else "faktor"} pertama merangkum <b>{terangkum:.1f}%</b> varians dari {len(kolom)} item numerik ({n_lengkap} responden lengkap).
+            Sumbu <b>{nama[0]}</b> paling dipengaruhi <b>{dominan[0]}</b>, sedangkan <b>{nama[1]}</b> paling dipengaruhi <b>{dominan[1]}</b>.
+            Berbeda dengan grafik klaster di atas yang hanya memakai tiga variabel, proyeksi ini memakai semua item, jadi tidak ada dimensi yang dibuang.
             </div>
-        """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
 
-        dep_var = st.selectbox("", num_cols_all, index=0)
+            st.markdown("</div>", unsafe_allow_html=True)
 
-        st.markdown("""
-            <div style="
-                font-size: 16px; 
-                font-weight: 400; 
-                font-family: 'Poppins', sans-serif; 
-                margin-top: 10px; 
-                margin-bottom: -15px;
-            ">
-                Pilih variabel independen (X) — minimal 1:
-            </div>
-        """, unsafe_allow_html=True)
+        panel_reduksi()
 
-        # Multiselect
-        indep_vars = st.multiselect(
-            "",
-            [c for c in num_cols_all if c != dep_var],
-            default=[c for c in num_cols_all if c != dep_var][:2]
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
 
-        if indep_vars:
-            model_df = data[[dep_var] + indep_vars].dropna()
-            X = model_df[indep_vars]
-            X = sm.add_constant(X)
-            y = model_df[dep_var]
-
-            model = sm.OLS(y, X).fit()
-            with st.expander("📄 Ringkasan Output Regresi (klik untuk buka)"):
-                summary_html = f"""
-                    <div style="
-                        font-family: 'Poppins', Sans-serif;
-                        font-size: 16px;
-                        background-color: var(--secondary-background-color);
-                        padding: 15px;
-                        border-radius: 10px;
-                        border: 1px solid #ddd;
-                        white-space: pre-wrap;
-                    ">
-                        {model.summary()}
-                    </div>
-                """
-                st.markdown(summary_html, unsafe_allow_html=True)
-
-            # Render equation, coefficients, p-values, R-squared
-            coefs = model.params
-            pvals = model.pvalues
-            rsq = model.rsquared
-            adj_rsq = model.rsquared_adj
-
-            # Rumus: Y = a + b1*X1 + b2*X2 + ...
-            intercept = coefs.get("const", 0.0)
-            eq_parts = [f"{intercept:.4f}"]
-            for var in indep_vars:
-                b = coefs.get(var, 0.0)
-                eq_parts.append(f"{b:.4f}·{var}")
-            equation = " + ".join(eq_parts)
-            equation = f"{dep_var} = {equation}"
+# ---------------------------
+# Page: Korelasi & Regresi Berganda (diperluas)
+# ---------------------------
+elif page == "📈 Regresi Berganda":
+    st.subheader("📈 Korelasi & Regresi Linear (Lengkap)")
 
+    # fragment: mengganti variabel regresi hanya menjalankan ulang bagian ini
+    @st.fragment
+    @terukur
+    def panel_regresi():
+        # Kolom numerik untuk memilih
+        num_cols_all = data.select_dtypes(include=["int64", "float64"]).columns.tolist()
+        if len(num_cols_all) < 2:
+            st.warning("Dibutuhkan minimal dua variabel numerik untuk analisis regresi.")
+        else:
             st.markdown("<div class='card'>", unsafe_allow_html=True)
-            st.markdown(f"<div class='chart-title'>Rumus Model & Interpretasi</div>", unsafe_allow_html=True)
-            # Dihapus: color:black;
-            st.markdown(f"""
-                <div style="font-size:16px; font-family:Poppins, sans-serif; margin-bottom:8px;">
-                    <b>Rumus model (estimasi):</b> <code>{equation}</code>
-                </div>
-                # Dihapus: color:black;
-                <div style="font-size:16px; font-family:Poppins, sans-serif; margin-bottom:8px;">
-                    <b>R-squared:</b> {rsq:.4f} — proporsi variabilitas <b>{dep_var}</b> yang dijelaskan oleh model.
-                </div>
-                # Dihapus: color:black;
-                <div style="font-size:16px; font-family:Poppins, sans-serif;">
-                    <b>Adjusted R-squared:</b> {adj_rsq:.4f}
+            st.markdown("<div class='chart-title'>Pengaturan Model Regresi Linear</div>", unsafe_allow_html=True)
+
+            st.markdown("""
+                <div style="
+                    font-size: 16px; 
+                    font-weight: 400; 
+                    font-family: 'Poppins', sans-serif; 
+                    margin-bottom: -15px;
+                ">
+                    Pilih variabel dependen (Y):
                 </div>
             """, unsafe_allow_html=True)
 
-            # coefficients table
-            coef_table = pd.DataFrame({
-                "Variable": coefs.index,  
-                "Coefficient": coefs.round(20).values,
-                "p-value": pvals.round(20).values
-            })
+            dep_var = st.selectbox("", num_cols_all, index=0)
 
-            html_table = coef_table.to_html(index=False)
-
-            # Dihapus: color:black;
-            st.markdown(f"""
-                <div style="font-size:16px; font-family:Poppins, sans-serif;">
-                    {html_table}
+            st.markdown("""
+                <div style="
+                    font-size: 16px; 
+                    font-weight: 400; 
+                    font-family: 'Poppins', sans-serif; 
+                    margin-top: 10px; 
+                    margin-bottom: -15px;
+                ">
+                    Pilih variabel independen (X) — minimal 1:
                 </div>
             """, unsafe_allow_html=True)
 
-            # Auto interpretasi
-            interpretations = []
-            for var in indep_vars:
-                b = coefs.get(var, 0.0)
-                p = pvals.get(var, 1.0)
-                sign = "naik" if b > 0 else "turun" if b < 0 else "tidak berubah"
-                signif = "signifikan" if p < 0.05 else "tidak signifikan"
-                interpretations.append(f"- Jika {var} <b>bertambah 1 unit</b>, maka {dep_var} diperkirakan <b>{sign} sebesar {abs(b):.4f} unit</b> (p={p:.4f}, {signif}).")
-            st.markdown(
-                """
-                <div class='insight' style='
-                    background-color: var(--secondary-background-color);
-                    border-left: 5px solid #4D29A0;
-                    padding: 10px 15px;
-                    border-radius: 10px;
-                    margin-top: 10px;
-                    margin-bottom: 30px;
-                    font-family: "Poppins", sans-serif;
-                    font-size: 16px;
-                '>
-                """ + "<br>".join(interpretations) + "</div>",
-                unsafe_allow_html=True
+            # Multiselect
+            indep_vars = st.multiselect(
+                "",
+                [c for c in num_cols_all if c != dep_var],
+                default=[c for c in num_cols_all if c != dep_var][:2]
             )
+            st.markdown("</div>", unsafe_allow_html=True)
 
-            # Scatter + regression line plot (Jika pilih 1 variabel x)
-            if len(indep_vars) == 1:
-                xvar = indep_vars[0]
-                st.markdown("<div class='card'>", unsafe_allow_html=True)
-                st.markdown(f"<div class='chart-title'>Plot {dep_var} vs {xvar} + Garis Regresi</div>", unsafe_allow_html=True)
-                # scatter dan garis prediksi
-                scatter_fig = px.scatter(model_df, x=xvar, y=dep_var, trendline="ols", trendline_color_override=PRIMARY_HEX,
-                                             width=900, height=500, labels={xvar: xvar, dep_var: dep_var})
-                scatter_fig.update_traces(marker=dict(size=7, opacity=0.8))
-                scatter_fig.update_layout(transition={"duration":300})
-                st.plotly_chart(scatter_fig, use_container_width=True)
-                st.markdown("""
-                    <div class='insight'
-                    style='
-                    background-color: var(--secondary-background-color);
-                    border-left: 5px solid #4D29A0;
-                    padding: 10px 15px;
-                    border-radius: 10px;
-                    margin-top: 10px;
-                    margin-bottom: 30px;
-                    font-family: "Poppins", sans-serif;
-                    font-size: 16px;
-                '>
-                💡 Plot menampilkan titik observasi dan garis regresi OLS; lihat p-value koefisien untuk menentukan signifikansi.
-                </div>""", unsafe_allow_html=True)
+            if indep_vars:
+                model, model_df = fit_ols(versi, tuple(selected), dep_var, tuple(indep_vars), margin_aktif)
+                with st.expander("📄 Ringkasan Output Regresi (klik untuk buka)"):
+                    summary_html = f"""
+                        <div style="
+                            font-family: 'Poppins', Sans-serif;
+                            font-size: 16px;
+                            background-color: var(--secondary-background-color);
+                            padding: 15px;
+                            border-radius: 10px;
+                            border: 1px solid #ddd;
+                            white-space: pre-wrap;
+                        ">
+                            {model.summary()}
+                        </div>
+                    """
+                    st.markdown(summary_html, unsafe_allow_html=True)
+
+                # Render equation, coefficients, p-values, R-squared
+                coefs = model.params
+                pvals = model.pvalues
+                rsq = model.rsquared
+                adj_rsq = model.rsquared_adj
+
+                # Rumus: Y = a + b1*X1 + b2*X2 + ...
+                intercept = coefs.get("const", 0.0)
+                eq_parts = [f"{intercept:.4f}"]
+                for var in indep_vars:
+                    b = coefs.get(var, 0.0)
+                    eq_parts.append(f"{b:.4f}·{var}")
+                equation = " + ".join(eq_parts)
+                equation = f"{dep_var} = {equation}"
 
-            # Auto kesimpulan
-            concl = []
-            concl.append(f"Model menjelaskan {rsq*100:.2f}% variasi pada <b>{dep_var}</b> (R² = {rsq:.4f}).")
+                st.markdown("<div class='card'>", unsafe_allow_html=True)
+                st.markdown(f"<div class='chart-title'>Rumus Model & Interpretasi</div>", unsafe_allow_html=True)
+                # Dihapus: color:black;
+                st.markdown(f"""
+                    <div style="font-size:16px; font-family:Poppins, sans-serif; margin-bottom:8px;">
+                        <b>Rumus model (estimasi):</b> <code>{equation}</code>
+                    </div>
+                    # Dihapus: color:black;
+                    <div style="font-size:16px; font-family:Poppins, sans-serif; margin-bottom:8px;">
+                        <b>R-squared:</b> {rsq:.4f} — proporsi variabilitas <b>{dep_var}</b> yang dijelaskan oleh model.
+                    </div>
+                    # Dihapus: color:black;
+                    <div style="font-size:16px; font-family:Poppins, sans-serif;">
+                        <b>Adjusted R-squared:</b> {adj_rsq:.4f}
+                    </div>
+                """, unsafe_allow_html=True)
 
-            sig_vars = [v for v in indep_vars if pvals.get(v, 1.0) < 0.05]
-            if sig_vars:
-                concl.append(f"Variabel signifikan: <b>{', '.join(sig_vars)}</b> (p < 0.05). Fokus pada variabel ini untuk intervensi.")
-            else:
-                concl.append("Tidak ada variabel independen yang signifikan pada α = 0.05 — pertimbangkan variabel lain atau model non-linear.")
+                # coefficients table
+                coef_table = pd.DataFrame({
+                    "Variable": coefs.index,  
+                    "Coefficient": coefs.round(20).values,
+                    "p-value": pvals.round(20).values
+                })
 
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            st.markdown("<div class='chart-title'>Kesimpulan Otomatis dari Regresi</div>", unsafe_allow_html=True)
+                html_table = coef_table.to_html(index=False)
+                tombol_unduh(
+                    "koefisien", f"koefisien_{dep_var}", ("koefisien", tuple(selected), dep_var, tuple(indep_vars), margin_aktif),
+                    lambda: pd.DataFrame({
+                        "Variabel": coefs.index,
+                        "Koefisien": coefs.values,
+                        "Std. Error": model.bse.values,
+                        "Batas Bawah": model.conf_int()[0].values,
+                        "Batas Atas": model.conf_int()[1].values,
+                        "p-value": pvals.values,
+                    }),
+                )
 
-            st.markdown(f"""
-                <div class='insight'
-                    style='
+                # Dihapus: color:black;
+                st.markdown(f"""
+                    <div style="font-size:16px; font-family:Poppins, sans-serif;">
+                        {html_table}
+                    </div>
+                """, unsafe_allow_html=True)
+
+                # Auto interpretasi
+                interpretations = []
+                for var in indep_vars:
+                    b = coefs.get(var, 0.0)
+                    p = pvals.get(var, 1.0)
+                    sign = "naik" if b > 0 else "turun" if b < 0 else "tidak berubah"
+                    signif = "signifikan" if p < 0.05 else "tidak signifikan"
+                    interpretations.append(f"- Jika {var} <b>bertambah 1 unit</b>, maka {dep_var} diperkirakan <b>{sign} sebesar {abs(b):.4f} unit</b> (p={p:.4f}, {signif}).")
+                st.markdown(
+                    """
+                    <div class='insight' style='
+                        background-color: var(--secondary-background-color);
+                        border-left: 5px solid #4D29A0;
+                        padding: 10px 15px;
+                        border-radius: 10px;
+                        margin-top: 10px;
+                        margin-bottom: 30px;
+                        font-family: "Poppins", sans-serif;
+                        font-size: 16px;
+                    '>
+                    """ + "<br>".join(interpretations) + "</div>",
+                    unsafe_allow_html=True
+                )
+
+                # Scatter + regression line plot (Jika pilih 1 variabel x)
+                if len(indep_vars) == 1:
+                    xvar = indep_vars[0]
+                    st.markdown("<div class='card'>", unsafe_allow_html=True)
+                    st.markdown(f"<div class='chart-title'>Plot {dep_var} vs {xvar} + Garis Regresi</div>", unsafe_allow_html=True)
+                    # scatter dan garis prediksi
+                    scatter_fig = px.scatter(model_df, x=xvar, y=dep_var, trendline="ols", trendline_color_override=PRIMARY_HEX,
+                                                 width=900, height=500, labels={xvar: xvar, dep_var: dep_var})
+                    scatter_fig.update_traces(marker=dict(size=7, opacity=0.8))
+                    scatter_fig.update_layout(transition={"duration":300})
+                    st.plotly_chart(scatter_fig, use_container_width=True)
+                    st.markdown("""
+                        <div class='insight'
+                        style='
                         background-color: var(--secondary-background-color);
                         border-left: 5px solid #4D29A0;
                         padding: 10px 15px;
@@ -1120,12 +2277,252 @@ elif page == "📈 Regresi Berganda":
                         margin-bottom: 30px;
                         font-family: "Poppins", sans-serif;
                         font-size: 16px;
-                        line-height: 1.6;
                     '>
-                    {"<br>".join(concl)}
+                    💡 Plot menampilkan titik observasi dan garis regresi OLS; lihat p-value koefisien untuk menentukan signifikansi.
+                    </div>""", unsafe_allow_html=True)
+
+                # Auto kesimpulan
+                concl = []
+                concl.append(f"Model menjelaskan {rsq*100:.2f}% variasi pada <b>{dep_var}</b> (R² = {rsq:.4f}).")
+
+                sig_vars = [v for v in indep_vars if pvals.get(v, 1.0) < 0.05]
+                if sig_vars:
+                    concl.append(f"Variabel signifikan: <b>{', '.join(sig_vars)}</b> (p < 0.05). Fokus pada variabel ini untuk intervensi.")
+                else:
+                    concl.append("Tidak ada variabel independen yang signifikan pada α = 0.05 — pertimbangkan variabel lain atau model non-linear.")
+
+                st.markdown("<div class='card'>", unsafe_allow_html=True)
+                st.markdown("<div class='chart-title'>Kesimpulan Otomatis dari Regresi</div>", unsafe_allow_html=True)
+
+                st.markdown(f"""
+                    <div class='insight'
+                        style='
+                            background-color: var(--secondary-background-color);
+                            border-left: 5px solid #4D29A0;
+                            padding: 10px 15px;
+                            border-radius: 10px;
+                            margin-top: 10px;
+                            margin-bottom: 30px;
+                            font-family: "Poppins", sans-serif;
+                            font-size: 16px;
+                            line-height: 1.6;
+                        '>
+                        {"<br>".join(concl)}
+                    </div>
                 </div>
+                """, unsafe_allow_html=True)
+
+                # Simpan scaler, centroid klaster dan koefisien ini untuk scoring respons baru (scoring.py)
+                num_cols_klaster = tuple(c for c in NUM_COLS_KORELASI if c in data.columns)
+                if len(num_cols_klaster) >= 3 and st.button("💾 Simpan model untuk scoring respons baru"):
+                    scaler, kmeans = model_klaster(versi, tuple(selected), num_cols_klaster)
+                    path_artefak = simpan_artefak(buat_artefak(scaler, kmeans, num_cols_klaster, model, dep_var, versi), DIR_ARTEFAK)
+                    st.success(f"Artefak model disimpan di '{path_artefak}'. Jalankan `python scoring.py layani` untuk endpoint HTTP.")
+
+            # Regresi per Program Studi (forest plot koefisien)
+            if indep_vars and st.toggle("Bandingkan koefisien per Program Studi"):
+                koef_prodi = regresi_per_prodi(versi, tuple(selected), dep_var, tuple(indep_vars), margin_aktif)
+                plot_df = koef_prodi[(koef_prodi["Variabel"] != "const") & koef_prodi["Koefisien"].notna()]
+                dilewati = sorted(set(koef_prodi["Program Studi"]) - set(plot_df["Program Studi"]))
+
+                st.markdown("<div class='card'>", unsafe_allow_html=True)
+                st.markdown(f"<div class='chart-title'>Koefisien {dep_var} per Program Studi (IK 95%)</div>", unsafe_allow_html=True)
+                if plot_df.empty:
+                    st.info("Tidak ada Program Studi dengan responden yang cukup untuk model ini.")
+                else:
+                    urutan = plot_df.groupby("Program Studi")["n"].first().sort_values().index.tolist()
+                    forest_fig = px.scatter(
+                        plot_df,
+                        x="Koefisien",
+                        y="Program Studi",
+                        facet_col="Variabel",
+                        error_x=plot_df["Batas Atas"] - plot_df["Koefisien"],
+                        error_x_minus=plot_df["Koefisien"] - plot_df["Batas Bawah"],
+                        hover_data={"n": True, "p-value": ":.4f"},
+                        category_orders={"Program Studi": urutan},
+                        color_discrete_sequence=[PRIMARY_HEX],
+                        height=max(400, 28 * len(urutan)),
+                    )
+                    forest_fig.add_vline(x=0, line_dash="dash", line_color="gray")
+                    forest_fig.update_xaxes(matches=None)
+                    forest_fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+                    st.plotly_chart(forest_fig, use_container_width=True)
+
+                    signif = plot_df[plot_df["p-value"] < 0.05]
+                    teks = (
+                        "; ".join(f"<b>{r['Variabel']}</b> di {r['Program Studi']} ({r['Koefisien']:+.3f})" for _, r in signif.iterrows())
+                        if not signif.empty else "tidak ada koefisien yang signifikan (p < 0.05) di Program Studi manapun"
+                    )
+                    catatan = f"<br>Dilewati karena responden terlalu sedikit / variabel konstan: {', '.join(dilewati)}." if dilewati else ""
+                    st.markdown(f"""
+                        <div class='insight'
+                            style='
+                                background-color: var(--secondary-background-color);
+                                border-left: 5px solid #4D29A0;
+                                padding: 10px 15px;
+                                border-radius: 10px;
+                                margin-top: 10px;
+                                margin-bottom: 30px;
+                                font-family: "Poppins", sans-serif;
+                                font-size: 16px;
+                            '>
+                            💡 Garis horizontal adalah interval kepercayaan 95%; yang tidak memotong garis nol berarti signifikan.
+                            Koefisien signifikan: {teks}.{catatan}
+                        </div>
+                    """, unsafe_allow_html=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            # Pencarian model otomatis (all-subsets / stepwise)
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown("<div class='chart-title'>🔍 Pencarian Model Otomatis</div>", unsafe_allow_html=True)
+
+            kandidat_vars = [c for c in num_cols_all if c != dep_var and c not in KOLOM_BUKAN_VARIABEL]
+            colS1, colS2 = st.columns(2)
+            with colS1:
+                metode_cari = st.radio("Metode pencarian", ["Semua subset", "Stepwise forward", "Stepwise backward"], horizontal=True)
+            with colS2:
+                kriteria = st.selectbox("Kriteria peringkat", list(KRITERIA_MODEL), format_func=KRITERIA_MODEL.get)
+
+            max_prediktor = None
+            if metode_cari == "Semua subset" and len(kandidat_vars) > 1:
+                max_prediktor = st.slider(
+                    "Maksimal jumlah prediktor per model", 1, len(kandidat_vars), min(len(kandidat_vars), 6),
+                    help="Membatasi ukuran subset; jumlah kandidat tumbuh eksponensial dengan banyaknya variabel",
+                )
+                jumlah_kandidat = sum(math.comb(len(kandidat_vars), k) for k in range(1, max_prediktor + 1))
+                st.caption(f"{jumlah_kandidat:,} kandidat model akan dievaluasi; tabel menampilkan {TOP_N_MODEL} terbaik.")
+
+            if st.button("Jalankan pencarian model") and kandidat_vars:
+                search_df = data[[dep_var] + kandidat_vars].dropna()
+                w_cari = bobot_terfilter(versi, margin_aktif, search_df)
+                G = matriks_crossproduct(
+                    search_df[kandidat_vars].values, search_df[dep_var].values,
+                    bobot=None if w_cari is None else w_cari.to_numpy(),
+                )
+                n = len(search_df)
+
+                if metode_cari == "Semua subset":
+                    hasil_iter = cari_semua_subset(G, n, len(kandidat_vars), max_prediktor=max_prediktor)
+                else:
+                    arah = "forward" if metode_cari == "Stepwise forward" else "backward"
+                    hasil_iter = cari_stepwise(G, n, len(kandidat_vars), arah=arah, kriteria=kriteria)
+
+                def tabel_teratas():
+                    return pd.DataFrame([{
+                        "Variabel Independen": ", ".join(kandidat_vars[i] for i in h["subset"]),
+                        "Jumlah X": h["k"],
+                        "R-squared": round(h["r2"], 4),
+                        "Adjusted R-squared": round(h["adj_r2"], 4),
+                        "AIC": round(h["aic"], 2),
+                        "BIC": round(h["bic"], 2),
+                    } for h in peringkat.teratas(kriteria)])
+
+                # hanya N model terbaik yang disimpan; tabel diperbarui paling sering tiap INTERVAL_TABEL_MODEL detik
+                tabel_slot = st.empty()
+                peringkat = PeringkatTeratas(TOP_N_MODEL)
+                tampil_terakhir = 0.0
+                for batch in hasil_iter:
+                    peringkat.tambah(batch)
+                    if time.perf_counter() - tampil_terakhir >= INTERVAL_TABEL_MODEL:
+                        tabel_slot.dataframe(tabel_teratas(), use_container_width=True)
+                        tampil_terakhir = time.perf_counter()
+                hasil_df = tabel_teratas()
+                tabel_slot.dataframe(hasil_df, use_container_width=True)
+
+                if not hasil_df.empty:
+                    terbaik = hasil_df.iloc[0]
+                    st.markdown(f"""
+                        <div class='insight'
+                            style='
+                                background-color: var(--secondary-background-color);
+                                border-left: 5px solid #4D29A0;
+                                padding: 10px 15px;
+                                border-radius: 10px;
+                                margin-top: 10px;
+                                margin-bottom: 30px;
+                                font-family: "Poppins", sans-serif;
+                                font-size: 16px;
+                            '>
+                            💡 Dari {peringkat.jumlah:,} kandidat model, kombinasi terbaik menurut <b>{KRITERIA_MODEL[kriteria]}</b> untuk <b>{dep_var}</b> adalah
+                            <b>{terbaik['Variabel Independen']}</b> (Adjusted R² = {terbaik['Adjusted R-squared']:.4f}).
+                    """, unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    panel_regresi()
+
+
+# ---------------------------
+# Page: Perbandingan Kelompok
+# ---------------------------
+elif page == "⚖️ Perbandingan Kelompok":
+    st.subheader("⚖️ Perbandingan Dua Kelompok")
+
+    @st.fragment
+    @terukur
+    def panel_banding():
+        kolom_tersedia = [c for c in KOLOM_BANDING if c in data.columns]
+        if not kolom_tersedia:
+            st.info("Tidak ada kolom pengelompokan yang tersedia.")
+            return
+
+        kolom = st.selectbox("Bandingkan berdasarkan", kolom_tersedia)
+        opsi = sorted(data[kolom].dropna().unique().tolist())
+        colA, colB = st.columns(2)
+        with colA:
+            nilai_a = st.multiselect("Kelompok A", opsi, default=opsi[:1])
+        with colB:
+            opsi_b = [o for o in opsi if o not in nilai_a]
+            nilai_b = st.multiselect("Kelompok B", opsi_b, default=opsi_b[:1])
+
+        if not nilai_a or not nilai_b:
+            st.info("Pilih minimal satu nilai untuk Kelompok A dan Kelompok B.")
+            return
+
+        hasil, n_a, n_b = bandingkan_kelompok(versi, tuple(selected), kolom, tuple(nilai_a), tuple(nilai_b))
+        if n_a < 2 or n_b < 2:
+            st.warning(f"Setiap kelompok butuh minimal 2 responden (A: {n_a}, B: {n_b}).")
+            return
+
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.markdown(f"<div class='chart-title'>Peringkat Perbedaan: A (n = {n_a}) vs B (n = {n_b})</div>", unsafe_allow_html=True)
+        st.dataframe(
+            hasil.style.format(
+                {"Efek": "{:.3f}", "p-value": "{:.4f}", "q-value (BH)": "{:.4f}", "p Mann-Whitney": "{:.4f}", "Rank-biserial": "{:.3f}"},
+                na_rep="-",
+            ),
+            use_container_width=True,
+        )
+        if margin_aktif is not None:
+            st.caption("Uji perbandingan memakai data tanpa bobot post-stratifikasi.")
+
+        signifikan = hasil[hasil["q-value (BH)"] < 0.05]
+        if signifikan.empty:
+            teks = "tidak ada variabel yang berbeda signifikan setelah koreksi Benjamini–Hochberg (q < 0,05)"
+        else:
+            teks = "variabel yang berbeda signifikan (q < 0,05): " + ", ".join(
+                f"<b>{b['Variabel']}</b> ({b['Ukuran Efek']} = {b['Efek']:.2f}, efek {b['Besar Efek']})"
+                for _, b in signifikan.head(5).iterrows()
+            )
+        st.markdown(f"""
+            <div class='insight'
+                style='
+                    background-color: var(--secondary-background-color);
+                    border-left: 5px solid #4D29A0;
+                    padding: 10px 15px;
+                    border-radius: 10px;
+                    margin-top: 10px;
+                    margin-bottom: 30px;
+                    font-family: "Poppins", sans-serif;
+                    font-size: 16px;
+                '>
+                💡 Membandingkan <b>{kolom}</b> {", ".join(map(str, nilai_a))} dengan {", ".join(map(str, nilai_b))}: {teks}.
+                Kolom numerik diuji dengan Welch t-test dan Mann–Whitney U, kolom kategorik dengan chi-square;
+                efek positif berarti Kelompok A lebih tinggi.
             </div>
-            """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    panel_banding()
 
 
 # ---------------------------
@@ -1185,4 +2582,10 @@ elif page == "🧩 Kesimpulan":
 # ---------------------------
 st.markdown("<br><hr>", unsafe_allow_html=True)
 # Dihapus: color:#6b4b8a; (agar menyesuaikan mode gelap/terang)
-st.markdown("<div style='text-align:center;font-size:12px'>Made with 💜 — Dashboard by Kelompok Escape</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div style='text-align:center;font-size:12px'>Made with 💜 — Dashboard by Kelompok Escape</div>", unsafe_allow_html=True)
+
+if PROFIL_RERUN:
+    latensi = st.session_state.setdefault("latensi_rerun", {})
+    latensi["skrip penuh"] = (time.perf_counter() - _awal_rerun) * 1000
+    with st.sidebar.expander("⏱️ Latensi rerun (ms)"):
+        st.dataframe(pd.Series(latensi, name="ms").round(1), use_container_width=True)
@@ -0,0 +1,93 @@
+import glob
+import hashlib
+import os
+import pickle
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX opsional; CSV dan Parquet tetap tersedia
+    Workbook = None
+
+DIR_UNDUHAN = os.path.join("static", "unduhan")
+UKURAN_CHUNK = 50_000
+UMUR_MIN_HAPUS = 10 * 60  # detik; file ekspor yang lebih baru dari ini tidak pernah dihapus
+
+
+def _potongan(df, ukuran_chunk):
+    for mulai in range(0, max(len(df), 1), ukuran_chunk):
+        yield df.iloc[mulai:mulai + ukuran_chunk]
+
+
+def tulis_csv(df, f, ukuran_chunk=UKURAN_CHUNK):
+    for i, potongan in enumerate(_potongan(df, ukuran_chunk)):
+        potongan.to_csv(f, header=i == 0, index=False)
+
+
+def tulis_parquet(df, f, ukuran_chunk=UKURAN_CHUNK):
+    # skema diambil dari seluruh tabel supaya potongan yang isinya NaN semua tidak mengubah tipe kolom
+    skema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(f, skema) as penulis:
+        for potongan in _potongan(df, ukuran_chunk):
+            penulis.write_table(pa.Table.from_pandas(potongan, schema=skema, preserve_index=False))
+
+
+def tulis_xlsx(df, f, ukuran_chunk=UKURAN_CHUNK):
+    # write_only: baris langsung ditulis ke file sementara openpyxl, tidak disimpan sebagai objek sel
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Data")
+    ws.append([str(c) for c in df.columns])
+    for potongan in _potongan(df, ukuran_chunk):
+        for baris in potongan.astype(object).where(potongan.notna(), None).itertuples(index=False, name=None):
+            ws.append(baris)
+    wb.save(f)
+
+
+# label -> (ekstensi, fungsi penulis); XLSX hanya ada jika openpyxl terpasang
+FORMAT = {"CSV": (".csv", tulis_csv), "Parquet": (".parquet", tulis_parquet)}
+if Workbook is not None:
+    FORMAT["XLSX"] = (".xlsx", tulis_xlsx)
+
+
+def nama_file_ekspor(versi, kunci, format_):
+    isi = pickle.dumps(kunci, protocol=4)
+    return f"{versi}_{hashlib.sha256(isi).hexdigest()[:20]}{FORMAT[format_][0]}"
+
+
+def _bersihkan_versi_lama(direktori, versi_disimpan):
+    # hanya file selesai dari versi yang tidak lagi dilayani; file .tmp milik penulis lain dan file yang
+    # baru ditulis (tautannya mungkin masih tampil di sesi yang belum rerun ke versi baru) dibiarkan
+    batas_waktu = time.time() - UMUR_MIN_HAPUS
+    for lama in glob.glob(os.path.join(direktori, "*")):
+        nama = os.path.basename(lama)
+        if nama.endswith(".tmp") or nama.split("_")[0].split("-")[0] in versi_disimpan:
+            continue
+        try:
+            if os.path.getmtime(lama) < batas_waktu:
+                os.remove(lama)
+        except FileNotFoundError:
+            pass
+
+
+def siapkan_ekspor(versi, kunci, format_, buat_df, direktori=DIR_UNDUHAN, versi_dipakai=()):
+    """Tulis tabel ke file di folder unduhan (sekali per versi data + kunci) dan kembalikan path-nya.
+
+    buat_df baru dipanggil jika file belum ada. File versi data lama dihapus supaya folder
+    tidak terus membesar; versi ini, versi_dipakai (mis. versi aktif dan yang sedang dipanaskan)
+    dan versi turunannya ("<hash>-<varian>") dibiarkan.
+    """
+    os.makedirs(direktori, exist_ok=True)
+    path = os.path.join(direktori, nama_file_ekspor(versi, kunci, format_))
+    if os.path.exists(path):
+        return path
+
+    _bersihkan_versi_lama(direktori, {v.split("-")[0] for v in (versi, *versi_dipakai) if v})
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        FORMAT[format_][1](buat_df(), f)
+    os.replace(tmp, path)
+    return path
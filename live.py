@@ -0,0 +1,293 @@
+import glob
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning import deduplikasi, kompilasi_skema
+
+# skema dikompilasi sekali per proses; setiap poll hanya menjalankan operasi blok
+proses_respons = kompilasi_skema()
+
+KOLOM_NUMERIK_LIVE = [
+    "Tingkat Kepuasan",
+    "Tingkat Kesulitan Mata Kuliah",
+    "Tinggi Motivasi",
+    "Jumlah Mata Kuliah Sesuai Minat",
+    "Jumlah Stress dalam Seminggu",
+    "Jumlah Mata Kuliah untuk Karier",
+]
+
+KOLOM_KATEGORI_LIVE = [
+    "Fakultas",
+    "Program Studi",
+    "Keinginan Pindah Jurusan",
+    "Relevansi Kurikulum Jurusan dengan Dunia Kerja",
+    "Kesesuaian Jurusan dengan Minat",
+    "Penilaian Prospek Kerja Jurusan",
+]
+
+
+def _akhir_record(raw, pertama=False):
+    # posisi setelah newline terakhir (atau pertama) yang berada di luar tanda kutip,
+    # karena jawaban Google Form boleh berisi baris baru di dalam sel
+    if pertama:
+        pos = raw.find(b"\n")
+        while pos >= 0 and raw.count(b'"', 0, pos) % 2:
+            pos = raw.find(b"\n", pos + 1)
+        return pos + 1 if pos >= 0 else 0
+
+    pos = raw.rfind(b"\n")
+    while pos >= 0 and raw.count(b'"', 0, pos) % 2:
+        pos = raw.rfind(b"\n", 0, pos)
+    return pos + 1 if pos >= 0 else 0
+
+
+class PembacaTail:
+    """Membaca hanya byte baru dari file export (append-only) atau file-file di folder drop."""
+
+    def __init__(self, sumber, dari_awal=False):
+        self.sumber = sumber
+        self.posisi = {}  # path -> (offset byte, header)
+        if not dari_awal:
+            for path in self._daftar_file():
+                self.posisi[path] = self._posisi_akhir(path)
+
+    def _daftar_file(self):
+        if os.path.isdir(self.sumber):
+            return sorted(glob.glob(os.path.join(self.sumber, "*.csv")))
+        return [self.sumber] if os.path.exists(self.sumber) else []
+
+    def _posisi_akhir(self, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        header_len = _akhir_record(raw, pertama=True)
+        return header_len + _akhir_record(raw[header_len:]), raw[:header_len]
+
+    def baca_baru(self):
+        potongan = []
+        for path in self._daftar_file():
+            offset, header = self.posisi.get(path, (0, b""))
+            with open(path, "rb") as f:
+                f.seek(offset)
+                raw = f.read()
+            if not raw:
+                continue
+
+            if not header:
+                header_len = _akhir_record(raw, pertama=True)
+                if header_len == 0:
+                    continue
+                header, raw, offset = raw[:header_len], raw[header_len:], offset + header_len
+
+            # record terakhir yang belum lengkap ditunggu sampai poll berikutnya
+            selesai = _akhir_record(raw)
+            self.posisi[path] = (offset + selesai, header)
+            if selesai:
+                potongan.append(pd.read_csv(io.BytesIO(header + raw[:selesai])))
+
+        return pd.concat(potongan, ignore_index=True) if potongan else pd.DataFrame()
+
+
+class AgregatInkremental:
+    """Jumlah, rata-rata, cross-product dan frekuensi yang diperbarui per batch baris baru."""
+
+    def __init__(self, kolom_numerik=KOLOM_NUMERIK_LIVE, kolom_kategori=KOLOM_KATEGORI_LIVE, kolom_grup="Program Studi"):
+        self.kolom_numerik = list(kolom_numerik)
+        self.kolom_kategori = list(kolom_kategori)
+        self.kolom_grup = kolom_grup
+        p = len(self.kolom_numerik)
+
+        self.n = 0
+        self.n_kolom = np.zeros(p)
+        self.jumlah = np.zeros(p)
+        # cross-product hanya dari baris lengkap, untuk korelasi/regresi
+        self.n_lengkap = 0
+        self.jumlah_lengkap = np.zeros(p)
+        self.crossprod = np.zeros((p, p))
+        self.frekuensi = {c: pd.Series(dtype="int64") for c in self.kolom_kategori}
+        self.grup_jumlah = pd.DataFrame(columns=self.kolom_numerik, dtype=float)
+        self.grup_hitung = pd.DataFrame(columns=self.kolom_numerik, dtype=float)
+        self.versi = 0
+        self._lock = threading.Lock()
+
+    def tambah(self, df, tanda=1):
+        # tanda=-1 mengeluarkan baris yang sebelumnya ditambahkan (mis. submisi lama yang digantikan)
+        if df.empty:
+            return
+        num = df.reindex(columns=self.kolom_numerik).apply(pd.to_numeric, errors="coerce")
+        X = num.to_numpy(dtype=float)
+        lengkap = X[~np.isnan(X).any(axis=1)]
+
+        grup = num.groupby(df[self.kolom_grup]) if self.kolom_grup in df.columns else None
+        with self._lock:
+            self.n += tanda * len(df)
+            self.n_kolom += tanda * (~np.isnan(X)).sum(axis=0)
+            self.jumlah += tanda * np.nansum(X, axis=0)
+            self.n_lengkap += tanda * len(lengkap)
+            self.jumlah_lengkap += tanda * lengkap.sum(axis=0)
+            self.crossprod += tanda * (lengkap.T @ lengkap)
+
+            for c in self.kolom_kategori:
+                if c in df.columns:
+                    frekuensi = self.frekuensi[c].add(tanda * df[c].value_counts(), fill_value=0).astype("int64")
+                    self.frekuensi[c] = frekuensi[frekuensi != 0]
+            if grup is not None:
+                self.grup_jumlah = self.grup_jumlah.add(tanda * grup.sum(), fill_value=0)
+                self.grup_hitung = self.grup_hitung.add(tanda * grup.count(), fill_value=0)
+            self.versi += 1
+
+    def kurangi(self, df):
+        self.tambah(df, tanda=-1)
+
+    def rata_rata(self):
+        with self._lock:
+            return pd.Series(self.jumlah / np.maximum(self.n_kolom, 1), index=self.kolom_numerik)
+
+    def rata_rata_grup(self, kolom):
+        with self._lock:
+            return (self.grup_jumlah[kolom] / self.grup_hitung[kolom]).dropna()
+
+    def korelasi(self):
+        with self._lock:
+            n = self.n_lengkap
+            mean = self.jumlah_lengkap / max(n, 1)
+            cov = self.crossprod - n * np.outer(mean, mean)
+        sd = np.sqrt(np.clip(np.diag(cov), 1e-12, None))
+        return pd.DataFrame(cov / np.outer(sd, sd), index=self.kolom_numerik, columns=self.kolom_numerik)
+
+
+class AgregatWaktu:
+    """Jumlah respons dan total nilai per hari dan per minggu untuk setiap grup, diperbarui per batch."""
+
+    def __init__(self, kolom_waktu="Timestamp", kolom_grup="Fakultas", kolom_nilai="Tingkat Kepuasan"):
+        self.kolom_waktu = kolom_waktu
+        self.kolom_grup = kolom_grup
+        self.kolom_nilai = kolom_nilai
+        # index (Periode, grup), kolom: Jumlah, Total, N Nilai
+        self.ember = {"harian": None, "mingguan": None}
+        self.versi = 0
+        self._lock = threading.Lock()
+
+    def tambah(self, df, tanda=1):
+        if df.empty or self.kolom_waktu not in df.columns:
+            return
+        waktu = pd.to_datetime(df[self.kolom_waktu], errors="coerce")
+        ada = waktu.notna()
+        if not ada.any():
+            return
+
+        tanggal = waktu[ada].dt.normalize()
+        nilai = pd.to_numeric(df.loc[ada, self.kolom_nilai], errors="coerce")
+        grup = df.loc[ada, self.kolom_grup].fillna("Tidak Diketahui").rename(self.kolom_grup)
+        isi = tanda * pd.DataFrame({"Jumlah": 1, "Total": nilai.fillna(0), "N Nilai": nilai.notna().astype(int)}, index=nilai.index)
+        periode = {
+            "harian": tanggal,
+            "mingguan": tanggal - pd.to_timedelta(tanggal.dt.weekday, unit="D"),  # Senin awal minggu
+        }
+
+        # hanya batch baru yang di-groupby; hasilnya dijumlahkan ke ember yang sudah ada
+        batch = {nama: isi.groupby([p.rename("Periode"), grup]).sum() for nama, p in periode.items()}
+        with self._lock:
+            for nama, b in batch.items():
+                lama = self.ember[nama]
+                self.ember[nama] = b if lama is None else lama.add(b, fill_value=0)
+            self.versi += 1
+
+    def kurangi(self, df):
+        self.tambah(df, tanda=-1)
+
+    def tren(self, periode="harian", jendela=1):
+        """Tabel panjang Periode × grup (+ 'Semua') berisi Jumlah dan rata-rata nilai, opsional rolling."""
+        with self._lock:
+            ember = self.ember[periode]
+        if ember is None:
+            return pd.DataFrame(columns=["Periode", self.kolom_grup, "Jumlah", f"Rata-rata {self.kolom_nilai}"])
+
+        lebar = ember.unstack(self.kolom_grup, fill_value=0).sort_index()
+        rentang = pd.date_range(lebar.index.min(), lebar.index.max(), freq="D" if periode == "harian" else "W-MON")
+        lebar = lebar.reindex(rentang, fill_value=0)
+        for kolom in ("Jumlah", "Total", "N Nilai"):
+            lebar[(kolom, "Semua")] = lebar[kolom].sum(axis=1)
+        if jendela > 1:
+            lebar = lebar.rolling(jendela, min_periods=1).sum()
+
+        panjang = lebar.stack(self.kolom_grup, future_stack=True).rename_axis(["Periode", self.kolom_grup]).reset_index()
+        panjang[f"Rata-rata {self.kolom_nilai}"] = panjang["Total"] / panjang["N Nilai"].where(panjang["N Nilai"] > 0)
+        return panjang.drop(columns=["Total", "N Nilai"])
+
+
+class DedupLive:
+    """Satu baris terpilih per responden untuk sebuah agregat, dengan kebijakan yang sama seperti cleaning.py.
+
+    Submisi ulang yang menggantikan baris lama (kebijakan 'terbaru') mengeluarkan baris lama dari agregat
+    sebelum baris baru dimasukkan, jadi angka live tetap sama dengan dataset hasil cleaning.
+    """
+
+    def __init__(self, agregat, kebijakan="terbaru"):
+        self.agregat = agregat
+        self.kebijakan = kebijakan
+        self.terpilih = None  # baris terpilih + kolom _kunci dan _baris
+        self._baris_berikut = 0
+
+    def tambah(self, df):
+        # kembalikan jumlah submisi yang digabung dengan responden yang sudah ada
+        if df.empty:
+            return 0
+        df = df.assign(_baris=np.arange(self._baris_berikut, self._baris_berikut + len(df)))
+        self._baris_berikut += len(df)
+        lama = self.terpilih
+        self.terpilih, laporan = deduplikasi(df, lama, self.kebijakan)
+
+        dipakai = self.terpilih["_baris"]
+        if lama is not None:
+            self.agregat.kurangi(lama[~lama["_baris"].isin(dipakai)])
+        self.agregat.tambah(df[df["_baris"].isin(dipakai)])
+        return len(laporan)
+
+
+class IngestLive:
+    """Tail sumber export, jalankan aturan cleaning dan deduplikasi, lalu lipat ke agregat."""
+
+    def __init__(self, sumber, agregat, agregat_waktu=None, dari_awal=False, data_awal=None, kebijakan="terbaru"):
+        # agregat waktu butuh riwayat Timestamp yang tidak ada di dataset dashboard,
+        # jadi isi export yang sudah ada dibaca sekali lalu tail dilanjutkan dari posisi itu
+        self.pembaca = PembacaTail(sumber, dari_awal=dari_awal or agregat_waktu is not None)
+        self.dedup = DedupLive(agregat, kebijakan)
+        self.dedup_waktu = DedupLive(agregat_waktu, kebijakan) if agregat_waktu is not None else None
+        self.agregat = agregat
+        self.agregat_waktu = agregat_waktu
+        self.total_baru = 0
+        self.total_karantina = 0
+        self.total_duplikat = 0
+        self.poll_terakhir = None
+        self._lock = threading.Lock()
+        if data_awal is not None:
+            # dataset hasil cleaning.py sudah unik per responden; dimasukkan lewat dedup supaya kuncinya tercatat
+            self.dedup.tambah(data_awal)
+        if agregat_waktu is not None and not dari_awal:
+            riwayat = self.pembaca.baca_baru()
+            if not riwayat.empty:
+                self.dedup_waktu.tambah(self._bersihkan(riwayat)[0])
+
+    def _bersihkan(self, raw):
+        valid, karantina, _ = proses_respons(raw)
+        return valid, karantina
+
+    def poll(self):
+        # satu proses dashboard bisa punya banyak sesi; hanya satu yang membaca file pada satu waktu
+        with self._lock:
+            raw = self.pembaca.baca_baru()
+            self.poll_terakhir = time.time()
+            if raw.empty:
+                return 0
+            valid, karantina = self._bersihkan(raw)
+            self.total_duplikat += self.dedup.tambah(valid)
+            if self.dedup_waktu is not None:
+                self.dedup_waktu.tambah(valid)
+            self.total_baru += len(valid)
+            self.total_karantina += len(karantina)
+            return len(valid)
@@ -0,0 +1,253 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from sklearn.cluster import KMeans
+from sklearn.decomposition import FactorAnalysis, IncrementalPCA
+from sklearn.preprocessing import StandardScaler
+
+VERSI_FORMAT = 1
+DIR_ARTEFAK = "artefak_model"
+
+KOLOM_KLASTER = [
+    "Tingkat Kepuasan",
+    "Tingkat Kesulitan Mata Kuliah",
+    "Tinggi Motivasi",
+    "Jumlah Mata Kuliah Sesuai Minat",
+    "Jumlah Stress dalam Seminggu",
+]
+UKURAN_BATCH_PCA = 10_000
+DEP_VAR = "Tingkat Kepuasan"
+INDEP_VARS = ["Tingkat Kesulitan Mata Kuliah", "Tinggi Motivasi", "Jumlah Mata Kuliah Sesuai Minat", "Jumlah Stress dalam Seminggu"]
+
+
+def fit_klaster(X, n_clusters=3):
+    # dipakai dashboard dan artefak, supaya klaster yang disimpan sama dengan yang ditampilkan
+    scaler = StandardScaler().fit(X)
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit(scaler.transform(X))
+    return scaler, kmeans
+
+
+def _standar(X):
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    return mean, np.where(scale > 0, scale, 1.0)
+
+
+def _proyeksi_linear(mean_pca, bobot, mean, scale):
+    # skor = ((X - mean)/scale - mean_pca) @ bobot  ->  X @ W + b, jadi respons baru cukup satu perkalian matriks
+    W = bobot / scale[:, None]
+    b = -(mean / scale + mean_pca) @ bobot
+    return W, b
+
+
+def fit_pca(X, ukuran_batch=UKURAN_BATCH_PCA):
+    """PCA atas item terstandar, di-fit per mini-batch (IncrementalPCA) sehingga memori tetap kecil.
+
+    Mengembalikan dict array (tanpa objek sklearn): muatan (komponen × item), rasio varians
+    yang dijelaskan, serta W dan b untuk proyeksi(model, X).
+    """
+    X = np.asarray(X, dtype=float)
+    mean, scale = _standar(X)
+    p = X.shape[1]
+    # potongan terakhir digabung ke sebelumnya: setiap partial_fit butuh baris >= jumlah komponen
+    n_batch = max(1, len(X) // max(ukuran_batch, p))
+    pca = IncrementalPCA(n_components=p)
+    for batch in np.array_split(X, n_batch):
+        pca.partial_fit((batch - mean) / scale)
+    W, b = _proyeksi_linear(pca.mean_, pca.components_.T, mean, scale)
+    return {
+        "metode": "PCA",
+        "muatan": pca.components_ * np.sqrt(pca.explained_variance_)[:, None],
+        "rasio_varians": pca.explained_variance_ratio_,
+        "W": W,
+        "b": b,
+    }
+
+
+def fit_analisis_faktor(X, n_faktor=2, rotasi="varimax"):
+    """Analisis faktor (maximum likelihood) atas item terstandar; format hasil sama dengan fit_pca."""
+    X = np.asarray(X, dtype=float)
+    mean, scale = _standar(X)
+    fa = FactorAnalysis(n_components=n_faktor, rotation=rotasi, random_state=42).fit((X - mean) / scale)
+    # skor faktor sklearn = (X - mean) Ψ⁻¹Λᵀ (I + ΛΨ⁻¹Λᵀ)⁻¹, linear dalam X
+    L = fa.components_
+    L_psi = L / fa.noise_variance_
+    bobot = L_psi.T @ np.linalg.inv(np.eye(n_faktor) + L_psi @ L.T)
+    # item terstandar: varians total = jumlah item, varians faktor = jumlah kuadrat muatannya;
+    # setelah rotasi urutan faktor diacak, jadi diurutkan ulang dari yang terbesar
+    rasio = (L ** 2).sum(axis=1) / X.shape[1]
+    urutan = np.argsort(-rasio)
+    W, b = _proyeksi_linear(fa.mean_, bobot[:, urutan], mean, scale)
+    return {
+        "metode": "Analisis Faktor",
+        "muatan": L[urutan],
+        "rasio_varians": rasio[urutan],
+        "W": W,
+        "b": b,
+    }
+
+
+def proyeksi(model, X):
+    return np.asarray(X, dtype=float) @ model["W"] + model["b"]
+
+
+def buat_artefak(scaler, kmeans, kolom_klaster, model_ols, dep_var, versi_data=None):
+    """Simpan parameter model yang sudah di-fit sebagai dict JSON (tanpa objek sklearn/statsmodels)."""
+    koef = model_ols.params
+    return {
+        "versi_format": VERSI_FORMAT,
+        "versi_data": versi_data,
+        "dibuat": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "klaster": {
+            "kolom": list(kolom_klaster),
+            "mean": scaler.mean_.tolist(),
+            "scale": scaler.scale_.tolist(),
+            "centroid": kmeans.cluster_centers_.tolist(),
+        },
+        "regresi": {
+            "dep_var": dep_var,
+            "kolom": [c for c in koef.index if c != "const"],
+            "intercept": float(koef.get("const", 0.0)),
+            "koef": [float(koef[c]) for c in koef.index if c != "const"],
+            "r2": float(model_ols.rsquared),
+        },
+    }
+
+
+def simpan_artefak(artefak, direktori=DIR_ARTEFAK):
+    os.makedirs(direktori, exist_ok=True)
+    path = os.path.join(direktori, f"model_{artefak['versi_data'] or 'manual'}.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(artefak, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    return path
+
+
+def muat_artefak(path=DIR_ARTEFAK):
+    # path boleh berupa file artefak atau folder (diambil artefak terbaru)
+    if os.path.isdir(path):
+        kandidat = glob.glob(os.path.join(path, "model_*.json"))
+        if not kandidat:
+            raise FileNotFoundError(f"Belum ada artefak model di '{path}'")
+        path = max(kandidat, key=os.path.getmtime)
+    with open(path, encoding="utf-8") as f:
+        artefak = json.load(f)
+    if artefak.get("versi_format") != VERSI_FORMAT:
+        raise ValueError(f"Format artefak {artefak.get('versi_format')} tidak didukung (butuh {VERSI_FORMAT})")
+    return artefak
+
+
+class Penilai:
+    """Memberi label klaster dan prediksi kepuasan untuk batch respons baru, tanpa fit ulang."""
+
+    def __init__(self, artefak):
+        self.artefak = artefak
+        k, r = artefak["klaster"], artefak["regresi"]
+        self.kolom_klaster = k["kolom"]
+        self.mean = np.asarray(k["mean"])
+        self.scale = np.asarray(k["scale"])
+        self.centroid = np.asarray(k["centroid"])
+        self.dep_var = r["dep_var"]
+        self.kolom_regresi = r["kolom"]
+        self.intercept = r["intercept"]
+        self.koef = np.asarray(r["koef"])
+
+    def skor(self, df):
+        X = df.reindex(columns=self.kolom_klaster).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        Xs = (X - self.mean) / self.scale
+        jarak = ((Xs[:, None, :] - self.centroid[None, :, :]) ** 2).sum(axis=2)
+        klaster = np.where(np.isnan(X).any(axis=1), -1, np.argmin(np.nan_to_num(jarak, nan=np.inf), axis=1))
+
+        Xr = df.reindex(columns=self.kolom_regresi).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        prediksi = self.intercept + Xr @ self.koef
+
+        # -1 = klaster tidak bisa ditentukan karena ada jawaban kosong
+        return pd.DataFrame({"Cluster": klaster, f"Prediksi {self.dep_var}": prediksi}, index=df.index)
+
+
+def latih_dari_csv(path, n_clusters=3, dep_var=DEP_VAR, indep_vars=INDEP_VARS, kolom_klaster=KOLOM_KLASTER):
+    with open(path, "rb") as f:
+        versi = hashlib.sha1(f.read()).hexdigest()[:12]
+    df = pd.read_csv(path)
+    X = df[kolom_klaster].dropna()
+    scaler, kmeans = fit_klaster(X, n_clusters)
+    model_df = df[[dep_var] + list(indep_vars)].dropna()
+    model = sm.OLS(model_df[dep_var], sm.add_constant(model_df[list(indep_vars)])).fit()
+    return buat_artefak(scaler, kmeans, kolom_klaster, model, dep_var, versi)
+
+
+def buat_handler(penilai):
+    class Handler(BaseHTTPRequestHandler):
+        def _kirim(self, kode, isi):
+            body = json.dumps(isi, ensure_ascii=False).encode("utf-8")
+            self.send_response(kode)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/info":
+                a = penilai.artefak
+                self._kirim(200, {k: a[k] for k in ("versi_format", "versi_data", "dibuat")})
+            else:
+                self._kirim(404, {"error": "endpoint tidak ditemukan"})
+
+        def do_POST(self):
+            # body: list record JSON dengan nama kolom dashboard
+            if self.path != "/skor":
+                self._kirim(404, {"error": "endpoint tidak ditemukan"})
+                return
+            try:
+                panjang = int(self.headers.get("Content-Length", 0))
+                df = pd.DataFrame.from_records(json.loads(self.rfile.read(panjang)))
+            except (ValueError, TypeError) as e:
+                self._kirim(400, {"error": f"body tidak valid: {e}"})
+                return
+            hasil = penilai.skor(df)
+            self._kirim(200, json.loads(hasil.to_json(orient="records")))
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Artefak model dan layanan scoring respons baru")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    latih = sub.add_parser("latih", help="fit klaster + regresi dari CSV lalu simpan artefak")
+    latih.add_argument("--input", default="AnalisisKepuasan_terakhir.csv")
+    latih.add_argument("--klaster", type=int, default=3)
+    latih.add_argument("--output", default=DIR_ARTEFAK)
+    skor = sub.add_parser("skor", help="beri skor file CSV respons")
+    skor.add_argument("input")
+    skor.add_argument("--artefak", default=DIR_ARTEFAK)
+    skor.add_argument("--output", default=None)
+    layani = sub.add_parser("layani", help="jalankan endpoint HTTP POST /skor")
+    layani.add_argument("--artefak", default=DIR_ARTEFAK)
+    layani.add_argument("--host", default="127.0.0.1")
+    layani.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+
+    if args.perintah == "latih":
+        path = simpan_artefak(latih_dari_csv(args.input, n_clusters=args.klaster), args.output)
+        print(f"✅ Artefak model disimpan di '{path}'")
+    elif args.perintah == "skor":
+        df = pd.read_csv(args.input)
+        hasil = df.join(Penilai(muat_artefak(args.artefak)).skor(df))
+        if args.output:
+            hasil.to_csv(args.output, index=False)
+            print(f"✅ {len(hasil)} respons diberi skor -> '{args.output}'")
+        else:
+            print(hasil.to_string())
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), buat_handler(Penilai(muat_artefak(args.artefak))))
+        print(f"🚀 Layanan scoring berjalan di http://{args.host}:{args.port} (POST /skor, GET /info)")
+        server.serve_forever()
@@ -0,0 +1,191 @@
+import argparse
+import hashlib
+import io
+import os
+import queue
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa file lock, pembangunan ulang bersamaan tidak saling ditunggu
+    fcntl = None
+
+TABEL = "respons"
+KOLOM_INDEKS = ["Program Studi", "Fakultas", "Angkatan", "Gelombang"]
+
+
+def _q(kolom):
+    # nama kolom berasal dari kode (bukan input bebas), cukup di-quote untuk SQL
+    return '"' + kolom.replace('"', '""') + '"'
+
+
+def versi_isi(isi):
+    """Versi data = hash isi file CSV; kunci yang sama dipakai dashboard untuk cache dan snapshot."""
+    return hashlib.sha1(isi).hexdigest()[:12]
+
+
+@contextmanager
+def _kunci_store(path):
+    # satu penulis per file store, termasuk dari proses dashboard lain dan CLI
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a+b") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _tulis_store(df, path, gelombang, ganti, versi):
+    df = df.assign(Gelombang=gelombang)
+    if ganti:
+        # file sementara unik per pemanggil, jadi dua pembangunan ulang tidak menulis ke file yang sama
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        os.close(fd)
+    else:
+        tmp = path
+
+    try:
+        con = sqlite3.connect(tmp)
+        try:
+            df.to_sql(TABEL, con, if_exists="replace" if ganti else "append", index=False)
+            for kolom in KOLOM_INDEKS:
+                nama = "idx_" + kolom.lower().replace(" ", "_")
+                con.execute(f"CREATE INDEX IF NOT EXISTS {nama} ON {TABEL} ({_q(kolom)})")
+            con.execute("CREATE TABLE IF NOT EXISTS meta (kunci TEXT PRIMARY KEY, nilai TEXT)")
+            con.execute("INSERT OR REPLACE INTO meta VALUES ('versi', ?)", (versi,))
+            con.execute("ANALYZE")
+            con.commit()
+        finally:
+            con.close()
+        # diganti secara atomik supaya pembaca tidak pernah melihat file setengah jadi
+        if ganti:
+            os.replace(tmp, path)
+    except BaseException:
+        if ganti and os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def buat_store(df, path, gelombang=1, ganti=True, versi=None):
+    """Tulis respons yang sudah dibersihkan ke SQLite beserta indeks untuk kolom filter/grup.
+
+    versi = versi_isi() file sumber; dengan ganti=False (gelombang baru) versi store ikut berganti
+    ke file yang terakhir dimuat, jadi dashboard yang membaca file itu memakai store berisi semua gelombang.
+    """
+    with _kunci_store(path):
+        _tulis_store(df, path, gelombang, ganti, versi)
+
+
+def perbarui_store(path, versi, muat):
+    """Bangun ulang store dari muat() hanya jika versinya tertinggal; pemanggil lain menunggu lalu memakai hasilnya."""
+    with _kunci_store(path):
+        if versi_store(path) != versi:
+            _tulis_store(muat(), path, gelombang=1, ganti=True, versi=versi)
+
+
+def versi_store(path):
+    # versi data yang terakhir dimuat; None jika store belum ada
+    if not os.path.exists(path):
+        return None
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = con.execute("SELECT nilai FROM meta WHERE kunci = 'versi'").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        con.close()
+    return row[0] if row else None
+
+
+class PoolKoneksi:
+    """Pool koneksi read-only ke satu versi store; satu pool per versi per proses dashboard."""
+
+    def __init__(self, path, ukuran=4, versi=None):
+        self.path = path
+        self.versi = versi
+        self._tertutup = False
+        self._pool = queue.Queue()
+        for _ in range(ukuran):
+            con = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            con.execute("PRAGMA query_only = ON")
+            self._pool.put(con)
+
+    @contextmanager
+    def koneksi(self):
+        while True:
+            if self._tertutup:
+                raise RuntimeError(f"Pool koneksi '{self.path}' versi {self.versi} sudah ditutup")
+            try:
+                con = self._pool.get(timeout=1)
+                break
+            except queue.Empty:
+                continue
+        try:
+            yield con
+        finally:
+            # koneksi yang sedang dipakai saat pool ditutup baru ditutup setelah query-nya selesai
+            if self._tertutup:
+                con.close()
+            else:
+                self._pool.put(con)
+
+    def tutup(self):
+        self._tertutup = True
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def query(self, sql, params=()):
+        with self.koneksi() as con:
+            return pd.read_sql_query(sql, con, params=params)
+
+
+def _where_prodi(prodi_terpilih):
+    if not prodi_terpilih:
+        return "", []
+    return f"WHERE {_q('Program Studi')} IN ({', '.join('?' * len(prodi_terpilih))})", list(prodi_terpilih)
+
+
+def rata_rata_per_grup(pool, kolom_grup, kolom_nilai, prodi_terpilih=()):
+    where, params = _where_prodi(prodi_terpilih)
+    sql = (f"SELECT {_q(kolom_grup)}, AVG({_q(kolom_nilai)}) AS {_q(kolom_nilai)} FROM {TABEL} {where} "
+           f"GROUP BY {_q(kolom_grup)} ORDER BY 2 DESC")
+    return pool.query(sql, params)
+
+
+def hitung_kategori(pool, kolom, prodi_terpilih=()):
+    where, params = _where_prodi(prodi_terpilih)
+    sql = (f"SELECT {_q(kolom)}, COUNT(*) AS Jumlah FROM {TABEL} {where} "
+           f"GROUP BY {_q(kolom)} ORDER BY Jumlah DESC")
+    return pool.query(sql, params)
+
+
+def crosstab(pool, kolom_list, prodi_terpilih=()):
+    where, params = _where_prodi(prodi_terpilih)
+    kolom_sql = ", ".join(_q(k) for k in kolom_list)
+    sql = f"SELECT {kolom_sql}, COUNT(*) AS Jumlah FROM {TABEL} {where} GROUP BY {kolom_sql}"
+    return pool.query(sql, params)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Muat respons yang sudah dibersihkan ke SQLite")
+    parser.add_argument("--input", default="AnalisisKepuasan_terakhir.csv")
+    parser.add_argument("--output", default="AnalisisKepuasan.sqlite")
+    parser.add_argument("--gelombang", type=int, default=1, help="nomor gelombang survei untuk baris yang dimuat")
+    parser.add_argument("--tambah", action="store_true", help="tambahkan ke database yang ada (gelombang baru)")
+    args = parser.parse_args()
+
+    with open(args.input, "rb") as f:
+        isi = f.read()
+    df = pd.read_csv(io.BytesIO(isi))
+    buat_store(df, args.output, gelombang=args.gelombang, ganti=not args.tambah, versi=versi_isi(isi))
+    print(f"✅ {len(df)} respons dimuat ke '{args.output}' (gelombang {args.gelombang})")
@@ -0,0 +1,290 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+from scipy import stats
+from statsmodels.stats.multitest import multipletests
+
+from analisis import (
+    bobot_raking,
+    cari_semua_subset,
+    cari_stepwise,
+    crossproduct_per_grup,
+    fit_dari_crossproduct,
+    fit_per_grup,
+    frekuensi_dua_kelompok,
+    koreksi_bh,
+    matriks_crossproduct,
+    shrinkage_bertingkat,
+    statistik_cukup,
+    uji_kategorik_dua_kelompok,
+    uji_numerik_dua_kelompok,
+)
+
+
+def data_regresi(n=200, p=4, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, p))
+    y = 1.5 + X @ np.arange(1, p + 1) * 0.5 + rng.normal(size=n)
+    return X, y
+
+
+# ---------------------------
+# PENCARIAN MODEL
+# ---------------------------
+@pytest.mark.parametrize("subset", [(0,), (1, 3), (0, 1, 2, 3)])
+def test_fit_dari_crossproduct_sama_dengan_statsmodels(subset):
+    X, y = data_regresi()
+    # kolom ke-2 berskala NPM: rata-rata besar, variasi kecil
+    X[:, 2] = 2.1e10 + X[:, 2]
+    acuan = sm.OLS(y, sm.add_constant(X[:, list(subset)] - X[:, list(subset)].mean(axis=0))).fit()
+
+    hasil = fit_dari_crossproduct(matriks_crossproduct(X, y), len(y), subset)
+
+    np.testing.assert_allclose(hasil["beta"][1:], acuan.params[1:], rtol=1e-8)
+    assert hasil["r2"] == pytest.approx(acuan.rsquared, rel=1e-10)
+    assert hasil["adj_r2"] == pytest.approx(acuan.rsquared_adj, rel=1e-10)
+    assert hasil["aic"] == pytest.approx(acuan.aic, rel=1e-10)
+    assert hasil["bic"] == pytest.approx(acuan.bic, rel=1e-10)
+
+
+def test_cari_semua_subset_mencakup_semua_kombinasi():
+    X, y = data_regresi(p=4)
+    hasil = [h for chunk in cari_semua_subset(matriks_crossproduct(X, y), len(y), 4, ukuran_chunk=3) for h in chunk]
+    assert len(hasil) == 2 ** 4 - 1
+    assert len({h["subset"] for h in hasil}) == len(hasil)
+
+    hasil = [h for chunk in cari_semua_subset(matriks_crossproduct(X, y), len(y), 4, max_prediktor=2) for h in chunk]
+    assert max(h["k"] for h in hasil) == 2
+
+
+def test_stepwise_forward_tanpa_sinyal_memilih_model_konstanta():
+    rng = np.random.default_rng(1)
+    X, y = rng.normal(size=(300, 5)), rng.normal(size=300)
+    langkah = list(cari_stepwise(matriks_crossproduct(X, y), len(y), 5, arah="forward", kriteria="bic"))
+    assert langkah == []
+
+
+@pytest.mark.parametrize("arah", ["forward", "backward"])
+def test_stepwise_menemukan_prediktor_yang_berpengaruh(arah):
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(500, 5))
+    y = 2 * X[:, 1] - 3 * X[:, 3] + rng.normal(size=500)
+    langkah = list(cari_stepwise(matriks_crossproduct(X, y), len(y), 5, arah=arah, kriteria="bic"))
+    assert langkah[-1][0]["subset"] == (1, 3)
+
+
+def test_crossproduct_berbobot_sama_dengan_wls():
+    X, y = data_regresi(seed=3)
+    w = np.random.default_rng(3).uniform(0.2, 3, len(y))
+    acuan = sm.WLS(y, sm.add_constant(X), weights=w).fit()
+
+    hasil = fit_dari_crossproduct(matriks_crossproduct(X, y, bobot=w), len(y), range(X.shape[1]))
+
+    np.testing.assert_allclose(hasil["beta"], acuan.params, rtol=1e-9)
+    assert hasil["r2"] == pytest.approx(acuan.rsquared, rel=1e-10)
+
+
+# ---------------------------
+# REGRESI PER GRUP
+# ---------------------------
+def data_per_grup(seed=4):
+    rng = np.random.default_rng(seed)
+    kode = np.repeat(np.arange(4), [40, 25, 60, 30])
+    X = rng.normal(size=(len(kode), 3)) + kode[:, None]
+    # NPM: ~2e10 dengan variasi kecil di dalam grup
+    X[:, 2] = 2.2e10 + kode * 1e6 + rng.integers(0, 500, len(kode))
+    y = 3 + X[:, 0] - 2 * X[:, 1] + 0.01 * (X[:, 2] - 2.2e10 - kode * 1e6) + kode + rng.normal(size=len(kode))
+    return X, y, kode
+
+
+@pytest.mark.parametrize("berbobot", [False, True])
+def test_fit_per_grup_sama_dengan_statsmodels(berbobot):
+    X, y, kode = data_per_grup()
+    w = np.random.default_rng(5).uniform(0.3, 2.5, len(y)) if berbobot else None
+
+    hasil = fit_per_grup(*crossproduct_per_grup(X, y, kode, 4, bobot=w))
+
+    for g in range(4):
+        m = kode == g
+        # acuan dipusatkan dulu: pinv statsmodels kehilangan presisi pada kolom ~1e10 yang tidak dipusatkan
+        Xg = X[m] - X[m].mean(axis=0)
+        model = sm.WLS(y[m], sm.add_constant(Xg), weights=w[m]) if berbobot else sm.OLS(y[m], sm.add_constant(Xg))
+        acuan = model.fit()
+        intercept = acuan.params[0] - X[m].mean(axis=0) @ acuan.params[1:]
+        np.testing.assert_allclose(hasil["beta"][g, 1:], acuan.params[1:], rtol=1e-7)
+        np.testing.assert_allclose(hasil["se"][g, 1:], acuan.bse[1:], rtol=1e-7)
+        np.testing.assert_allclose(hasil["p_value"][g, 1:], acuan.pvalues[1:], rtol=1e-6, atol=1e-300)
+        assert hasil["beta"][g, 0] == pytest.approx(intercept, rel=1e-6)
+        assert hasil["r2"][g] == pytest.approx(acuan.rsquared, rel=1e-9)
+        assert hasil["n"][g] == m.sum()
+        np.testing.assert_allclose(hasil["bawah"][g, 1:], acuan.conf_int()[1:, 0], rtol=1e-7)
+
+
+def test_fit_per_grup_grup_kecil_atau_kolinear_bernilai_nan():
+    X, y, kode = data_per_grup()
+    kode = kode.copy()
+    kode[:3] = 4  # grup 4: 3 baris untuk 3 prediktor, tidak ada derajat bebas sisa
+    m = kode == 1
+    X[m, 1] = 2 * X[m, 0] + 1  # grup 1: prediktor kolinear sempurna
+
+    hasil = fit_per_grup(*crossproduct_per_grup(X, y, kode, 6))
+
+    assert np.isnan(hasil["beta"][[1, 4, 5]]).all()
+    assert np.isnan(hasil["se"][[1, 4, 5]]).all()
+    assert np.isfinite(hasil["beta"][[0, 2, 3]]).all()
+
+
+# ---------------------------
+# BOBOT RAKING
+# ---------------------------
+def proporsi_berbobot(kode, w, k):
+    ada = kode >= 0
+    return np.bincount(kode[ada], weights=w[ada], minlength=k) / w[ada].sum()
+
+
+def test_bobot_raking_mencapai_semua_margin():
+    rng = np.random.default_rng(6)
+    # sampel timpang terhadap populasi pada dua margin yang saling berkorelasi
+    fakultas = rng.choice(3, 1000, p=[0.6, 0.3, 0.1])
+    angkatan = (fakultas + rng.choice(4, 1000)) % 4
+    target_fakultas, target_angkatan = [0.3, 0.3, 0.4], [10, 20, 30, 40]
+
+    w, iterasi, konvergen, selisih = bobot_raking([fakultas, angkatan], [target_fakultas, target_angkatan])
+
+    assert konvergen and iterasi < 200
+    assert w.mean() == pytest.approx(1)
+    np.testing.assert_allclose(proporsi_berbobot(fakultas, w, 3), target_fakultas, atol=1e-6)
+    np.testing.assert_allclose(proporsi_berbobot(angkatan, w, 4), np.array(target_angkatan) / 100, atol=1e-6)
+    assert selisih < 1e-6
+
+
+def test_bobot_raking_kode_kosong_dan_kategori_tanpa_responden():
+    rng = np.random.default_rng(7)
+    kode = rng.choice([-1, 0, 1], 500, p=[0.1, 0.7, 0.2])
+    # kategori 2 tidak punya responden: targetnya dibuang dan sisanya dinormalisasi ulang
+    w, _, konvergen, _ = bobot_raking([kode], [[1, 1, 2]])
+
+    assert konvergen
+    np.testing.assert_allclose(proporsi_berbobot(kode, w, 3), [0.5, 0.5, 0], atol=1e-9)
+    assert w[kode == -1].mean() == pytest.approx(w[kode == -1][0])
+
+
+def test_bobot_raking_dengan_batas_melaporkan_selisih_margin():
+    rng = np.random.default_rng(8)
+    kode = rng.choice(2, 1000, p=[0.95, 0.05])
+    w, _, _, selisih = bobot_raking([kode], [[0.5, 0.5]], batas=(0.5, 3))
+
+    aktual = np.abs(proporsi_berbobot(kode, w, 2) - [0.5, 0.5]).max()
+    assert selisih == pytest.approx(aktual)
+    assert selisih > 0.01
+    assert w.max() / w.min() <= 3 / 0.5 + 1e-9
+
+
+# ---------------------------
+# PERBANDINGAN DUA KELOMPOK
+# ---------------------------
+def test_koreksi_bh_sama_dengan_statsmodels():
+    rng = np.random.default_rng(9)
+    p = np.concatenate([rng.uniform(size=40), rng.uniform(0, 0.01, 10), [0.02, 0.02, 1.0]])
+    p[[3, 17]] = np.nan
+
+    q = koreksi_bh(p)
+
+    ada = ~np.isnan(p)
+    np.testing.assert_allclose(q[ada], multipletests(p[ada], method="fdr_bh")[1], rtol=1e-12)
+    assert np.isnan(q[~ada]).all()
+    assert np.isnan(koreksi_bh([np.nan, np.nan])).all()
+
+
+def test_uji_dua_kelompok_sama_dengan_scipy():
+    rng = np.random.default_rng(10)
+    grup = rng.choice([-1, 0, 1], 300, p=[0.1, 0.5, 0.4])
+    X = np.column_stack([rng.integers(1, 11, 300), rng.normal(size=300) + grup * 0.3, rng.integers(0, 4, 300)]).astype(float)
+    X[rng.uniform(size=X.shape) < 0.05] = np.nan
+
+    nilai, hitung = frekuensi_dua_kelompok(X, grup)
+    numerik = uji_numerik_dua_kelompok(nilai, hitung)
+    kategorik = uji_kategorik_dua_kelompok(hitung)
+
+    for j in range(X.shape[1]):
+        a, b = X[grup == 0, j], X[grup == 1, j]
+        a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+        welch = stats.ttest_ind(a, b, equal_var=False)
+        mwu = stats.mannwhitneyu(a, b, method="asymptotic", use_continuity=True)
+        tabel = np.array([[np.sum(a == v), np.sum(b == v)] for v in np.unique(np.concatenate([a, b]))]).T
+        chi2 = stats.chi2_contingency(tabel, correction=False)
+
+        assert numerik["t"][j] == pytest.approx(welch.statistic, rel=1e-9)
+        assert numerik["p_welch"][j] == pytest.approx(welch.pvalue, rel=1e-9)
+        assert numerik["u"][j] == pytest.approx(mwu.statistic)
+        assert numerik["p_mwu"][j] == pytest.approx(mwu.pvalue, rel=1e-9)
+        assert kategorik["chi2"][j] == pytest.approx(chi2.statistic, rel=1e-9)
+        assert kategorik["dof"][j] == chi2.dof
+
+
+# ---------------------------
+# SHRINKAGE EMPIRICAL BAYES
+# ---------------------------
+def test_statistik_cukup_sama_dengan_groupby():
+    rng = np.random.default_rng(11)
+    kode = rng.integers(-1, 5, 200)
+    nilai = rng.normal(size=200)
+    nilai[::7] = np.nan
+
+    n, jumlah, jumlah_kuadrat = statistik_cukup(kode, nilai, 6)
+
+    acuan = pd.Series(nilai[kode >= 0]).groupby(kode[kode >= 0]).agg(["count", "sum", lambda s: (s ** 2).sum()])
+    acuan = acuan.reindex(range(6), fill_value=0)
+    np.testing.assert_allclose(n, acuan["count"])
+    np.testing.assert_allclose(jumlah, acuan["sum"])
+    np.testing.assert_allclose(jumlah_kuadrat, acuan.iloc[:, 2])
+
+
+def test_shrinkage_seimbang_sama_dengan_anova_satu_arah():
+    rng = np.random.default_rng(12)
+    kode = np.repeat(np.arange(8), 15)
+    nilai = rng.normal(size=8)[kode] * 0.5 + rng.normal(size=len(kode))
+
+    hasil = shrinkage_bertingkat(*statistik_cukup(kode, nilai, 8), np.zeros(8, dtype=int), 1)
+
+    # desain seimbang dengan satu induk: τ² = (MSB - MSW) / n
+    grup = pd.Series(nilai).groupby(kode)
+    msw = grup.var().mean()
+    msb = 15 * grup.mean().var()
+    tau2 = max(0.0, (msb - msw) / 15)
+    b = tau2 / (tau2 + msw / 15)
+    assert hasil["sigma2"] == pytest.approx(msw)
+    assert hasil["tau2_grup"] == pytest.approx(tau2)
+    assert hasil["tau2_induk"] == 0
+    np.testing.assert_allclose(hasil["rata_tersusut"], nilai.mean() + b * (grup.mean() - nilai.mean()))
+
+
+def test_shrinkage_tanpa_variasi_antar_grup_menarik_ke_rata_rata_induk():
+    rng = np.random.default_rng(13)
+    dasar = rng.normal(size=10)
+    # setiap grup berisi nilai yang sama (hanya urutannya berbeda), jadi rata-rata grup identik
+    nilai = np.concatenate([rng.permutation(dasar) + f for f in (0, 0, 0, 2, 2, 2)])
+    kode = np.repeat(np.arange(6), 10)
+    induk = np.array([0, 0, 0, 1, 1, 1])
+
+    hasil = shrinkage_bertingkat(*statistik_cukup(kode, nilai, 6), induk, 2)
+
+    assert hasil["tau2_grup"] == 0
+    np.testing.assert_allclose(hasil["bobot_data"], 0)
+    np.testing.assert_allclose(hasil["rata_tersusut"], hasil["rata_induk_tersusut"][induk])
+
+
+def test_shrinkage_grup_kecil_lebih_ditarik_dan_grup_kosong_mendapat_rata_induk():
+    rng = np.random.default_rng(14)
+    ukuran = [400, 400, 5, 400, 0, 400]
+    kode = np.repeat(np.arange(6), ukuran)
+    induk = np.array([0, 0, 0, 1, 1, 1])
+    nilai = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])[kode] + rng.normal(size=len(kode))
+
+    hasil = shrinkage_bertingkat(*statistik_cukup(kode, nilai, 6), induk, 2)
+
+    assert hasil["bobot_data"][2] < hasil["bobot_data"][[0, 1, 3, 5]].min()
+    assert hasil["bobot_data"][[0, 1, 3, 5]].min() > 0.95
+    assert hasil["rata_tersusut"][4] == pytest.approx(hasil["rata_induk_tersusut"][1])
+    assert (hasil["sd_posterior"][[0, 1, 3, 5]] < hasil["sd_posterior"][2]).all()
@@ -0,0 +1,48 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cache_bersama
+from cache_bersama import CacheDisk
+
+
+def test_satu_proses_menghitung_yang_lain_membaca(tmp_path):
+    cache = CacheDisk(str(tmp_path))
+    dihitung = []
+
+    def mahal():
+        dihitung.append(1)
+        time.sleep(0.3)
+        return 42
+
+    kunci = cache.kunci("mahal", (1,), {})
+    with ThreadPoolExecutor(6) as ex:
+        hasil = list(ex.map(lambda _: cache.ambil_atau_hitung(kunci, mahal), range(6)))
+
+    assert hasil == [42] * 6
+    assert len(dihitung) == 1
+    assert cache.statistik["miss"] == 1 and cache.statistik["hit"] == 5
+
+
+def test_file_lock_jumlahnya_tetap(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_bersama, "JUMLAH_KUNCI", 4)
+    cache = CacheDisk(str(tmp_path))
+    for i in range(50):
+        cache.ambil_atau_hitung(cache.kunci("f", (i,), {}), lambda: i)
+
+    assert len(os.listdir(tmp_path / "_kunci")) <= 4
+    assert not [nama for _, _, files in os.walk(tmp_path) for nama in files if nama.endswith(".pkl.lock")]
+
+
+def test_panggilan_bertingkat_pada_lock_yang_sama_tidak_deadlock(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_bersama, "JUMLAH_KUNCI", 1)
+    cache = CacheDisk(str(tmp_path), tunggu_maks=1)
+
+    def luar(i):
+        dalam = lambda: cache.ambil_atau_hitung(cache.kunci("dalam", (i,), {}), lambda: i)
+        return cache.ambil_atau_hitung(cache.kunci("luar", (i,), {}), lambda: (time.sleep(0.1), dalam())[1] + 1)
+
+    mulai = time.monotonic()
+    with ThreadPoolExecutor(4) as ex:
+        assert list(ex.map(luar, range(4))) == [1, 2, 3, 4]
+    assert time.monotonic() - mulai < 10
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from cleaning import FILE_INPUT, aturan_validasi, deduplikasi, kompilasi_skema
+
+BARIS_VALID = {
+    'Timestamp': '10/6/2025 16:33:57',
+    'Apakah Anda bersedia untuk mengisi pertanyaan-pertanyaan berikut ini?': 'Ya',
+    'Nama Lengkap \nContoh : Justin Beiber ': 'Puri Khairunisa Rahma',
+    'NPM \nContoh : 24083010043 ': 24083010094,
+    'Fakultas': 'fakultas ilmu komputer ',
+    'Program Studi\nContoh : Sains Data': 'sains data',
+    'Angkatan\nContoh : 2024': 2024,
+    'Dari mana Anda pertama kali mengetahui informasi tentang jurusan ini? ': 'Teman / Saudara',
+    'Apa alasan utama Anda memilih jurusan ini?': 'Prospek Kerja',
+    'Apakah Anda pernah ingin pindah jurusan?': 'Tidak',
+    'Seberapa relevan kurikulum jurusan Anda dengan kebutuhan dunia kerja?': 'Sangat Relevan',
+    'Bagaimana tingkat kesesuaian jurusan yang Anda pilih dengan minat Anda?': 'Sesuai',
+    'Bagaimana penilaian Anda terhadap prospek kerja lulusan dari jurusan ini?': 'Sangat Baik',
+    'Secara keseluruhan, bagaimana tingkat kepuasan Anda terhadap jurusan yang Anda pilih?': 8,
+    'Seberapa sulit mata kuliah yang ada di jurusan Anda?': 8,
+    'Seberapa tinggi motivasi Anda mengikuti perkuliahan di jurusan ini?': 8,
+    'Berapa banyak mata kuliah di jurusan ini yang menurut Anda benar-benar sesuai dengan minat Anda?': 5,
+    'Berapa kali dalam satu minggu Anda merasa stress dan pusing karena tekanan tugas dari jurusan yang Anda pilih?': 2,
+    'Dari total mata kuliah yang Anda tempuh, berapa banyak yang menurut Anda bermanfaat secara langsung untuk persiapan karier Anda?': 6,
+    'No. WhatsApp\nContoh : 087778669888': 81332213220,
+}
+KEPUASAN = 'Secara keseluruhan, bagaimana tingkat kepuasan Anda terhadap jurusan yang Anda pilih?'
+NPM = 'NPM \nContoh : 24083010043 '
+
+
+def form(*ubah):
+    return pd.DataFrame([{**BARIS_VALID, **u} for u in ubah])
+
+
+def test_kompilasi_skema_menghitung_karantina_per_aturan():
+    raw = form(
+        {},
+        {KEPUASAN: 11},  # KEPUASAN_RENTANG
+        {KEPUASAN: None, NPM: '123'},  # KEPUASAN_KOSONG + NPM_FORMAT
+        {'Fakultas': 'Fakultas Sihir'},  # FAKULTAS_TIDAK_DIKENAL
+        {NPM: '24083010095.0', 'Angkatan\nContoh : 2024': 2024.0},
+    )
+    proses = kompilasi_skema()
+    waktu = {}
+
+    valid, karantina, gagal = proses(raw, waktu)
+
+    assert len(valid) == 2 and len(karantina) == 3
+    assert karantina['Alasan Karantina'].tolist() == ['KEPUASAN_RENTANG', 'NPM_FORMAT;KEPUASAN_KOSONG', 'FAKULTAS_TIDAK_DIKENAL']
+    assert gagal[gagal > 0].to_dict() == {
+        'NPM_FORMAT': 1, 'FAKULTAS_TIDAK_DIKENAL': 1, 'KEPUASAN_KOSONG': 1, 'KEPUASAN_RENTANG': 1,
+    }
+    assert list(gagal.index) == [a[0] for a in aturan_validasi]
+    assert set(waktu) == {'header', 'pembersihan', 'validasi', 'skor & tipe'}
+
+    # kolom di luar skema dibuang, kategori dinormalisasi, skor ordinal dan tipe akhir diterapkan
+    assert 'No. WhatsApp' not in valid.columns
+    assert valid['Fakultas'].tolist() == ['Fakultas Ilmu Komputer'] * 2
+    assert valid['Program Studi'].tolist() == ['Sains Data'] * 2
+    assert valid['Relevansi Kurikulum (Skor)'].tolist() == [5, 5]
+    assert valid['Tingkat Kepuasan'].dtype == 'int64'
+    assert str(valid['Timestamp'].dtype) == 'datetime64[s]'
+
+
+def test_kompilasi_skema_jumlah_karantina_konsisten_pada_data_asli():
+    raw = pd.read_csv(FILE_INPUT)
+    valid, karantina, gagal = kompilasi_skema()(raw)
+
+    assert len(valid) + len(karantina) == len(raw)
+    alasan = karantina['Alasan Karantina'].str.split(';').explode().value_counts()
+    assert alasan.to_dict() == gagal[gagal > 0].to_dict()
+
+
+def test_deduplikasi_id_responden_stabil_antar_run():
+    proses = kompilasi_skema()
+    run_1, _, _ = proses(form({}, {NPM: 24083010001, 'Nama Lengkap \nContoh : Justin Beiber ': 'Budi'}))
+    indeks, laporan = deduplikasi(run_1, None)
+    assert indeks['ID_Responden'].tolist() == [1, 2] and laporan.empty
+
+    # run berikutnya: responden pertama mengisi ulang, satu responden baru
+    run_2, _, _ = proses(form({KEPUASAN: 3}, {NPM: 24083010002, 'Nama Lengkap \nContoh : Justin Beiber ': 'Cici'}))
+    indeks, laporan = deduplikasi(run_2, indeks)
+
+    assert indeks['ID_Responden'].tolist() == [1, 2, 3]
+    assert indeks['Tingkat Kepuasan'].tolist() == [3, 8, 8]
+    assert laporan['ID_Responden'].tolist() == [1]
+
+    indeks_pertama, _ = deduplikasi(run_2, deduplikasi(run_1, None)[0], kebijakan='pertama')
+    assert indeks_pertama['Tingkat Kepuasan'].tolist() == [8, 8, 8]
+    with pytest.raises(ValueError):
+        deduplikasi(run_2, None, kebijakan='acak')
@@ -0,0 +1,71 @@
+import pandas as pd
+
+from live import AgregatInkremental, DedupLive, PembacaTail
+
+HEADER = b"Timestamp,Nama,Catatan\n"
+
+
+def test_pembaca_tail_hanya_membaca_record_baru_yang_lengkap(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(HEADER + b"1,Ani,lama\n")
+    pembaca = PembacaTail(str(path))
+    assert pembaca.baca_baru().empty
+
+    # record terakhir belum selesai ditulis: ditunda sampai newline-nya ada
+    with open(path, "ab") as f:
+        f.write(b'2,Budi,"baris satu\nbaris dua"\n3,Cici,bel')
+    baru = pembaca.baca_baru()
+    assert baru["Nama"].tolist() == ["Budi"]
+    assert baru["Catatan"].tolist() == ["baris satu\nbaris dua"]
+    offset = pembaca.posisi[str(path)][0]
+    assert path.read_bytes()[offset:] == b"3,Cici,bel"
+
+    with open(path, "ab") as f:
+        f.write(b"um\n")
+    assert pembaca.baca_baru()["Catatan"].tolist() == ["belum"]
+    assert pembaca.baca_baru().empty
+    assert pembaca.posisi[str(path)][0] == path.stat().st_size
+
+
+def test_pembaca_tail_folder_membaca_file_baru_dari_awal(tmp_path):
+    (tmp_path / "a.csv").write_bytes(HEADER + b"1,Ani,x\n")
+    pembaca = PembacaTail(str(tmp_path))
+    (tmp_path / "b.csv").write_bytes(HEADER + b"2,Budi,y\n3,Cici,z\n")
+    assert pembaca.baca_baru()["Nama"].tolist() == ["Budi", "Cici"]
+
+    pembaca = PembacaTail(str(tmp_path), dari_awal=True)
+    assert pembaca.baca_baru()["Nama"].tolist() == ["Ani", "Budi", "Cici"]
+
+
+def submisi(*baris):
+    return pd.DataFrame(
+        [(npm, nama, "Sains Data", "Fakultas Ilmu Komputer", nilai) for npm, nama, nilai in baris],
+        columns=["NPM", "Nama Lengkap", "Program Studi", "Fakultas", "Tingkat Kepuasan"],
+    )
+
+
+def agregat_kepuasan():
+    return AgregatInkremental(kolom_numerik=["Tingkat Kepuasan"], kolom_kategori=["Fakultas"])
+
+
+def test_dedup_live_submisi_ulang_menggantikan_baris_lama():
+    agregat = agregat_kepuasan()
+    dedup = DedupLive(agregat)
+    assert dedup.tambah(submisi((22081010001, "Ani", 4), (22081010002, "Budi", 6))) == 0
+
+    # Ani mengisi ulang: baris lamanya dikeluarkan dari agregat sebelum yang baru masuk
+    assert dedup.tambah(submisi((22081010001, "Ani", 9), (22081010003, "Cici", 8))) == 1
+    assert agregat.n == 3
+    assert agregat.rata_rata()["Tingkat Kepuasan"] == (9 + 6 + 8) / 3
+    assert agregat.rata_rata_grup("Tingkat Kepuasan")["Sains Data"] == (9 + 6 + 8) / 3
+    assert agregat.frekuensi["Fakultas"].to_dict() == {"Fakultas Ilmu Komputer": 3}
+    assert dict(zip(dedup.terpilih["Nama Lengkap"], dedup.terpilih["ID_Responden"])) == {"Ani": 1, "Budi": 2, "Cici": 3}
+
+
+def test_dedup_live_kebijakan_pertama_mengabaikan_submisi_ulang():
+    agregat = agregat_kepuasan()
+    dedup = DedupLive(agregat, kebijakan="pertama")
+    dedup.tambah(submisi((22081010001, "Ani", 4)))
+    assert dedup.tambah(submisi((22081010001, "Ani", 9))) == 1
+    assert agregat.n == 1
+    assert agregat.rata_rata()["Tingkat Kepuasan"] == 4